@@ -16,7 +16,7 @@ import argparse
 # Add the parent directory to the path to import the src package
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src import merge_3dgs_files, convert_3dgs_to_csv, convert_csv_to_3dgs
+from src import merge_3dgs_files, convert_3dgs_to_columns, load_columns, write_3dgs_from_columns
 
 def create_transformed_copy(input_ply, output_ply, transformation):
     """
@@ -30,17 +30,15 @@ def create_transformed_copy(input_ply, output_ply, transformation):
     Returns:
         str: Path to transformed PLY file
     """
-    import pandas as pd
+    # Convert PLY to columns
+    columns_dir = convert_3dgs_to_columns(input_ply, os.path.splitext(output_ply)[0] + "_columns")
     
-    # Convert PLY to CSV
-    csv_path, _ = convert_3dgs_to_csv(input_ply)
-    
-    # Read the CSV file
-    df = pd.read_csv(csv_path)
+    # Read the column data
+    df, manifest = load_columns(columns_dir, mmap_mode=None)
     
     # Find position columns
     x_col, y_col, z_col = None, None, None
-    for col in df.columns:
+    for col in df.keys():
         if col in ['x', 'pos_0']:
             x_col = col
         elif col in ['y', 'pos_1']:
@@ -59,12 +57,9 @@ def create_transformed_copy(input_ply, output_ply, transformation):
         df[y_col] = df[y_col] + ty
         df[z_col] = df[z_col] + tz
     
-    # Save transformed data to CSV
-    transformed_csv_path = os.path.splitext(output_ply)[0] + ".csv"
-    df.to_csv(transformed_csv_path, index=False)
-    
-    # Convert CSV back to PLY
-    output_ply_path = convert_csv_to_3dgs(transformed_csv_path, None, output_ply)
+    # Write the transformed columns back to PLY
+    property_types = {prop['name']: prop['type'] for prop in manifest['properties']}
+    output_ply_path = write_3dgs_from_columns(output_ply, df, property_types)
     
     return output_ply_path
 
@@ -113,7 +108,7 @@ def main():
     
     # Step 2: Merge original and transformed files
     print(f"\n2. Merging original and transformed 3DGS files...")
-    merged_path = merge_3dgs_files(input_3dgs_file, transformed_path, merged_file)
+    merged_path = merge_3dgs_files(input_3dgs_file, transformed_path, output_file=merged_file)
     print(f"   Merged file saved to {merged_path}")
     
     print("\n=== Merge summary ===")
@@ -3,9 +3,9 @@
 Coordinate transformation sample for 3D Gaussian Splatting PLY files
 
 This sample performs the following operations:
-1. Convert PLY file to CSV format
+1. Convert PLY file to columnar format (one .npy file per property)
 2. Transform 3D coordinates (scaling, rotation, translation, etc.)
-3. Convert the transformed CSV data back to PLY format
+3. Convert the transformed column data back to PLY format
 
 All output files are saved in the converted folder.
 
@@ -17,7 +17,6 @@ Usage:
 
 import os
 import sys
-import csv
 import math
 import numpy as np
 import argparse
@@ -27,7 +26,7 @@ from scipy.spatial.transform import Rotation as R
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 # Import the library
-from src import convert_3dgs_to_csv, convert_csv_to_3dgs
+from src import convert_3dgs_to_columns, convert_columns_to_3dgs, load_columns, save_columns
 
 
 def rotate_point(x, y, z, angle_deg, axis='z'):
@@ -67,16 +66,16 @@ def rotate_quaternion(quat, angle_deg, axis='z'):
     Apply rotation to an existing quaternion
     
     Args:
-        quat: List of 4 values [w, x, y, z] representing the quaternion
+        quat: List of 4 values or 4 arrays [w, x, y, z] representing the quaternion(s)
         angle_deg: Rotation angle in degrees
         axis: Axis of rotation ('x', 'y', or 'z')
         
     Returns:
-        List of 4 values representing the new quaternion
+        List of 4 values or arrays representing the new quaternion(s)
     """
     # Convert input quaternion to scipy Rotation object
     # 3DGS may use [x, y, z, w] format, so reorder if needed
-    orig_rotation = R.from_quat([quat[1], quat[2], quat[3], quat[0]])
+    orig_rotation = R.from_quat(np.stack([quat[1], quat[2], quat[3], quat[0]], axis=-1))
     
     # Create rotation around specified axis
     angle_rad = math.radians(angle_deg)
@@ -96,7 +95,7 @@ def rotate_quaternion(quat, angle_deg, axis='z'):
     # Convert back to quaternion in [w, x, y, z] format
     quat_xyzw = new_rotation.as_quat()
     # Return in [w, x, y, z] format
-    return [quat_xyzw[3], quat_xyzw[0], quat_xyzw[1], quat_xyzw[2]]
+    return [quat_xyzw[..., 3], quat_xyzw[..., 0], quat_xyzw[..., 1], quat_xyzw[..., 2]]
 
 
 def main():
@@ -137,39 +136,33 @@ def main():
     
     print(f"Performing coordinate transformation for {input_filename}: {input_ply}")
     
-    # Convert PLY file to CSV
-    csv_path = os.path.join(converted_dir, f"{input_base}.csv")
-    csv_path, _ = convert_3dgs_to_csv(input_ply, csv_path)
-    print(f"Converted to CSV: {csv_path}")
+    # Convert PLY file to columns
+    columns_dir = os.path.join(converted_dir, f"{input_base}_columns")
+    columns_dir = convert_3dgs_to_columns(input_ply, columns_dir)
+    print(f"Converted to columns: {columns_dir}")
     
-    # Read the CSV file
-    with open(csv_path, 'r') as csvfile:
-        reader = csv.reader(csvfile)
-        header = next(reader)
-        data = [row for row in reader]
+    # Load the column data into memory
+    columns, manifest = load_columns(columns_dir, mmap_mode=None)
+    header = list(columns)
+    property_types = {prop['name']: prop['type'] for prop in manifest['properties']}
     
-    # Find X, Y, Z coordinate indices (typically the first 3 columns)
-    coord_indices = []
-    for i, attr in enumerate(header[:10]):  # Search only the first 10 columns
-        if attr == 'x' or attr == 'y' or attr == 'z' or attr == 'pos_0' or attr == 'pos_1' or attr == 'pos_2':
-            coord_indices.append((i, attr))
+    # Find X, Y, Z coordinate attributes (typically the first 3 columns)
+    coord_names = [attr for attr in header[:10] if attr in ('x', 'y', 'z', 'pos_0', 'pos_1', 'pos_2')]  # Search only the first 10 columns
     
-    if len(coord_indices) >= 3:
-        print(f"Found coordinate attributes: {coord_indices}")
-        x_idx, y_idx, z_idx = [idx for idx, _ in coord_indices[:3]]
+    if len(coord_names) >= 3:
+        print(f"Found coordinate attributes: {coord_names}")
+        x_name, y_name, z_name = coord_names[:3]
     else:
         print("Coordinate attributes not found. Using the first 3 columns as default.")
-        x_idx, y_idx, z_idx = 0, 1, 2
+        x_name, y_name, z_name = header[:3]
         
-    # Find quaternion indices (rotation/orientation)
-    quat_indices = []
-    for i, attr in enumerate(header):
-        if attr == 'rot_0' or attr == 'rot_1' or attr == 'rot_2' or attr == 'rot_3' or attr == 'rotation_0' or attr == 'rotation_1' or attr == 'rotation_2' or attr == 'rotation_3':
-            quat_indices.append((i, attr))
+    # Find quaternion attributes (rotation/orientation)
+    quat_names = [attr for attr in header if attr in ('rot_0', 'rot_1', 'rot_2', 'rot_3',
+                                                      'rotation_0', 'rotation_1', 'rotation_2', 'rotation_3')]
     
-    if len(quat_indices) >= 4:
-        print(f"Found quaternion attributes: {quat_indices}")
-        q_w_idx, q_x_idx, q_y_idx, q_z_idx = [idx for idx, _ in quat_indices[:4]]
+    if len(quat_names) >= 4:
+        print(f"Found quaternion attributes: {quat_names}")
+        q_w_name, q_x_name, q_y_name, q_z_name = quat_names[:4]
         has_quaternions = True
     else:
         print("Quaternion attributes not found. Only position will be transformed.")
@@ -185,8 +178,8 @@ def main():
     translate_y = args.translate_y
     translate_z = args.translate_z
 
-    # Set the path for the modified file
-    transformed_csv_path = os.path.join(converted_dir, f"{input_base}_transformed.csv")
+    # Set the path for the modified columns
+    transformed_columns_dir = os.path.join(converted_dir, f"{input_base}_transformed_columns")
     
     print("\n=== Transforming data ===")
     print(f"- Scale: X:{scale_x}x, Y:{scale_y}x, Z:{scale_z}x")
@@ -195,70 +188,46 @@ def main():
     if has_quaternions:
         print("- Ellipsoid orientations will also be rotated")
     
-    # Transform the data
-    with open(transformed_csv_path, 'w', newline='') as csvfile:
-        writer = csv.writer(csvfile)
-        writer.writerow(header)
-        
-        for row in data:
-            # Get coordinates
-            x = float(row[x_idx])
-            y = float(row[y_idx])
-            z = float(row[z_idx])
-            
-            # Apply scaling
-            x *= scale_x
-            y *= scale_y
-            z *= scale_z
-            
-            # Apply rotation to position
-            x, y, z = rotate_point(x, y, z, rotation_angle, rotation_axis)
-            
-            # Apply translation
-            x += translate_x
-            y += translate_y
-            z += translate_z
-            
-            # Update coordinates
-            row[x_idx] = str(x)
-            row[y_idx] = str(y)
-            row[z_idx] = str(z)
-            
-            # Apply rotation to quaternion orientation if available
-            if has_quaternions:
-                try:
-                    # Get quaternion values
-                    quat = [
-                        float(row[q_w_idx]),
-                        float(row[q_x_idx]),
-                        float(row[q_y_idx]),
-                        float(row[q_z_idx])
-                    ]
-                    
-                    # Apply rotation to quaternion
-                    new_quat = rotate_quaternion(quat, rotation_angle, rotation_axis)
-                    
-                    # Update quaternion values
-                    row[q_w_idx] = str(new_quat[0])
-                    row[q_x_idx] = str(new_quat[1])
-                    row[q_y_idx] = str(new_quat[2])
-                    row[q_z_idx] = str(new_quat[3])
-                except (ValueError, IndexError) as e:
-                    print(f"Warning: Could not update quaternion in a row: {e}")
-            
-            writer.writerow(row)
+    # Transform all points at once
+    x = columns[x_name].astype(np.float64)
+    y = columns[y_name].astype(np.float64)
+    z = columns[z_name].astype(np.float64)
+    
+    # Apply scaling
+    x *= scale_x
+    y *= scale_y
+    z *= scale_z
+    
+    # Apply rotation to position
+    x, y, z = rotate_point(x, y, z, rotation_angle, rotation_axis)
+    
+    # Apply translation
+    x += translate_x
+    y += translate_y
+    z += translate_z
+    
+    # Update coordinates
+    columns[x_name], columns[y_name], columns[z_name] = x, y, z
+    
+    # Apply rotation to quaternion orientation if available
+    if has_quaternions:
+        quat = [columns[name].astype(np.float64) for name in (q_w_name, q_x_name, q_y_name, q_z_name)]
+        new_quat = rotate_quaternion(quat, rotation_angle, rotation_axis)
+        for name, values in zip((q_w_name, q_x_name, q_y_name, q_z_name), new_quat):
+            columns[name] = values
     
-    print(f"Saved transformed CSV: {transformed_csv_path}")
+    save_columns(transformed_columns_dir, columns, property_types)
+    print(f"Saved transformed columns: {transformed_columns_dir}")
     
-    # Convert the transformed CSV back to PLY
+    # Convert the transformed columns back to PLY
     output_ply = os.path.join(converted_dir, f"{input_base}_transformed.ply")
-    restored_ply = convert_csv_to_3dgs(transformed_csv_path, None, output_ply)
+    restored_ply = convert_columns_to_3dgs(transformed_columns_dir, output_ply)
     print(f"\nConverted transformed data to PLY: {restored_ply}")
     
     print("\n=== Transformation summary ===")
     print(f"Original PLY file: {input_ply}")
-    print(f"Intermediate CSV file: {csv_path}")
-    print(f"Transformed CSV file: {transformed_csv_path}")
+    print(f"Intermediate columns: {columns_dir}")
+    print(f"Transformed columns: {transformed_columns_dir}")
     print(f"Final PLY file: {restored_ply}")
     print(f"\nAll output files were saved in {converted_dir}")
     print("\nPlease compare the original PLY file with the transformed PLY file in a 3D viewer.")
@@ -23,6 +23,12 @@ setup(
         "console_scripts": [
             "3dgs-to-csv=src.gs_to_csv:main",
             "csv-to-3dgs=src.csv_to_gs:main",
+            "3dgs-to-columns=src.gs_to_columns:main",
+            "columns-to-3dgs=src.gs_to_columns:main_columns_to_3dgs",
+            "3dgs-info=src.gs_info:main",
+            "3dgs-compress=src.compressed_ply:main",
+            "3dgs-to-splat=src.gs_to_splat:main",
+            "splat-to-3dgs=src.gs_to_splat:main_splat_to_3dgs",
             "3dgs-to-pointcloud=src.gs_to_pointcloud:main",
             "pointcloud-to-3dgs=src.pointcloud_to_gs:main",
             "pointcloud-to-csv=src.pointcloud_to_csv:main",
@@ -30,6 +36,8 @@ setup(
             "compare-gs=tools.compare_gs:main",
             "3dgs-to-mesh=src.pointcloud_to_mesh:main_3dgs_to_mesh",
             "merge-gs=src.merge_gs:main",
+            "3dgs-transform=src.transform_gs:main",
+            "3dgs-crop=src.crop_gs:main",
         ],
     },
     install_requires=[
@@ -7,7 +7,15 @@ from .pointcloud_to_mesh import convert_pointcloud_to_mesh
 from .gs_to_mesh import convert_3dgs_to_mesh
 from .compare_gs import compare_3dgs_files
 from .color_utils import detect_color_properties, convert_standard_to_sh_color
-from .merge_gs import merge_3dgs_files
+from .merge_gs import merge_3dgs_files, merge_3dgs
+from .transform_gs import transform_3dgs
+from .crop_gs import crop_3dgs
+from .gaussian_cloud import GaussianCloud
+from .gs_info import get_3dgs_info
+from .compressed_ply import convert_3dgs_to_compressed, convert_compressed_to_3dgs
+from .gs_to_splat import convert_3dgs_to_splat, convert_splat_to_3dgs
+from .gs_to_columns import (convert_3dgs_to_columns, convert_columns_to_3dgs, load_columns,
+                            save_columns, write_3dgs_from_columns)
 
 __all__ = [
     'convert_3dgs_to_csv', 
@@ -21,5 +29,19 @@ __all__ = [
     'compare_3dgs_files',
     'detect_color_properties',
     'convert_standard_to_sh_color',
-    'merge_3dgs_files'
+    'merge_3dgs_files',
+    'merge_3dgs',
+    'transform_3dgs',
+    'crop_3dgs',
+    'GaussianCloud',
+    'get_3dgs_info',
+    'convert_3dgs_to_compressed',
+    'convert_compressed_to_3dgs',
+    'convert_3dgs_to_splat',
+    'convert_splat_to_3dgs',
+    'convert_3dgs_to_columns',
+    'convert_columns_to_3dgs',
+    'load_columns',
+    'save_columns',
+    'write_3dgs_from_columns'
 ]
@@ -53,20 +53,69 @@ def detect_color_properties(properties):
     return r_idx, g_idx, b_idx, is_sh_color
 
 
+def get_sh_rest_names(properties):
+    """
+    Get the higher-order SH coefficient names (f_rest_*) of a property list in numeric order
+    
+    Args:
+        properties (list): Vertex property names
+    
+    Returns:
+        list: Matching property names
+    """
+    names = [name for name in properties if name.startswith('f_rest_') and name[7:].isdigit()]
+    return sorted(names, key=lambda name: int(name[7:]))
+
+
+def get_sh_layout_degree(properties):
+    """
+    Get the SH degree of a property list if its f_rest_* properties form a complete SH layout
+    
+    Args:
+        properties (list): Vertex property names
+    
+    Returns:
+        int or None: SH degree (0 without f_rest_* properties), or None if the file has no
+                     f_dc_* properties or the f_rest_* count does not match any degree
+    """
+    if not any(name.startswith('f_dc_') for name in properties):
+        return None
+    
+    rest_names = get_sh_rest_names(properties)
+    degree = 0
+    # Each degree d adds 2d+1 coefficients per color channel: 3 * ((d+1)^2 - 1) in total
+    while 3 * ((degree + 1) ** 2 - 1) < len(rest_names):
+        degree += 1
+    if rest_names != [f'f_rest_{i}' for i in range(3 * ((degree + 1) ** 2 - 1))]:
+        return None
+    return degree
+
+
 def get_color_value_range(colors):
     """
     Safely calculate the range of color values
     
     Args:
-        colors (list): List of colors [[r, g, b], ...]
+        colors (list or np.ndarray): List of colors [[r, g, b], ...] or array of shape (N, 3)
         
     Returns:
         tuple: (min_val, max_val, is_signed) - Minimum color value, maximum color value,
                and whether negative values are included
     """
-    if not colors or len(colors) == 0:
+    if colors is None or len(colors) == 0:
         return 0.0, 1.0, False
     
+    if isinstance(colors, np.ndarray):
+        # Arrays are reduced in bulk instead of iterating over every value
+        min_val = float(np.min(colors))
+        max_val = float(np.max(colors))
+        is_signed = min_val < 0
+        
+        if max_val <= min_val:
+            max_val = min_val + 1.0
+        
+        return min_val, max_val, is_signed
+    
     try:
         # Safely calculate min/max values avoiding empty sequences
         min_val = min(
@@ -135,12 +184,32 @@ def normalize_color_for_editing(color_values, is_sh_color=False):
     max_val = np.max(color_values)
     is_signed = min_val < 0
     
-    normalized_values = color_values.copy()
-    
     # If SH color, store the range
     if is_sh_color:
         store_sh_color_range(min_val, max_val)
     
+    normalized_values = normalize_color_with_range(color_values, min_val, max_val)
+    
+    return normalized_values, min_val, max_val, is_signed
+
+
+def normalize_color_with_range(color_values, min_val, max_val):
+    """
+    Normalize color values to 0-1 range using a known value range
+    
+    This applies the same mapping as normalize_color_for_editing, but with a range
+    computed elsewhere (e.g. over the whole file when colors are processed in chunks).
+    
+    Args:
+        color_values (np.ndarray): Array of color values
+        min_val (float): Minimum color value of the whole data set
+        max_val (float): Maximum color value of the whole data set
+        
+    Returns:
+        np.ndarray: Normalized color values
+    """
+    normalized_values = color_values.copy()
+    
     # Need to normalize if it contains negative values or values greater than 1.0
     if min_val < 0 or max_val > 1.0:
         if max_val > min_val:
@@ -153,10 +222,41 @@ def normalize_color_for_editing(color_values, is_sh_color=False):
         # All positive and <= 1.0, but scale to maximize range utilization
         normalized_values = color_values / max_val
     
-    return normalized_values, min_val, max_val, is_signed
+    return normalized_values
 
 
-def convert_standard_to_sh_color(colors, orig_min=None, orig_max=None):
+def get_color_column_range(vertices, color_properties, chunk_size=None):
+    """
+    Calculate the range of color columns of a structured vertex array
+    
+    Only the color fields are read, chunk by chunk, so this is cheap even for
+    memory-mapped files.
+    
+    Args:
+        vertices (np.ndarray): Structured vertex array
+        color_properties (list): Names of the color fields
+        chunk_size (int, optional): Number of vertices to process at once. Defaults to all
+        
+    Returns:
+        tuple: (min_val, max_val) - Minimum and maximum value over all color fields
+    """
+    chunk_size = chunk_size or max(1, len(vertices))
+    min_val = None
+    max_val = None
+    
+    for start in range(0, len(vertices), chunk_size):
+        chunk = vertices[start:start + chunk_size]
+        for name in color_properties:
+            column = chunk[name]
+            chunk_min = float(np.min(column))
+            chunk_max = float(np.max(column))
+            min_val = chunk_min if min_val is None else min(min_val, chunk_min)
+            max_val = chunk_max if max_val is None else max(max_val, chunk_max)
+    
+    return min_val, max_val
+
+
+def convert_standard_to_sh_color(colors, orig_min=None, orig_max=None, per_row=False):
     """
     Convert standard color values (0-1 or 0-255) to spherical harmonic (SH) coefficient range
     
@@ -164,18 +264,17 @@ def convert_standard_to_sh_color(colors, orig_min=None, orig_max=None):
         colors (np.ndarray): Array of color values
         orig_min (float, optional): Original minimum value of SH coefficients (target range minimum)
         orig_max (float, optional): Original maximum value of SH coefficients (target range maximum)
+        per_row (bool, optional): Detect the 0-255 range for each row (color) separately instead of
+                                  for the whole array
         
     Returns:
         np.ndarray: Color values converted to SH color coefficients
     """
     # First, determine the color scale
-    max_color = np.max(colors)
+    max_color = np.max(colors, axis=-1, keepdims=True) if per_row else np.max(colors)
     
     # Normalize to 0-1 if in 0-255 range
-    if max_color > 1.0:
-        normalized = colors.astype(float) / 255.0
-    else:
-        normalized = colors.astype(float)
+    normalized = np.where(max_color > 1.0, colors.astype(float) / 255.0, colors.astype(float))
     
     # Get stored SH range (if not specified)
     if orig_min is None or orig_max is None:
@@ -236,7 +335,7 @@ def convert_sh_to_standard_color(sh_colors, orig_min=None, orig_max=None, target
 
 def convert_colors_between_formats(colors, source_type, target_type, 
                                   is_sh_source=False, is_sh_target=False,
-                                  orig_min=None, orig_max=None):
+                                  orig_min=None, orig_max=None, per_row=False):
     """
     Convert colors between different formats
     
@@ -248,6 +347,8 @@ def convert_colors_between_formats(colors, source_type, target_type,
         is_sh_target (bool): Whether the target color should be in SH coefficient format
         orig_min (float, optional): Original minimum value for SH coefficients
         orig_max (float, optional): Original maximum value for SH coefficients
+        per_row (bool, optional): Detect the 0-255 range for each row (color) separately, giving the
+                                  same result as converting the colors one at a time
         
     Returns:
         np.ndarray: Converted color values
@@ -255,9 +356,14 @@ def convert_colors_between_formats(colors, source_type, target_type,
     result = colors.copy().astype(float)
     
     # Step 1: Convert from source format to normalized float (0-1)
-    if source_type == "uchar" or (source_type == "float" and np.max(colors) > 1.0):
-        # Normalize to 0-1 for uchar or float in 0-255 range
+    if source_type == "uchar":
+        # Normalize to 0-1 for uchar
         result = result / 255.0
+    elif source_type == "float":
+        # Normalize to 0-1 for float in 0-255 range
+        is_byte_range = np.max(colors, axis=-1, keepdims=True) > 1.0 if per_row else np.max(colors) > 1.0
+        unscaled = convert_sh_to_standard_color(result, orig_min, orig_max) if is_sh_source else result
+        result = np.where(is_byte_range, result / 255.0, unscaled)
     elif is_sh_source:
         # Normalize to 0-1 range for SH coefficients
         result = convert_sh_to_standard_color(result, orig_min, orig_max)
@@ -265,7 +371,7 @@ def convert_colors_between_formats(colors, source_type, target_type,
     # Step 2: Convert from normalized values (0-1) to target format
     if is_sh_target:
         # Restore to original range if target is SH coefficients
-        result = convert_standard_to_sh_color(result, orig_min, orig_max)
+        result = convert_standard_to_sh_color(result, orig_min, orig_max, per_row=per_row)
     elif target_type == "uchar":
         # Convert to 0-255 range and integers if target is uchar
         result = np.round(result * 255.0).astype(np.uint8)
@@ -2,12 +2,12 @@
 """
 3D Gaussian Splatting Comparison Module
 
-This module provides functions to compare two 3DGS files by converting them to CSV and analyzing differences.
+This module provides functions to compare two 3DGS files by converting them to columns and analyzing differences.
 """
 
 import os
 import sys
-import csv
+import shutil
 import numpy as np
 import pandas as pd
 from pathlib import Path
@@ -17,21 +17,30 @@ import matplotlib.pyplot as plt
 from matplotlib.colors import Normalize
 from mpl_toolkits.mplot3d import Axes3D
 
-from src.gs_to_csv import convert_3dgs_to_csv
-from src.csv_to_gs import convert_csv_to_3dgs
+from src.gs_to_columns import convert_3dgs_to_columns, load_columns
+from src.gaussian_cloud import GaussianCloud
+from src.scene_cache import is_cache_enabled, get_cached_columns_dir
 from src import color_utils
 
-def read_csv_as_dataframe(csv_path):
+def read_columns_as_dataframe(columns_dir):
     """
-    Read a CSV file and return it as a pandas DataFrame for easier comparison
+    Read a columns directory and return it as a pandas DataFrame for easier comparison
     """
     try:
-        df = pd.read_csv(csv_path)
-        return df
+        columns, _ = load_columns(columns_dir, mmap_mode=None)
+        return pd.DataFrame({name: values.astype(np.float64) for name, values in columns.items()})
     except Exception as e:
-        print(f"Error reading CSV file {csv_path}: {e}")
+        print(f"Error reading columns directory {columns_dir}: {e}")
         return None
 
+def get_columns_dir(source, columns_dir, cache=None):
+    """
+    Get a columns directory for a 3DGS file, from the scene cache if it is enabled
+    """
+    if is_cache_enabled(cache, source):
+        return get_cached_columns_dir(source)
+    return convert_3dgs_to_columns(source, columns_dir)
+
 def compare_dataframes(df1, df2, tolerance=1e-6):
     """
     Compare two dataframes and return:
@@ -197,30 +206,34 @@ def visualize_position_differences(df1, df2, output_path=None, max_points=10000)
         plt.show()
         return True
 
-def compare_3dgs_files(file1, file2, output_dir=None, tolerance=1e-6, visualize=True):
+def compare_3dgs_files(file1, file2, output_dir=None, tolerance=1e-6, visualize=True, cache=None):
     """
-    Compare two 3DGS files by converting them to CSV and analyzing differences
+    Compare two 3DGS files by converting them to columns and analyzing differences
     
     Parameters:
     -----------
-    file1 : str
-        Path to the first 3DGS file
-    file2 : str
-        Path to the second 3DGS file
+    file1 : str or GaussianCloud
+        Path to the first 3DGS file, or an in-memory cloud
+    file2 : str or GaussianCloud
+        Path to the second 3DGS file, or an in-memory cloud
     output_dir : str, optional
         Directory to save output files
     tolerance : float, optional
         Tolerance for floating point comparison
     visualize : bool, optional
         Whether to create visualization of differences
+    cache : bool, optional
+        Load the files through the on-disk scene cache. Default is None
+        (use the cache if GS_EDIT_CACHE_DIR is set)
     
     Returns:
     --------
     dict
         Statistics about the differences found
     """
-    if not os.path.exists(file1) or not os.path.exists(file2):
-        return {"error": f"One or both files do not exist: {file1}, {file2}"}
+    for source in (file1, file2):
+        if not isinstance(source, GaussianCloud) and not os.path.exists(source):
+            return {"error": f"One or both files do not exist: {file1}, {file2}"}
     
     # Create temporary directory for intermediary files if no output dir specified
     if output_dir is None:
@@ -231,16 +244,13 @@ def compare_3dgs_files(file1, file2, output_dir=None, tolerance=1e-6, visualize=
         temp_dir = None
     
     try:
-        # Convert both files to CSV
-        csv1_path, _ = convert_3dgs_to_csv(file1, 
-                                   os.path.join(output_dir, "file1.csv"))
-        
-        csv2_path, _ = convert_3dgs_to_csv(file2, 
-                                   os.path.join(output_dir, "file2.csv"))
+        # Convert both files to columns, or reuse their cached columns
+        columns1_dir = get_columns_dir(file1, os.path.join(output_dir, "file1_columns"), cache)
+        columns2_dir = get_columns_dir(file2, os.path.join(output_dir, "file2_columns"), cache)
         
-        # Read CSV files
-        df1 = read_csv_as_dataframe(csv1_path)
-        df2 = read_csv_as_dataframe(csv2_path)
+        # Read column data
+        df1 = read_columns_as_dataframe(columns1_dir)
+        df2 = read_columns_as_dataframe(columns2_dir)
         
         # Compare data
         diff_mask, diff_df, diff_stats = compare_dataframes(df1, df2, tolerance)
@@ -263,10 +273,13 @@ def compare_3dgs_files(file1, file2, output_dir=None, tolerance=1e-6, visualize=
         return {"error": f"Error during comparison: {str(e)}"}
     
     finally:
-        # Clean up temporary directory if created
-        if temp_dir and os.path.exists(temp_dir) and not output_dir:
-            import shutil
-            shutil.rmtree(temp_dir)
+        # Clean up the temporary directory if it was created. The columns are always removed;
+        # the directory is kept only if it holds the reports returned in the statistics
+        if temp_dir:
+            for name in ("file1_columns", "file2_columns"):
+                shutil.rmtree(os.path.join(temp_dir, name), ignore_errors=True)
+            if not os.listdir(temp_dir):
+                os.rmdir(temp_dir)
 
 def print_comparison_results(result, file1, file2):
     """
@@ -328,6 +341,8 @@ def main():
                         help='Tolerance for floating point comparison')
     parser.add_argument('--no-visualization', action='store_true',
                         help='Skip creating visualization of differences')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Do not use the scene cache even if GS_EDIT_CACHE_DIR is set')
     
     args = parser.parse_args()
     
@@ -335,7 +350,8 @@ def main():
         args.file1, args.file2, 
         args.output_dir,
         args.tolerance,
-        not args.no_visualization
+        not args.no_visualization,
+        cache=False if args.no_cache else None
     )
     
     # Print results
@@ -0,0 +1,445 @@
+"""
+3D Gaussian Splatting Compressed PLY Module
+
+This module reads and writes the chunked compressed PLY layout used by SuperSplat and
+the PlayCanvas engine. Gaussians are grouped into chunks of 256; each chunk stores the
+min/max of its positions, log scales and colors, and each gaussian is packed into four
+32-bit words:
+
+- packed_position: x, y, z normalized to the chunk bounds (11, 10, 11 bits)
+- packed_rotation: "smallest three" quaternion (2-bit index of the largest component, 3 x 10 bits)
+- packed_scale: log scales normalized to the chunk bounds (11, 10, 11 bits)
+- packed_color: DC color normalized to the chunk bounds and opacity (4 x 8 bits)
+
+Higher-order SH coefficients are stored as one byte each in an optional "sh" element.
+A compressed gaussian takes 16 bytes (61 with degree 3 SH) instead of 248.
+"""
+
+import os
+import numpy as np
+
+from .file_utils import parse_ply_header, get_element_dtype, is_compressed_ply_header, PLY_BYTE_ORDERS
+from .color_utils import detect_color_properties
+from .utils import detect_coordinate_properties, detect_quaternion_properties, detect_scale_properties
+
+# Number of gaussians sharing one set of chunk bounds
+COMPRESSED_CHUNK_SIZE = 256
+
+# Zeroth-order spherical harmonics basis constant, used to convert f_dc values to colors
+SH_C0 = 0.28209479177387814
+
+# Log scales are clamped to this range before packing, as in SuperSplat
+SCALE_LIMIT = 20.0
+
+CHUNK_PROPERTIES = [
+    'min_x', 'min_y', 'min_z', 'max_x', 'max_y', 'max_z',
+    'min_scale_x', 'min_scale_y', 'min_scale_z', 'max_scale_x', 'max_scale_y', 'max_scale_z',
+    'min_r', 'min_g', 'min_b', 'max_r', 'max_g', 'max_b',
+]
+PACKED_PROPERTIES = ['packed_position', 'packed_rotation', 'packed_scale', 'packed_color']
+
+
+def convert_3dgs_to_compressed(ply_filename, output_ply_filename=None, sort=True):
+    """
+    Convert a 3D Gaussian Splatting file (.ply) to the compressed PLY layout
+
+    Args:
+        ply_filename (str or GaussianCloud): Path to the input PLY file, or an in-memory cloud
+        output_ply_filename (str, optional): Path to the output file. If not specified,
+                                             it's automatically generated from the input filename
+        sort (bool, optional): Reorder gaussians along a Morton curve so each chunk covers a
+                               small region, which improves precision. Default is True.
+
+    Returns:
+        str: Path of the generated compressed PLY file
+    """
+    from .file_utils import read_ply_vertices
+    from .gaussian_cloud import get_source_filename
+
+    if output_ply_filename is None:
+        base_name = os.path.splitext(get_source_filename(ply_filename))[0]
+        output_ply_filename = f"{base_name}.compressed.ply"
+
+    vertices, _ = read_ply_vertices(ply_filename, memory_map=True)
+    columns = {name: vertices[name] for name in vertices.dtype.names}
+    write_compressed_ply(output_ply_filename, columns, sort=sort)
+
+    print(f"Successfully compressed 3D Gaussian Splatting data ({len(vertices)} vertices)")
+    return output_ply_filename
+
+
+def convert_compressed_to_3dgs(ply_filename, output_ply_filename=None):
+    """
+    Convert a compressed PLY file back to a standard 3D Gaussian Splatting file (.ply)
+
+    Args:
+        ply_filename (str): Path to the compressed PLY file
+        output_ply_filename (str, optional): Path to the output PLY file. If not specified,
+                                             it's automatically generated from the input filename
+
+    Returns:
+        str: Path of the generated PLY file
+    """
+    from .gs_to_columns import write_3dgs_from_columns
+
+    if output_ply_filename is None:
+        base_name = os.path.splitext(ply_filename)[0]
+        if base_name.endswith(".compressed"):
+            base_name = base_name[:-len(".compressed")]
+        output_ply_filename = f"{base_name}_decompressed.ply"
+
+    vertices, header = read_compressed_ply(ply_filename)
+    columns = {name: vertices[name] for name in vertices.dtype.names}
+    write_3dgs_from_columns(output_ply_filename, columns, header['property_types'])
+
+    print(f"Successfully decompressed 3D Gaussian Splatting data ({len(vertices)} vertices)")
+    return output_ply_filename
+
+
+def pack_unorm(values, bits):
+    """Quantize values in [0, 1] to unsigned integers with the given number of bits"""
+    limit = (1 << bits) - 1
+    return np.clip(np.floor(values * limit + 0.5), 0, limit).astype(np.uint32)
+
+
+def unpack_unorm(values, bits):
+    """Convert quantized unsigned integers back to values in [0, 1]"""
+    return values.astype(np.float32) / ((1 << bits) - 1)
+
+
+def pack_111011(values):
+    """Pack (N, 3) values in [0, 1] into 32-bit words with 11, 10 and 11 bits"""
+    return ((pack_unorm(values[:, 0], 11) << 21) |
+            (pack_unorm(values[:, 1], 10) << 11) |
+            pack_unorm(values[:, 2], 11))
+
+
+def unpack_111011(packed):
+    """Unpack 32-bit words with 11, 10 and 11 bits into (N, 3) values in [0, 1]"""
+    return np.column_stack([
+        unpack_unorm(packed >> 21, 11),
+        unpack_unorm((packed >> 11) & 0x3ff, 10),
+        unpack_unorm(packed & 0x7ff, 11),
+    ])
+
+
+def pack_8888(values):
+    """Pack (N, 4) values in [0, 1] into 32-bit words with 8 bits each"""
+    return ((pack_unorm(values[:, 0], 8) << 24) |
+            (pack_unorm(values[:, 1], 8) << 16) |
+            (pack_unorm(values[:, 2], 8) << 8) |
+            pack_unorm(values[:, 3], 8))
+
+
+def unpack_8888(packed):
+    """Unpack 32-bit words with 8 bits each into (N, 4) values in [0, 1]"""
+    return np.column_stack([unpack_unorm((packed >> shift) & 0xff, 8) for shift in (24, 16, 8, 0)])
+
+
+def pack_rotation(quaternions):
+    """
+    Pack (N, 4) quaternions with the "smallest three" encoding
+
+    The index of the largest component is stored in the top 2 bits and the other
+    three components, which lie in [-1/sqrt(2), 1/sqrt(2)], in 10 bits each.
+    """
+    q = np.asarray(quaternions, dtype=np.float64)
+    length = np.linalg.norm(q, axis=1, keepdims=True)
+    q = np.where(length > 0, q / np.where(length > 0, length, 1.0), [1.0, 0.0, 0.0, 0.0])
+
+    rows = np.arange(len(q))
+    largest = np.argmax(np.abs(q), axis=1)
+    # q and -q are the same rotation, so make the dropped component positive
+    q *= np.where(q[rows, largest] < 0, -1.0, 1.0)[:, np.newaxis]
+
+    others = q[np.arange(4)[np.newaxis, :] != largest[:, np.newaxis]].reshape(-1, 3)
+    others = others * (np.sqrt(2) * 0.5) + 0.5
+    return ((largest.astype(np.uint32) << 30) |
+            (pack_unorm(others[:, 0], 10) << 20) |
+            (pack_unorm(others[:, 1], 10) << 10) |
+            pack_unorm(others[:, 2], 10))
+
+
+def unpack_rotation(packed):
+    """Unpack "smallest three" encoded quaternions into an (N, 4) array"""
+    norm = 1.0 / (np.sqrt(2) * 0.5)
+    others = np.column_stack([(unpack_unorm((packed >> shift) & 0x3ff, 10) - 0.5) * norm for shift in (20, 10, 0)])
+    largest = (packed >> 30).astype(np.intp)
+
+    q = np.empty((len(packed), 4), dtype=np.float32)
+    q[np.arange(4)[np.newaxis, :] != largest[:, np.newaxis]] = others.ravel()
+    q[np.arange(len(q)), largest] = np.sqrt(np.maximum(0.0, 1.0 - np.sum(others * others, axis=1)))
+    return q
+
+
+def get_morton_order(positions):
+    """
+    Get the order that sorts points along a 3D Morton (Z-order) curve
+
+    Args:
+        positions (numpy.ndarray): Array of shape (N, 3)
+
+    Returns:
+        numpy.ndarray: Indices that sort the points
+    """
+    lo = positions.min(axis=0)
+    extent = positions.max(axis=0) - lo
+    extent[extent == 0] = 1.0
+    cells = np.clip(((positions - lo) / extent * 1023).astype(np.uint32), 0, 1023)
+
+    def spread_bits(v):
+        # Insert two zero bits between each of the lower 10 bits
+        v = (v | (v << 16)) & 0x030000ff
+        v = (v | (v << 8)) & 0x0300f00f
+        v = (v | (v << 4)) & 0x030c30c3
+        v = (v | (v << 2)) & 0x09249249
+        return v
+
+    codes = spread_bits(cells[:, 0]) | (spread_bits(cells[:, 1]) << 1) | (spread_bits(cells[:, 2]) << 2)
+    return np.argsort(codes, kind='stable')
+
+
+def get_chunk_bounds(values, chunk_size=COMPRESSED_CHUNK_SIZE):
+    """
+    Compute the per-chunk minimum and maximum of (N, k) values
+
+    Returns:
+        tuple: (mins, maxs) - Arrays of shape (chunk_count, k), rounded to the float32
+               values that are stored in the file so encoding and decoding agree
+    """
+    chunk_count = -(-len(values) // chunk_size)
+    # Pad the last chunk with copies of its final row so it does not change the bounds
+    padding = chunk_count * chunk_size - len(values)
+    padded = np.concatenate([values, np.repeat(values[-1:], padding, axis=0)])
+    padded = padded.reshape(chunk_count, chunk_size, -1)
+    mins = padded.min(axis=1).astype(np.float32).astype(np.float64)
+    maxs = padded.max(axis=1).astype(np.float32).astype(np.float64)
+    return mins, maxs
+
+
+def normalize_to_chunks(values, mins, maxs, chunk_size=COMPRESSED_CHUNK_SIZE):
+    """Normalize (N, k) values to [0, 1] using the bounds of their chunk"""
+    chunk_index = np.arange(len(values)) // chunk_size
+    extent = maxs - mins
+    extent[extent == 0] = 1.0
+    return (values - mins[chunk_index]) / extent[chunk_index]
+
+
+def encode_compressed_ply(columns, sort=True):
+    """
+    Encode 3DGS property arrays into the compressed PLY layout
+
+    Args:
+        columns (dict): Mapping from property name to 1D array. Positions, f_dc colors,
+                        opacity, scales and rotations are required; f_rest_* are optional
+        sort (bool, optional): Reorder gaussians along a Morton curve. Default is True.
+
+    Returns:
+        tuple: (chunks, vertices, sh) - Structured arrays for the chunk, vertex and sh
+               elements (sh is None without f_rest_* properties)
+    """
+    properties = list(columns)
+    x_idx, y_idx, z_idx = detect_coordinate_properties(properties)
+    r_idx, g_idx, b_idx, is_sh_color = detect_color_properties(properties)
+    quat_indices = detect_quaternion_properties(properties)
+    scale_indices = detect_scale_properties(properties)
+    if not is_sh_color or quat_indices is None or scale_indices is None or 'opacity' not in columns:
+        raise ValueError("Compressed PLY output needs position, f_dc, opacity, scale and rotation properties")
+
+    def stack(indices):
+        return np.column_stack([np.asarray(columns[properties[i]], dtype=np.float64) for i in indices])
+
+    positions = stack((x_idx, y_idx, z_idx))
+    order = get_morton_order(positions) if sort and len(positions) > 0 else np.arange(len(positions))
+    positions = positions[order]
+    colors = 0.5 + stack((r_idx, g_idx, b_idx))[order] * SH_C0
+    scales = np.clip(stack(scale_indices)[order], -SCALE_LIMIT, SCALE_LIMIT)
+    rotations = stack(quat_indices)[order]
+    opacity = 1.0 / (1.0 + np.exp(-np.asarray(columns['opacity'], dtype=np.float64)[order]))
+
+    vertex_count = len(positions)
+    chunk_count = -(-vertex_count // COMPRESSED_CHUNK_SIZE)
+    chunks = np.zeros(chunk_count, dtype=[(name, '<f4') for name in CHUNK_PROPERTIES])
+    vertices = np.empty(vertex_count, dtype=[(name, '<u4') for name in PACKED_PROPERTIES])
+
+    if vertex_count > 0:
+        position_bounds = get_chunk_bounds(positions)
+        scale_bounds = get_chunk_bounds(scales)
+        color_bounds = get_chunk_bounds(colors)
+        for i, (axis, channel) in enumerate(zip('xyz', 'rgb')):
+            chunks[f'min_{axis}'], chunks[f'max_{axis}'] = position_bounds[0][:, i], position_bounds[1][:, i]
+            chunks[f'min_scale_{axis}'], chunks[f'max_scale_{axis}'] = scale_bounds[0][:, i], scale_bounds[1][:, i]
+            chunks[f'min_{channel}'], chunks[f'max_{channel}'] = color_bounds[0][:, i], color_bounds[1][:, i]
+
+        vertices['packed_position'] = pack_111011(normalize_to_chunks(positions, *position_bounds))
+        vertices['packed_rotation'] = pack_rotation(rotations)
+        vertices['packed_scale'] = pack_111011(normalize_to_chunks(scales, *scale_bounds))
+        vertices['packed_color'] = pack_8888(np.column_stack([normalize_to_chunks(colors, *color_bounds), opacity]))
+
+    rest_names = sorted((name for name in properties if name.startswith('f_rest_') and name[7:].isdigit()),
+                        key=lambda name: int(name[7:]))
+    sh = None
+    if rest_names:
+        sh = np.empty(vertex_count, dtype=[(name, 'u1') for name in rest_names])
+        for name in rest_names:
+            values = np.asarray(columns[name], dtype=np.float64)[order]
+            sh[name] = np.clip(np.trunc((values / 8 + 0.5) * 256), 0, 255)
+
+    return chunks, vertices, sh
+
+
+def write_compressed_ply(output_ply_filename, columns, sort=True):
+    """
+    Write 3DGS property arrays as a compressed PLY file
+
+    Args:
+        output_ply_filename (str): Path to the output file
+        columns (dict): Mapping from property name to 1D array
+        sort (bool, optional): Reorder gaussians along a Morton curve. Default is True.
+
+    Returns:
+        str: Path of the generated file
+    """
+    chunks, vertices, sh = encode_compressed_ply(columns, sort=sort)
+
+    header = ["ply", "format binary_little_endian 1.0", "comment Generated by 3dgs-edit-tools",
+              f"element chunk {len(chunks)}"]
+    header += [f"property float {name}" for name in CHUNK_PROPERTIES]
+    header.append(f"element vertex {len(vertices)}")
+    header += [f"property uint {name}" for name in PACKED_PROPERTIES]
+    if sh is not None:
+        header.append(f"element sh {len(sh)}")
+        header += [f"property uchar {name}" for name in sh.dtype.names]
+    header.append("end_header")
+
+    with open(output_ply_filename, "wb") as f:
+        f.write(("\n".join(header) + "\n").encode("ascii"))
+        chunks.tofile(f)
+        vertices.tofile(f)
+        if sh is not None:
+            sh.tofile(f)
+
+    return output_ply_filename
+
+
+def decode_compressed_ply(chunks, vertices, sh=None):
+    """
+    Decode the elements of a compressed PLY file into standard 3DGS properties
+
+    Args:
+        chunks (numpy.ndarray): Structured chunk array
+        vertices (numpy.ndarray): Structured array with the packed_* properties
+        sh (numpy.ndarray, optional): Structured array with one byte per f_rest_* property
+
+    Returns:
+        dict: Mapping from property name to float32 array, in standard 3DGS property order
+    """
+    chunk_index = np.arange(len(vertices)) // COMPRESSED_CHUNK_SIZE
+
+    def denormalize(values, min_prefix, max_prefix, axes, default=(0.0, 1.0)):
+        result = np.empty_like(values)
+        for i, axis in enumerate(axes):
+            if min_prefix + axis in chunks.dtype.names:
+                lo = chunks[min_prefix + axis][chunk_index]
+                hi = chunks[max_prefix + axis][chunk_index]
+            else:
+                lo, hi = default
+            result[:, i] = lo + values[:, i] * (hi - lo)
+        return result
+
+    packed_position = vertices['packed_position'].astype(np.uint32)
+    packed_scale = vertices['packed_scale'].astype(np.uint32)
+    packed_color = vertices['packed_color'].astype(np.uint32)
+    positions = denormalize(unpack_111011(packed_position), 'min_', 'max_', 'xyz')
+    scales = denormalize(unpack_111011(packed_scale), 'min_scale_', 'max_scale_', 'xyz')
+    color_alpha = unpack_8888(packed_color)
+    # Older files store colors in the 0-1 range without chunk color bounds
+    colors = denormalize(color_alpha[:, :3], 'min_', 'max_', 'rgb')
+    alpha = np.clip(color_alpha[:, 3].astype(np.float64), 1e-7, 1 - 1e-7)
+    rotations = unpack_rotation(vertices['packed_rotation'].astype(np.uint32))
+
+    columns = {}
+    for i, axis in enumerate('xyz'):
+        columns[axis] = positions[:, i]
+    for i in range(3):
+        columns[f'f_dc_{i}'] = (colors[:, i] - 0.5) / SH_C0
+    if sh is not None:
+        for name in sh.dtype.names:
+            values = sh[name].astype(np.float32)
+            columns[name] = np.where(values == 0, 0.0, ((values + 0.5) / 256 - 0.5) * 8)
+    columns['opacity'] = -np.log(1.0 / alpha - 1.0)
+    for i in range(3):
+        columns[f'scale_{i}'] = scales[:, i]
+    for i in range(4):
+        columns[f'rot_{i}'] = rotations[:, i]
+
+    return {name: np.asarray(values, dtype=np.float32) for name, values in columns.items()}
+
+
+def read_compressed_ply(ply_filename):
+    """
+    Read a compressed PLY file as standard 3DGS vertices
+
+    Args:
+        ply_filename (str): Path to the compressed PLY file
+
+    Returns:
+        tuple: (vertices, header) - Structured float32 vertex array with standard 3DGS properties,
+               and header information describing those properties
+    """
+    with open(ply_filename, "rb") as f:
+        header = parse_ply_header(f)
+        if not is_compressed_ply_header(header):
+            raise ValueError(f"Not a compressed PLY file: {ply_filename}")
+        if header['format'] not in PLY_BYTE_ORDERS:
+            raise ValueError("Compressed PLY files must be binary")
+
+        byte_order = PLY_BYTE_ORDERS[header['format']]
+        elements = {}
+        for element in header['elements']:
+            dtype = get_element_dtype(element, byte_order)
+            data = np.fromfile(f, dtype=dtype, count=element['count'])
+            if len(data) < element['count']:
+                raise ValueError(f"PLY {element['name']} data is truncated: expected {element['count']}, "
+                                 f"found {len(data)}")
+            elements[element['name']] = data
+
+    columns = decode_compressed_ply(elements['chunk'], elements['vertex'], elements.get('sh'))
+    vertices = np.empty(len(elements['vertex']), dtype=[(name, '<f4') for name in columns])
+    for name, values in columns.items():
+        vertices[name] = values
+
+    properties = list(columns)
+    decoded_header = dict(header)
+    decoded_header.update({
+        'format': 'binary_little_endian',
+        'elements': [{'name': 'vertex', 'count': len(vertices), 'properties': [(name, 'float') for name in properties]}],
+        'vertex_count': len(vertices),
+        'properties': properties,
+        'property_types': {name: 'float' for name in properties},
+        'compressed': True,
+    })
+    return vertices, decoded_header
+
+
+def main():
+    """Entry point for command-line execution"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Convert 3D Gaussian Splatting data to or from the compressed PLY layout')
+    parser.add_argument('input_ply', help='Input PLY file')
+    parser.add_argument('--output_ply', help='Output PLY filename')
+    parser.add_argument('--decompress', action='store_true', help='Convert a compressed PLY file back to a standard one')
+    parser.add_argument('--no-sort', action='store_true', help='Keep the original gaussian order when compressing')
+
+    args = parser.parse_args()
+
+    if args.decompress:
+        output_path = convert_compressed_to_3dgs(args.input_ply, args.output_ply)
+    else:
+        output_path = convert_3dgs_to_compressed(args.input_ply, args.output_ply, sort=not args.no_sort)
+    print(f"Conversion complete: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
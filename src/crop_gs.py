@@ -0,0 +1,255 @@
+"""
+3D Gaussian Splatting Crop Module
+
+This module keeps the gaussians of a scene that lie inside a region: an axis-aligned box,
+an oriented box, a sphere, a half-space or a 2D polygon extruded along an axis. The input is
+memory-mapped and the region test is evaluated on the positions one chunk at a time, then
+the surviving vertices are streamed to the output, so scenes larger than memory can be cropped.
+"""
+
+import os
+import numpy as np
+
+from .file_utils import read_ply_vertices, generate_ply_header, vertices_to_array, PLY_SCALAR_TYPES
+from .gaussian_cloud import GaussianCloud, get_source_filename
+from .transform_gs import get_rotation_matrix
+from .utils import detect_coordinate_properties
+
+# Number of vertices tested and written at a time
+DEFAULT_CROP_CHUNK_SIZE = 1048576
+
+# Supported values of a region's 'type'
+REGION_TYPES = ("box", "oriented_box", "sphere", "half_space", "polygon")
+
+# Axis index of the names accepted for an extruded polygon's axis
+AXIS_INDICES = {'x': 0, 'y': 1, 'z': 2}
+
+
+def crop_3dgs(ply_filename, output_ply_filename=None, region=None, invert=False,
+              chunk_size=DEFAULT_CROP_CHUNK_SIZE):
+    """
+    Keep the gaussians of a 3D Gaussian Splatting file whose positions lie inside a region
+
+    Regions are dictionaries with a 'type' key:
+    - {'type': 'box', 'min': [x, y, z], 'max': [x, y, z]}
+    - {'type': 'oriented_box', 'center': [x, y, z], 'size': [sx, sy, sz], 'rotation': R}, where
+      rotation is a 3x3 matrix, quaternion (w, x, y, z) or Euler angles in degrees (x, y, z)
+    - {'type': 'sphere', 'center': [x, y, z], 'radius': r}
+    - {'type': 'half_space', 'point': [x, y, z], 'normal': [nx, ny, nz]}, keeping the side the
+      normal points to
+    - {'type': 'polygon', 'points': [[u, v], ...], 'axis': 'z', 'min': lo, 'max': hi}, a polygon
+      in the plane of the other two axes (in x, y, z order), extruded from lo to hi along axis.
+      'min' and 'max' are optional
+
+    Args:
+        ply_filename (str or GaussianCloud): Path to the input PLY file, or an in-memory cloud
+        output_ply_filename (str, optional): Path to the output PLY file. If not specified,
+                                             it's automatically generated from the input filename,
+                                             unless ply_filename is a GaussianCloud
+        region (dict or list): Region to keep, or a list of regions whose intersection is kept
+        invert (bool, optional): Keep the gaussians outside the region instead
+        chunk_size (int, optional): Number of vertices tested and written at a time
+
+    Returns:
+        str or GaussianCloud: Path of the generated PLY file, or the cropped cloud if
+                              ply_filename is a GaussianCloud and output_ply_filename is not specified
+    """
+    if region is None:
+        raise ValueError("A region to crop to is required")
+    regions = [region] if isinstance(region, dict) else list(region)
+    for item in regions:
+        if item.get('type') not in REGION_TYPES:
+            raise ValueError(f"Unknown region type: {item.get('type')}. Expected one of {REGION_TYPES}")
+
+    # An in-memory input without an output path produces an in-memory result
+    return_cloud = output_ply_filename is None and isinstance(ply_filename, GaussianCloud)
+
+    if output_ply_filename is None:
+        base_name = os.path.splitext(get_source_filename(ply_filename))[0]
+        output_ply_filename = f"{base_name}_cropped.ply"
+
+    vertices, header = read_ply_vertices(ply_filename, memory_map=True)
+    properties = header['properties']
+    property_types = header['property_types']
+    types = [(name, property_types[name]) for name in properties]
+    dtype = np.dtype([(name, '<' + PLY_SCALAR_TYPES[ply_type]) for name, ply_type in types])
+    position_names = [properties[i] for i in detect_coordinate_properties(properties)]
+
+    # The region is tested on the positions alone, so only one byte per vertex is kept
+    # until the output size is known
+    mask = np.empty(len(vertices), dtype=bool)
+    for start in range(0, len(vertices), chunk_size):
+        positions = vertices_to_array(vertices[start:start + chunk_size], position_names, dtype=np.float64)
+        inside = np.ones(len(positions), dtype=bool)
+        for item in regions:
+            inside &= get_region_mask(positions, item)
+        mask[start:start + chunk_size] = inside != invert
+    kept_count = int(np.count_nonzero(mask))
+
+    if return_cloud:
+        cropped = vertices[mask].astype(dtype)
+        print(f"Kept {kept_count} of {len(vertices)} gaussians")
+        return GaussianCloud.from_vertices(cropped, property_types, output_ply_filename)
+
+    header_text = generate_ply_header(types, kept_count, "binary_little_endian 1.0") + "\nend_header\n"
+    with open(output_ply_filename, "wb") as f:
+        f.write(header_text.encode("ascii"))
+        for start in range(0, len(vertices), chunk_size):
+            block_mask = mask[start:start + chunk_size]
+            if block_mask.any():
+                vertices[start:start + chunk_size][block_mask].astype(dtype).tofile(f)
+
+    print(f"Kept {kept_count} of {len(vertices)} gaussians")
+    return output_ply_filename
+
+
+def get_region_mask(positions, region):
+    """
+    Test which positions lie inside a region
+
+    Args:
+        positions (numpy.ndarray): Array of shape (N, 3)
+        region (dict): Region as described in crop_3dgs
+
+    Returns:
+        numpy.ndarray: Boolean array with True for positions inside the region (boundary included)
+    """
+    region_type = region.get('type')
+
+    if region_type == 'box':
+        lower = np.asarray(region['min'], dtype=np.float64)
+        upper = np.asarray(region['max'], dtype=np.float64)
+        return np.all((positions >= lower) & (positions <= upper), axis=1)
+
+    if region_type == 'oriented_box':
+        rotation = get_rotation_matrix(region.get('rotation'))
+        local = positions - np.asarray(region['center'], dtype=np.float64)
+        if rotation is not None:
+            # Coordinates along the box axes, the columns of the rotation
+            local = local @ rotation
+        half_size = 0.5 * np.asarray(region['size'], dtype=np.float64)
+        return np.all(np.abs(local) <= half_size, axis=1)
+
+    if region_type == 'sphere':
+        offsets = positions - np.asarray(region['center'], dtype=np.float64)
+        return np.einsum('ij,ij->i', offsets, offsets) <= float(region['radius']) ** 2
+
+    if region_type == 'half_space':
+        normal = np.asarray(region['normal'], dtype=np.float64)
+        point = np.asarray(region.get('point', (0.0, 0.0, 0.0)), dtype=np.float64)
+        return (positions - point) @ normal >= 0
+
+    if region_type == 'polygon':
+        axis = region.get('axis', 'z')
+        axis = AXIS_INDICES[axis] if isinstance(axis, str) else int(axis)
+        plane_axes = [i for i in range(3) if i != axis]
+        inside = contains_points(np.asarray(region['points'], dtype=np.float64), positions[:, plane_axes])
+        if region.get('min') is not None:
+            inside &= positions[:, axis] >= region['min']
+        if region.get('max') is not None:
+            inside &= positions[:, axis] <= region['max']
+        return inside
+
+    raise ValueError(f"Unknown region type: {region_type}. Expected one of {REGION_TYPES}")
+
+
+def contains_points(polygon, points):
+    """
+    Test which 2D points lie inside a polygon (even-odd rule)
+
+    The loop runs over the polygon's edges, testing all points against an edge at once.
+
+    Args:
+        polygon (numpy.ndarray): Polygon vertices of shape (M, 2), without repeating the first
+        points (numpy.ndarray): Points of shape (N, 2)
+
+    Returns:
+        numpy.ndarray: Boolean array with True for points inside the polygon
+    """
+    if len(polygon) < 3:
+        raise ValueError("A polygon needs at least 3 points")
+
+    u = np.ascontiguousarray(points[:, 0])
+    v = np.ascontiguousarray(points[:, 1])
+    inside = np.zeros(len(points), dtype=bool)
+    for (u1, v1), (u2, v2) in zip(polygon, np.roll(polygon, -1, axis=0)):
+        if v1 == v2:
+            # Horizontal edges never cross the ray cast along +u
+            continue
+        # Flip points whose ray along +u crosses this edge
+        crosses = (v1 > v) != (v2 > v)
+        crosses &= u < u1 + (v - v1) * ((u2 - u1) / (v2 - v1))
+        inside ^= crosses
+    return inside
+
+
+def parse_region_arguments(args, parser):
+    """
+    Build the list of regions given on the command line
+
+    Args:
+        args (argparse.Namespace): Parsed arguments
+        parser (argparse.ArgumentParser): Parser used to report invalid arguments
+
+    Returns:
+        list: Region dictionaries
+    """
+    regions = []
+    if args.box:
+        regions.append({'type': 'box', 'min': args.box[:3], 'max': args.box[3:]})
+    if args.oriented_box:
+        values = args.oriented_box
+        regions.append({'type': 'oriented_box', 'center': values[:3], 'size': values[3:6], 'rotation': values[6:]})
+    if args.sphere:
+        regions.append({'type': 'sphere', 'center': args.sphere[:3], 'radius': args.sphere[3]})
+    if args.half_space:
+        regions.append({'type': 'half_space', 'point': args.half_space[:3], 'normal': args.half_space[3:]})
+    if args.polygon:
+        if len(args.polygon) < 6 or len(args.polygon) % 2:
+            parser.error("--polygon needs at least 3 points given as pairs of coordinates")
+        region = {'type': 'polygon', 'points': np.reshape(args.polygon, (-1, 2)), 'axis': args.axis}
+        if args.extrude:
+            region['min'], region['max'] = args.extrude
+        regions.append(region)
+    if not regions:
+        parser.error("at least one region is required (--box, --oriented-box, --sphere, --half-space or --polygon)")
+    return regions
+
+
+def main():
+    """Entry point for command-line execution"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Keep the gaussians of a 3DGS file inside a region. '
+                                                 'Several regions keep their intersection')
+    parser.add_argument('input_ply', help='Input PLY file')
+    parser.add_argument('--output_ply', help='Output PLY filename (default: input_filename_cropped.ply)')
+    parser.add_argument('--box', type=float, nargs=6, metavar=('MINX', 'MINY', 'MINZ', 'MAXX', 'MAXY', 'MAXZ'),
+                        help='Axis-aligned box')
+    parser.add_argument('--oriented-box', type=float, nargs=9,
+                        metavar=('CX', 'CY', 'CZ', 'SX', 'SY', 'SZ', 'RX', 'RY', 'RZ'),
+                        help='Box with center, edge lengths and rotation in degrees around the X, Y and Z axes')
+    parser.add_argument('--sphere', type=float, nargs=4, metavar=('CX', 'CY', 'CZ', 'R'),
+                        help='Sphere with center and radius')
+    parser.add_argument('--half-space', type=float, nargs=6, metavar=('PX', 'PY', 'PZ', 'NX', 'NY', 'NZ'),
+                        help='Half-space through a point, keeping the side the normal points to')
+    parser.add_argument('--polygon', type=float, nargs='+', metavar='COORD',
+                        help='Polygon as U1 V1 U2 V2 ... in the plane perpendicular to --axis')
+    parser.add_argument('--axis', choices=sorted(AXIS_INDICES), default='z',
+                        help='Extrusion axis of --polygon (default: z)')
+    parser.add_argument('--extrude', type=float, nargs=2, metavar=('MIN', 'MAX'),
+                        help='Range of --polygon along --axis (default: unbounded)')
+    parser.add_argument('--invert', action='store_true', help='Keep the gaussians outside the region instead')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CROP_CHUNK_SIZE,
+                        help='Number of vertices tested and written at a time')
+
+    args = parser.parse_args()
+    regions = parse_region_arguments(args, parser)
+
+    output_path = crop_3dgs(args.input_ply, args.output_ply, region=regions, invert=args.invert,
+                            chunk_size=args.chunk_size)
+    print(f"Crop complete: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,33 @@
-import struct
 import csv
 import os
+from collections import deque
 import numpy as np
 from . import color_utils
+from .utils import iter_csv_blocks, parse_csv_lines
+from .compressed_ply import convert_3dgs_to_compressed, write_compressed_ply
 
 
-def convert_csv_to_3dgs(csv_filename, footer_filename=None, output_ply_filename=None):
+# Target size of the CSV byte ranges handed to worker processes
+CSV_RANGE_BYTES = 32 * 1024 * 1024
+
+
+def convert_csv_to_3dgs(csv_filename, footer_filename=None, output_ply_filename=None, workers=None,
+                        compressed=False):
     """
     Convert CSV format data to 3D Gaussian Splatting format (.ply)
     
+    Blank lines are skipped. Rows that cannot be parsed (non-numeric values or a wrong number
+    of columns) are written as zeros, so every other row keeps its vertex index.
+    
     Args:
         csv_filename (str): Path to the input CSV file
         footer_filename (str, optional): Path to the footer file (deprecated, not used)
         output_ply_filename (str, optional): Path to the output PLY file. If not specified, it's automatically generated from the input filename
+        workers (int, optional): Number of worker processes. If greater than 1, the CSV is split into
+                                 newline-aligned byte ranges that are parsed in parallel and written
+                                 straight into the output file. Default is None (single process).
+        compressed (bool, optional): Write the chunked compressed PLY layout read by SuperSplat
+                                     instead of uncompressed floats. Default is False.
         
     Returns:
         str: Path of the generated PLY file
@@ -25,104 +40,453 @@ def convert_csv_to_3dgs(csv_filename, footer_filename=None, output_ply_filename=
     # Note: footer_filename is ignored as footer data is no longer used
     if footer_filename:
         print(f"Note: Footer file {footer_filename} is ignored (footers no longer used)")
+    
+    if workers is not None and workers > 1:
+        if compressed:
+            # Parallel ingest writes into a preallocated float file, which is then compressed
+            temp_ply_filename = f"{output_ply_filename}.tmp-{os.getpid()}"
+            try:
+                vertex_count = ingest_csv_parallel(csv_filename, temp_ply_filename, workers)
+                convert_3dgs_to_compressed(temp_ply_filename, output_ply_filename)
+            finally:
+                if os.path.exists(temp_ply_filename):
+                    os.remove(temp_ply_filename)
+        else:
+            vertex_count = ingest_csv_parallel(csv_filename, output_ply_filename, workers)
+        print(f"Successfully converted CSV data to 3D Gaussian Splatting format ({vertex_count} vertices)")
+        return output_ply_filename
         
-    # Load CSV data
-    with open(csv_filename, "r") as f:
-        reader = csv.reader(f)
-        header = next(reader)
-        data = [row for row in reader]
-
+    # Count the rows first so the parsed blocks can be written straight into the vertex data
+    with open(csv_filename, "rb") as f:
+        data_start = len(f.readline())
+    expected_rows = count_csv_rows(csv_filename, data_start)
+    
+    # Load CSV data in bulk blocks of parsed values
+    with open(csv_filename, "r", newline="") as f:
+        header = next(csv.reader(f))
+        num_floats = len(header)
+        
+        # Detect color-related properties
+        r_idx, g_idx, b_idx, is_sh_color = color_utils.detect_color_properties(header)
+        color_indices = [r_idx, g_idx, b_idx] if is_sh_color else []
+        
+        data = np.empty((expected_rows, num_floats), dtype=np.float32)
+        color_blocks = deque()
+        malformed_rows = []
+        color_range = None
+        row_offset = 0
+        for values, block_malformed in iter_csv_blocks(f, num_floats):
+            block_end = row_offset + len(values)
+            if block_end > len(data):
+                # Line breaks the byte count does not see, such as bare carriage returns
+                data = np.concatenate([data, np.empty((block_end - len(data), num_floats), dtype=np.float32)])
+            data[row_offset:block_end] = values
+            malformed_rows.extend(row_offset + i for i in block_malformed)
+            if color_indices:
+                # Keep color columns in double precision for the SH remapping, and their running range
+                color_values = values[:, color_indices]
+                color_blocks.append((row_offset, color_values, block_malformed))
+                color_range = merge_color_ranges(color_range, get_color_block_range(color_values, block_malformed))
+            row_offset = block_end
+    
+    data = data[:row_offset]
     vertex_count = len(data)
-    num_floats = len(header)
-
-    # Detect color-related properties
-    r_idx, g_idx, b_idx, is_sh_color = color_utils.detect_color_properties(header)
+    
+    report_malformed_rows(malformed_rows)
     
     # If color-related properties are detected
     if is_sh_color:
-        color_props = [header[i] for i in [r_idx, g_idx, b_idx]]
+        color_props = [header[i] for i in color_indices]
         print(f"Detected spherical harmonic color coefficients: {color_props}")
         
-        # Analyze color values in the CSV
-        color_values = []
-        for row in data:
-            try:
-                color_values.append([float(row[i]) for i in [r_idx, g_idx, b_idx]])
-            except (ValueError, IndexError):
-                # Skip processing if there are conversion errors or missing values
-                continue
+        # The color range of the CSV ignores rows that could not be parsed
+        color_scale = get_standard_color_scale(color_range)
+        if color_scale is not None:
+            # Remap block by block, releasing each block's colors once written
+            while color_blocks:
+                row_offset, color_values, block_malformed = color_blocks.popleft()
+                remap_colors_to_sh(data[row_offset:row_offset + len(color_values)], color_values, color_indices,
+                                   color_scale, block_malformed)
+
+    if compressed:
+        write_compressed_ply(output_ply_filename, {name: data[:, i] for i, name in enumerate(header)})
+        print(f"Successfully converted CSV data to compressed 3D Gaussian Splatting format ({vertex_count} vertices)")
+        return output_ply_filename
+
+    # Write to PLY file
+    with open(output_ply_filename, "wb") as f:
+        # Header
+        f.write(generate_3dgs_header(header, vertex_count).encode("ascii"))
         
-        if color_values:
-            # Get the range of color values
-            min_val, max_val, is_signed = color_utils.get_color_value_range(color_values)
-            print(f"Current color range: {min_val} to {max_val}, signed: {is_signed}")
-            
-            # If current values are in standard color range (0-1 or 0-255), adjust for SH coefficients
-            if max_val <= 1.0 and min_val >= 0:
-                print("Values appear to be in 0-1 range, adjusting for SH coefficients...")
-                
-                # Convert color values in each row for SH coefficients
-                for row in data:
-                    # Convert from string to numeric and process as array
-                    try:
-                        color = np.array([[float(row[r_idx]), float(row[g_idx]), float(row[b_idx])]])
-                        
-                        # Convert from standard color to SH coefficients
-                        sh_colors = color_utils.convert_standard_to_sh_color(color)
-                        
-                        # Put converted values back into the original data
-                        row[r_idx] = str(sh_colors[0][0])
-                        row[g_idx] = str(sh_colors[0][1])
-                        row[b_idx] = str(sh_colors[0][2])
-                    except (ValueError, IndexError) as e:
-                        print(f"WARNING: Error converting color value: {e}")
-            
-            elif max_val <= 255.0 and min_val >= 0:
-                print("Values appear to be in 0-255 range, normalizing and adjusting for SH coefficients...")
-                
-                # Normalize from 0-255 range to 0-1 and then convert to SH coefficients
-                for row in data:
-                    try:
-                        color = np.array([[float(row[r_idx]), float(row[g_idx]), float(row[b_idx])]])
-                        
-                        # Normalize colors and convert to SH coefficients
-                        normalized = color / 255.0
-                        sh_colors = color_utils.convert_standard_to_sh_color(normalized)
-                        
-                        # Put converted values back into the original data
-                        row[r_idx] = str(sh_colors[0][0])
-                        row[g_idx] = str(sh_colors[0][1])
-                        row[b_idx] = str(sh_colors[0][2])
-                    except (ValueError, IndexError) as e:
-                        print(f"WARNING: Error converting color value: {e}")
-
-    # Generate header
+        # Binary data for all vertices in one write
+        data.astype("<f4", copy=False).tofile(f)
+
+    print(f"Successfully converted CSV data to 3D Gaussian Splatting format ({vertex_count} vertices)")
+    return output_ply_filename
+
+
+def generate_3dgs_header(properties, vertex_count):
+    """
+    Generate a binary little-endian 3DGS PLY header with one float property per column
+    
+    Args:
+        properties (list): Property names
+        vertex_count (int): Number of vertices
+        
+    Returns:
+        str: PLY header including the end_header line
+    """
     ply_header = """ply
 format binary_little_endian 1.0
 element vertex {vertex_count}
-""" + "\n".join([f"property float {name}" for name in header]) + """
+""" + "\n".join([f"property float {name}" for name in properties]) + """
 end_header
 """
+    return ply_header.format(vertex_count=vertex_count)
 
-    final_header = ply_header.format(vertex_count=vertex_count)
 
-    # Write to PLY file
-    with open(output_ply_filename, "wb") as f:
-        # Header
-        f.write(final_header.encode("ascii"))
+def report_malformed_rows(malformed_rows):
+    """
+    Print a single warning summarizing rows that could not be parsed
+    
+    Args:
+        malformed_rows (list): Vertex indices of malformed rows
+    """
+    if malformed_rows:
+        print(f"WARNING: {len(malformed_rows)} malformed rows could not be parsed and were written as zeros "
+              f"(vertex indices: {malformed_rows[:10]}{' ...' if len(malformed_rows) > 10 else ''})")
+
+
+def get_color_block_range(colors, malformed_rows):
+    """
+    Get the range of the color values of a block of parsed CSV rows
+    
+    Args:
+        colors (np.ndarray): Color columns of the block, shape (N, 3)
+        malformed_rows (list): Row indices within the block of rows that could not be parsed
         
-        # Binary data
-        for row in data:
-            try:
-                float_values = [float(v) for v in row]
-                f.write(struct.pack("<" + "f" * num_floats, *float_values))
-            except (ValueError, struct.error) as e:
-                print(f"WARNING: Error writing vertex data: {e}")
-                # Fill with zeros if an error occurs
-                f.write(struct.pack("<" + "f" * num_floats, *[0.0] * num_floats))
+    Returns:
+        tuple: (min_val, max_val) over the valid rows, or None if the block has no valid rows
+    """
+    if malformed_rows:
+        colors = np.delete(colors, malformed_rows, axis=0)
+    if len(colors) == 0:
+        return None
+    return float(np.min(colors)), float(np.max(colors))
 
-    print(f"Successfully converted CSV data to 3D Gaussian Splatting format ({vertex_count} vertices)")
-    return output_ply_filename
+
+def merge_color_ranges(first, second):
+    """
+    Combine two color ranges from get_color_block_range
+    
+    Args:
+        first (tuple): (min_val, max_val), or None
+        second (tuple): (min_val, max_val), or None
+        
+    Returns:
+        tuple: (min_val, max_val) covering both ranges, or None if both are None
+    """
+    if first is None:
+        return second
+    if second is None:
+        return first
+    return min(first[0], second[0]), max(first[1], second[1])
+
+
+def get_standard_color_scale(color_range):
+    """
+    Detect whether CSV color values are in a standard color range that needs SH remapping
+    
+    Args:
+        color_range (tuple): (min_val, max_val) of the color values of all valid rows,
+                             or None if there are no valid rows
+        
+    Returns:
+        float: Divisor that brings the values into 0-1 range (1.0 or 255.0),
+               or None if the values should be kept as they are
+    """
+    if color_range is None:
+        return None
+    
+    # Get the range of color values
+    min_val, max_val, is_signed = color_utils.get_color_value_range(np.array(color_range))
+    print(f"Current color range: {min_val} to {max_val}, signed: {is_signed}")
+    
+    # If current values are in standard color range (0-1 or 0-255), adjust for SH coefficients
+    if max_val <= 1.0 and min_val >= 0:
+        print("Values appear to be in 0-1 range, adjusting for SH coefficients...")
+        return 1.0
+    elif max_val <= 255.0 and min_val >= 0:
+        print("Values appear to be in 0-255 range, normalizing and adjusting for SH coefficients...")
+        return 255.0
+    
+    return None
+
+
+def remap_colors_to_sh(data, color_values, color_indices, color_scale, malformed_rows, chunk_size=1048576):
+    """
+    Write SH coefficients remapped from standard colors into the color columns of vertex data
+    
+    Args:
+        data (np.ndarray): Float32 vertex data of shape (N, num_columns), e.g. a memory map
+        color_values (np.ndarray): Parsed double precision colors of the same vertices, shape (N, 3)
+        color_indices (list): Column indices of the color properties
+        color_scale (float): Divisor from get_standard_color_scale
+        malformed_rows (list): Vertex indices of malformed rows (kept at zero)
+        chunk_size (int, optional): Number of vertices remapped at a time
+    """
+    valid_rows = np.ones(len(data), dtype=bool)
+    valid_rows[malformed_rows] = False
+    
+    for start in range(0, len(data), chunk_size):
+        end = min(start + chunk_size, len(data))
+        sh_colors = color_utils.convert_standard_to_sh_color(color_values[start:end] / color_scale)
+        sh_colors[~valid_rows[start:end]] = 0.0
+        data[start:end, color_indices] = sh_colors
+
+
+def split_csv_byte_ranges(csv_filename, data_start, num_ranges):
+    """
+    Split the data section of a CSV file into byte ranges that start and end on line boundaries
+    
+    Args:
+        csv_filename (str): Path to the CSV file
+        data_start (int): Byte offset of the first data row
+        num_ranges (int): Desired number of ranges
+        
+    Returns:
+        list: List of (start, end) byte offsets
+    """
+    file_size = os.path.getsize(csv_filename)
+    boundaries = [data_start]
+    
+    with open(csv_filename, "rb") as f:
+        for i in range(1, num_ranges):
+            position = data_start + (file_size - data_start) * i // num_ranges
+            if position <= boundaries[-1]:
+                continue
+            # Move to the start of the next line
+            f.seek(position - 1)
+            f.readline()
+            position = f.tell()
+            if boundaries[-1] < position < file_size:
+                boundaries.append(position)
+    
+    boundaries.append(file_size)
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def read_csv_range_lines(csv_filename, start, end):
+    """
+    Read the non-blank lines of a CSV byte range
+    
+    Args:
+        csv_filename (str): Path to the CSV file
+        start (int): Start byte offset (beginning of a line)
+        end (int): End byte offset (beginning of a line or end of file)
+        
+    Returns:
+        list: Lines as bytes, without line terminators
+    """
+    with open(csv_filename, "rb") as f:
+        f.seek(start)
+        chunk = f.read(end - start)
+    
+    return [line for line in chunk.split(b"\n") if line.strip(b" \t\r")]
+
+
+def count_csv_range_rows(task):
+    """
+    Count the data rows in a CSV byte range (worker function)
+    
+    Args:
+        task (tuple): (csv_filename, start, end)
+        
+    Returns:
+        int: Number of non-blank lines in the range
+    """
+    csv_filename, start, end = task
+    with open(csv_filename, "rb") as f:
+        f.seek(start)
+        chunk = np.frombuffer(f.read(end - start), dtype=np.uint8)
+    
+    # A line is a data row if it contains anything besides spaces, tabs and line terminators
+    is_content = ~np.isin(chunk, np.frombuffer(b" \t\r\n", dtype=np.uint8))
+    line_ids = np.cumsum(chunk == ord("\n"))[is_content]
+    if len(line_ids) == 0:
+        return 0
+    return 1 + int(np.count_nonzero(np.diff(line_ids)))
+
+
+def count_csv_rows(csv_filename, data_start):
+    """
+    Count the data rows of a CSV file, reading one byte range at a time
+    
+    Args:
+        csv_filename (str): Path to the CSV file
+        data_start (int): Byte offset of the first data row
+        
+    Returns:
+        int: Number of non-blank lines after data_start
+    """
+    body_size = os.path.getsize(csv_filename) - data_start
+    num_ranges = max(1, -(-body_size // CSV_RANGE_BYTES))
+    return sum(count_csv_range_rows((csv_filename, start, end))
+               for start, end in split_csv_byte_ranges(csv_filename, data_start, num_ranges))
+
+
+def ingest_csv_range(task):
+    """
+    Parse a CSV byte range and write its rows into the preallocated output PLY (worker function)
+    
+    Args:
+        task (tuple): (csv_filename, start, end, num_columns, output_filename, data_offset,
+                       row_offset, expected_rows, color_indices, colors_filename)
+        
+    Returns:
+        tuple: (malformed_rows, color_range) - Vertex indices of malformed rows in this range,
+               and the range of its color values (None without colors or valid rows)
+    """
+    (csv_filename, start, end, num_columns, output_filename, data_offset,
+     row_offset, expected_rows, color_indices, colors_filename) = task
+    
+    lines = read_csv_range_lines(csv_filename, start, end)
+    if len(lines) != expected_rows:
+        raise RuntimeError(f"CSV byte range {start}-{end} changed while reading: "
+                           f"expected {expected_rows} rows, found {len(lines)}")
+    
+    malformed_rows = []
+    color_range = None
+    row_size = num_columns * 4
+    with open(output_filename, "r+b") as out:
+        for block_start in range(0, len(lines), 65536):
+            block_lines = [line.decode("utf-8") for line in lines[block_start:block_start + 65536]]
+            values, block_malformed = parse_csv_lines(block_lines, num_columns)
+            first_row = row_offset + block_start
+            malformed_rows.extend(first_row + i for i in block_malformed)
+            
+            out.seek(data_offset + first_row * row_size)
+            out.write(values.astype("<f4").tobytes())
+            
+            if colors_filename:
+                # Keep color columns in double precision for the SH remapping done afterwards
+                color_values = values[:, color_indices]
+                with open(colors_filename, "r+b") as colors_out:
+                    colors_out.seek(first_row * 3 * 8)
+                    colors_out.write(color_values.astype("<f8").tobytes())
+                color_range = merge_color_ranges(color_range, get_color_block_range(color_values, block_malformed))
+    
+    return malformed_rows, color_range
+
+
+def ingest_csv_parallel(csv_filename, output_ply_filename, workers):
+    """
+    Convert a CSV file to 3DGS PLY with multiple processes
+    
+    The CSV body is split into newline-aligned byte ranges. A first parallel pass counts
+    the rows of each range to compute output offsets, then each worker parses its range
+    and writes the rows into its slice of the preallocated output, so the row order is
+    the same as the single-process conversion. SH color remapping is applied afterwards
+    using the global color range.
+    
+    Args:
+        csv_filename (str): Path to the input CSV file
+        output_ply_filename (str): Path to the output PLY file
+        workers (int): Number of worker processes
+        
+    Returns:
+        int: Number of vertices written
+    """
+    import tempfile
+    from concurrent.futures import ProcessPoolExecutor
+    
+    with open(csv_filename, "rb") as f:
+        header_line = f.readline()
+    header = next(csv.reader([header_line.decode("utf-8")]))
+    num_columns = len(header)
+    
+    r_idx, g_idx, b_idx, is_sh_color = color_utils.detect_color_properties(header)
+    color_indices = [r_idx, g_idx, b_idx] if is_sh_color else []
+    
+    body_size = os.path.getsize(csv_filename) - len(header_line)
+    num_ranges = max(workers * 4, -(-body_size // CSV_RANGE_BYTES))
+    ranges = split_csv_byte_ranges(csv_filename, len(header_line), num_ranges)
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        row_counts = list(executor.map(count_csv_range_rows,
+                                       [(csv_filename, start, end) for start, end in ranges]))
+        vertex_count = sum(row_counts)
+        print(f"Parsing {vertex_count} rows in {len(ranges)} ranges with {workers} workers")
+        
+        # Preallocate the output so every worker can write its slice independently
+        ply_header = generate_3dgs_header(header, vertex_count).encode("ascii")
+        with open(output_ply_filename, "wb") as f:
+            f.write(ply_header)
+            f.truncate(len(ply_header) + vertex_count * num_columns * 4)
+        
+        colors_filename = None
+        if color_indices:
+            fd, colors_filename = tempfile.mkstemp(suffix=".colors",
+                                                   dir=os.path.dirname(os.path.abspath(output_ply_filename)))
+            with os.fdopen(fd, "wb") as f:
+                f.truncate(vertex_count * 3 * 8)
+        
+        try:
+            tasks = []
+            row_offset = 0
+            for (start, end), row_count in zip(ranges, row_counts):
+                tasks.append((csv_filename, start, end, num_columns, output_ply_filename, len(ply_header),
+                              row_offset, row_count, color_indices, colors_filename))
+                row_offset += row_count
+            
+            malformed_rows = []
+            color_range = None
+            for range_malformed, range_colors in executor.map(ingest_csv_range, tasks):
+                malformed_rows.extend(range_malformed)
+                color_range = merge_color_ranges(color_range, range_colors)
+            
+            report_malformed_rows(malformed_rows)
+            
+            if color_indices and vertex_count > 0:
+                color_props = [header[i] for i in color_indices]
+                print(f"Detected spherical harmonic color coefficients: {color_props}")
+                remap_ply_colors_to_sh(output_ply_filename, len(ply_header), num_columns, color_indices,
+                                       colors_filename, color_range, vertex_count, malformed_rows)
+        finally:
+            if colors_filename and os.path.exists(colors_filename):
+                os.remove(colors_filename)
+    
+    return vertex_count
+
+
+def remap_ply_colors_to_sh(output_ply_filename, data_offset, num_columns, color_indices,
+                           colors_filename, color_range, vertex_count, malformed_rows):
+    """
+    Remap the color columns of a written PLY file from standard colors to SH coefficients
+    
+    Args:
+        output_ply_filename (str): PLY file written by the parallel workers
+        data_offset (int): Byte offset of the vertex data
+        num_columns (int): Number of float properties per vertex
+        color_indices (list): Column indices of the color properties
+        colors_filename (str): Raw float64 file with the parsed color columns
+        color_range (tuple): (min_val, max_val) of the color values of all valid rows
+        vertex_count (int): Number of vertices
+        malformed_rows (list): Vertex indices of malformed rows (kept at zero)
+    """
+    color_scale = get_standard_color_scale(color_range)
+    if color_scale is None:
+        return
+    
+    color_values = np.memmap(colors_filename, dtype="<f8", mode="r", shape=(vertex_count, 3))
+    data = np.memmap(output_ply_filename, dtype="<f4", mode="r+", offset=data_offset,
+                     shape=(vertex_count, num_columns))
+    remap_colors_to_sh(data, color_values, color_indices, color_scale, malformed_rows)
+    data.flush()
+    
+    # Release the memory maps so the temporary colors file can be removed on every platform
+    del data
+    del color_values
 
 
 def main():
@@ -133,13 +497,19 @@ def main():
     parser.add_argument('input_csv', help='Input CSV file')
     parser.add_argument('--footer', help='Footer filename (deprecated, not used)')
     parser.add_argument('--output_ply', help='Output PLY filename (default: input_filename_restored.ply)')
+    parser.add_argument('-j', '--workers', type=int, default=1,
+                        help='Number of worker processes for parsing the CSV (default: 1)')
+    parser.add_argument('--compressed', action='store_true',
+                        help='Write the chunked compressed PLY layout read by SuperSplat')
     
     args = parser.parse_args()
     
     output_path = convert_csv_to_3dgs(
         args.input_csv,
         args.footer,
-        args.output_ply
+        args.output_ply,
+        workers=args.workers,
+        compressed=args.compressed
     )
     
     print(f"Restoration complete: {output_path}")
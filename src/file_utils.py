@@ -6,14 +6,40 @@ used in the 3DGS Editor library.
 """
 
 import os
+import re
+import shutil
 import numpy as np
 from .utils import ensure_directory_exists, auto_output_filename
 
 
+# Mapping from PLY scalar type names to NumPy type codes (byte order is added separately)
+PLY_SCALAR_TYPES = {
+    'char': 'i1', 'int8': 'i1',
+    'uchar': 'u1', 'uint8': 'u1',
+    'short': 'i2', 'int16': 'i2',
+    'ushort': 'u2', 'uint16': 'u2',
+    'int': 'i4', 'int32': 'i4',
+    'uint': 'u4', 'uint32': 'u4',
+    'float': 'f4', 'float32': 'f4',
+    'double': 'f8', 'float64': 'f8',
+}
+
+# Mapping from binary PLY formats to NumPy byte order characters
+PLY_BYTE_ORDERS = {
+    'binary_little_endian': '<',
+    'binary_big_endian': '>',
+}
+
+# Linux ioctl request that makes a file share the blocks of another (reflink)
+FICLONE = 0x40049409
+
+
 def read_ply_header(file_obj):
     """
     Read and parse the PLY header.
     
+    Use parse_ply_header to also get property types, element counts and byte order.
+    
     Args:
         file_obj: File object opened in binary mode
         
@@ -21,34 +47,11 @@ def read_ply_header(file_obj):
         tuple: (properties, is_binary, header_lines) - List of properties, binary flag,
                and number of header lines read
     """
-    properties = []
-    is_binary = False
-    header_lines = 0
-    line = file_obj.readline().decode('utf-8').strip()
-    header_lines += 1
-    
-    if not line.startswith("ply"):
-        raise ValueError("Not a valid PLY file")
+    header = parse_ply_header(file_obj)
+    properties = [prop[0] for element in header['elements'] for prop in element['properties']]
+    is_binary = header['format'] in PLY_BYTE_ORDERS
     
-    # Read header
-    while True:
-        line = file_obj.readline().decode('utf-8').strip()
-        header_lines += 1
-        
-        if line == "end_header":
-            break
-        
-        if line.startswith("format"):
-            if "binary" in line:
-                is_binary = True
-        
-        if line.startswith("property"):
-            # Extract property name
-            parts = line.split()
-            if len(parts) >= 3:
-                properties.append(parts[-1])
-    
-    return properties, is_binary, header_lines
+    return properties, is_binary, header['header_lines']
 
 
 def extract_ply_footer(ply_filename, include_end_header=False):
@@ -136,3 +139,565 @@ def generate_ply_header(properties, vertex_count, format_type="ascii 1.0"):
         header.append(f"property {prop_type} {prop_name}")
     
     return "\n".join(header)
+
+
+def parse_ply_header(file_obj):
+    """
+    Parse the PLY header into a typed description of its elements and properties.
+    
+    Args:
+        file_obj: File object opened in binary mode, positioned at the start of the file
+        
+    Returns:
+        dict: Header information with keys 'format' ('ascii', 'binary_little_endian' or
+              'binary_big_endian'), 'elements' (list of dicts with 'name', 'count' and
+              'properties' as (name, type) tuples), 'vertex_count', 'properties',
+              'property_types', 'header_size' (byte offset of the body) and 'header_lines'
+    """
+    line = file_obj.readline()
+    if not line.strip().startswith(b"ply"):
+        raise ValueError("Not a valid PLY file")
+    
+    header = {
+        'format': None,
+        'elements': [],
+        'vertex_count': 0,
+        'properties': [],
+        'property_types': {},
+        'header_size': 0,
+        'header_lines': 1,
+    }
+    
+    while True:
+        line = file_obj.readline()
+        if not line:
+            raise ValueError("Invalid PLY file format: end_header not found")
+        header['header_lines'] += 1
+        
+        parts = line.decode('ascii', errors='replace').split()
+        if not parts or parts[0] in ("comment", "obj_info"):
+            continue
+        
+        if parts[0] == "end_header":
+            break
+        elif parts[0] == "format":
+            header['format'] = parts[1]
+        elif parts[0] == "element":
+            header['elements'].append({'name': parts[1], 'count': int(parts[2]), 'properties': []})
+        elif parts[0] == "property" and header['elements']:
+            element = header['elements'][-1]
+            if parts[1] == "list":
+                # List properties: (name, 'list', count_type, item_type)
+                element['properties'].append((parts[-1], 'list', parts[2], parts[3]))
+            else:
+                element['properties'].append((parts[-1], parts[1]))
+    
+    if header['format'] != "ascii" and header['format'] not in PLY_BYTE_ORDERS:
+        raise ValueError(f"Unsupported PLY format: {header['format']}")
+    
+    header['header_size'] = file_obj.tell()
+    
+    for element in header['elements']:
+        if element['name'] == 'vertex':
+            header['vertex_count'] = element['count']
+            header['properties'] = [prop[0] for prop in element['properties']]
+            header['property_types'] = {prop[0]: prop[1] for prop in element['properties']}
+            break
+    
+    return header
+
+
+def is_compressed_ply_header(header):
+    """
+    Check whether a parsed header describes a chunked compressed 3DGS PLY file (SuperSplat layout).
+    
+    Args:
+        header (dict): Header information from parse_ply_header
+        
+    Returns:
+        bool: True if the file has a chunk element and packed vertex properties
+    """
+    element_names = [element['name'] for element in header['elements']]
+    return 'chunk' in element_names and 'packed_position' in header['properties']
+
+
+def get_element_dtype(element, byte_order='<'):
+    """
+    Build a NumPy structured dtype for one record of a PLY element.
+    
+    Args:
+        element (dict): Element description from parse_ply_header
+        byte_order (str): NumPy byte order character ('<', '>' or '=')
+        
+    Returns:
+        numpy.dtype: Structured dtype with one field per property
+    """
+    fields = []
+    for prop in element['properties']:
+        if prop[1] == 'list':
+            raise ValueError(f"List property '{prop[0]}' in element '{element['name']}' has no fixed size")
+        if prop[1] not in PLY_SCALAR_TYPES:
+            raise ValueError(f"Unsupported PLY property type: {prop[1]}")
+        fields.append((prop[0], byte_order + PLY_SCALAR_TYPES[prop[1]]))
+    
+    return np.dtype(fields)
+
+
+def get_vertex_dtype(header):
+    """
+    Build a NumPy structured dtype for one vertex record of a PLY file.
+    
+    Binary files use the byte order declared in the header; ASCII files use native order.
+    
+    Args:
+        header (dict): Header information from parse_ply_header
+        
+    Returns:
+        numpy.dtype: Structured dtype with one field per vertex property
+    """
+    byte_order = PLY_BYTE_ORDERS.get(header['format'], '=')
+    for element in header['elements']:
+        if element['name'] == 'vertex':
+            return get_element_dtype(element, byte_order)
+    
+    raise ValueError("PLY file has no vertex element")
+
+
+def get_vertex_offset(header):
+    """
+    Calculate the byte offset of the vertex block in a binary PLY file.
+    
+    Args:
+        header (dict): Header information from parse_ply_header
+        
+    Returns:
+        int: Byte offset from the start of the file
+    """
+    byte_order = PLY_BYTE_ORDERS.get(header['format'], '=')
+    offset = header['header_size']
+    for element in header['elements']:
+        if element['name'] == 'vertex':
+            return offset
+        # Elements stored before the vertices must have a fixed record size to be skipped
+        offset += element['count'] * get_element_dtype(element, byte_order).itemsize
+    
+    raise ValueError("PLY file has no vertex element")
+
+
+def read_ascii_ply_vertices(file_obj, header):
+    """
+    Parse the vertex records of an ASCII PLY body in bulk.
+    
+    Args:
+        file_obj: File object opened in binary mode, positioned at the start of the body
+        header (dict): Header information from parse_ply_header
+        
+    Returns:
+        numpy.ndarray: Structured vertex array with the declared property types
+    """
+    import io
+    
+    # Every element record occupies exactly one line in ASCII PLY files
+    skip_lines = 0
+    for element in header['elements']:
+        if element['name'] == 'vertex':
+            break
+        skip_lines += element['count']
+    
+    if header['vertex_count'] == 0:
+        return np.zeros(0, dtype=get_vertex_dtype(header))
+    
+    body = io.StringIO(file_obj.read().decode('ascii'))
+    return np.loadtxt(body, dtype=get_vertex_dtype(header), skiprows=skip_lines,
+                      max_rows=header['vertex_count'], ndmin=1)
+
+
+def read_ply_vertices(ply_filename, allow_truncated=False, memory_map=False):
+    """
+    Read the vertex block of a PLY file as a NumPy structured array.
+    
+    Binary bodies (either byte order) are decoded with a single np.frombuffer call, so
+    no per-vertex Python objects are created and every property keeps its declared type.
+    With memory_map=True the block is mapped with np.memmap at the header offset
+    instead of being read, so pages are only loaded from disk when the corresponding
+    columns are accessed. ASCII bodies are parsed in bulk and cannot be memory-mapped.
+    A GaussianCloud can be passed instead of a path; its vertices are returned directly.
+    Compressed PLY files (SuperSplat layout) are decoded into standard 3DGS properties.
+    
+    Args:
+        ply_filename (str or GaussianCloud): Path to the PLY file, or an in-memory cloud
+        allow_truncated (bool): If True, return only the complete vertices of a truncated
+                                file instead of raising an error
+        memory_map (bool): If True, memory-map the vertex block instead of reading it
+        
+    Returns:
+        tuple: (vertices, header) - Structured vertex array and header information
+    """
+    from .gaussian_cloud import GaussianCloud
+    
+    if isinstance(ply_filename, GaussianCloud):
+        return ply_filename.to_vertices()
+    
+    with open(ply_filename, "rb") as f:
+        header = parse_ply_header(f)
+        vertex_count = header['vertex_count']
+        
+        if is_compressed_ply_header(header):
+            # Compressed files are decoded into standard float properties
+            from .compressed_ply import read_compressed_ply
+            return read_compressed_ply(ply_filename)
+        
+        if header['format'] == "ascii":
+            vertices = read_ascii_ply_vertices(f, header)
+            available = len(vertices)
+        else:
+            dtype = get_vertex_dtype(header)
+            offset = get_vertex_offset(header)
+            # Python integers keep offsets and sizes exact for files larger than 4 GB
+            file_size = os.fstat(f.fileno()).st_size
+            available = max(0, file_size - offset) // dtype.itemsize
+        
+        if available < vertex_count:
+            if not allow_truncated:
+                raise ValueError(f"PLY vertex data is truncated: expected {vertex_count} vertices, found {available}")
+            print(f"WARNING: PLY vertex data is truncated: expected {vertex_count} vertices, found {available}")
+            vertex_count = available
+        
+        if header['format'] == "ascii":
+            return vertices, header
+        
+        if memory_map:
+            if vertex_count == 0:
+                # np.memmap cannot map an empty region
+                return np.zeros(0, dtype=dtype), header
+            vertices = np.memmap(ply_filename, dtype=dtype, mode='r', offset=offset, shape=(vertex_count,))
+            return vertices, header
+        
+        # Read only the vertex block and decode it without an intermediate copy
+        f.seek(offset)
+        content = f.read(vertex_count * dtype.itemsize)
+    
+    vertices = np.frombuffer(content, dtype=dtype, count=vertex_count)
+    return vertices, header
+
+
+def read_ply_header_info(ply_filename):
+    """
+    Read and parse only the header of a PLY file.
+    
+    Args:
+        ply_filename (str or GaussianCloud): Path to the PLY file, or an in-memory cloud
+        
+    Returns:
+        dict: Header information in the form returned by parse_ply_header
+    """
+    from .gaussian_cloud import GaussianCloud
+    
+    if isinstance(ply_filename, GaussianCloud):
+        return ply_filename.get_header()
+    
+    with open(ply_filename, "rb") as f:
+        header = parse_ply_header(f)
+    
+    if is_compressed_ply_header(header):
+        # The decoded properties are only known after decoding the file
+        return read_ply_vertices(ply_filename)[1]
+    return header
+
+
+def read_ply_properties(ply_filename, properties, allow_truncated=False):
+    """
+    Read only the given vertex properties of a PLY file.
+    
+    Binary vertex blocks are memory-mapped and projected onto the requested fields, so
+    the result is a strided zero-copy view and only those columns are touched when it
+    is used. ASCII bodies have to be parsed completely before they are projected.
+    
+    Args:
+        ply_filename (str or GaussianCloud): Path to the PLY file, or an in-memory cloud
+        properties (list): Names of the vertex properties to read
+        allow_truncated (bool): If True, return only the complete vertices of a truncated
+                                file instead of raising an error
+        
+    Returns:
+        tuple: (vertices, header) - Structured vertex array with only the requested fields,
+               and header information for the whole file
+    """
+    from .gaussian_cloud import GaussianCloud
+    
+    if isinstance(ply_filename, GaussianCloud):
+        return ply_filename.to_vertices(properties)
+    
+    vertices, header = read_ply_vertices(ply_filename, allow_truncated=allow_truncated, memory_map=True)
+    return select_vertex_properties(vertices, properties), header
+
+
+def select_vertex_properties(vertices, properties):
+    """
+    Project a structured vertex array onto a subset of its properties without copying.
+    
+    Args:
+        vertices (numpy.ndarray): Structured vertex array
+        properties (list): Names of the properties to keep, in the desired order
+        
+    Returns:
+        numpy.ndarray: Structured view containing only the requested fields
+    """
+    missing = [name for name in properties if name not in vertices.dtype.names]
+    if missing:
+        raise ValueError(f"Properties not found in PLY vertex data: {missing}")
+    
+    return vertices[list(properties)]
+
+
+def write_ply_vertices(file_obj, vertices, header):
+    """
+    Write a structured vertex array using the body encoding declared in a PLY header.
+    
+    Values are cast to each property's declared type, so integer and double properties
+    are written as such instead of being widened to float.
+    
+    Args:
+        file_obj: File object opened in binary mode, positioned at the start of the vertex block
+        vertices (numpy.ndarray): Structured vertex array with the header's vertex properties
+        header (dict): Header information from parse_ply_header
+    """
+    dtype = get_vertex_dtype(header)
+    
+    if header['format'] != "ascii":
+        file_obj.write(vertices.astype(dtype, copy=False).tobytes())
+        return
+    
+    # Shortest formats that round-trip each PLY scalar type
+    formats = []
+    for name in dtype.names:
+        kind = dtype[name].kind
+        if kind in 'iu':
+            formats.append('%d')
+        elif dtype[name].itemsize == 4:
+            formats.append('%.9g')
+        else:
+            formats.append('%.17g')
+    
+    np.savetxt(file_obj, vertices.astype(dtype, copy=False), fmt=formats, delimiter=' ')
+
+
+def vertices_to_array(vertices, properties=None, dtype=np.float32):
+    """
+    Convert a structured vertex array into a 2D array with one column per property.
+    
+    Args:
+        vertices (numpy.ndarray): Structured vertex array from read_ply_vertices
+        properties (list, optional): Property names to include. Defaults to all properties
+        dtype: Output data type. Defaults to float32
+        
+    Returns:
+        numpy.ndarray: Array of shape (vertex_count, len(properties))
+    """
+    from numpy.lib import recfunctions
+    
+    if properties is not None:
+        vertices = vertices[list(properties)]
+    
+    return recfunctions.structured_to_unstructured(vertices, dtype=dtype)
+
+
+def columns_to_array(columns, properties, dtype=np.float32):
+    """
+    Stack named columns into a 2D array with one column per property.
+    
+    Args:
+        columns (numpy.ndarray or dict): Structured vertex array, or a mapping from property name
+                                         to values such as a dict or GaussianCloud
+        properties (list): Property names to include
+        dtype: Output data type. Defaults to float32
+        
+    Returns:
+        numpy.ndarray: Array of shape (vertex_count, len(properties))
+    """
+    if isinstance(columns, np.ndarray) and columns.dtype.names is not None:
+        return vertices_to_array(columns, properties, dtype=dtype)
+    return np.column_stack([np.asarray(columns[name], dtype=dtype) for name in properties])
+
+
+def get_column_names(columns):
+    """
+    Get the property names of a structured vertex array or a mapping of columns.
+    
+    Args:
+        columns (numpy.ndarray or dict): Structured vertex array, or a mapping from property name
+                                         to values such as a dict or GaussianCloud
+        
+    Returns:
+        list: Property names
+    """
+    if isinstance(columns, np.ndarray) and columns.dtype.names is not None:
+        return list(columns.dtype.names)
+    return list(columns.keys())
+
+
+def array_to_vertices(values, dtype):
+    """
+    Convert a 2D array with one column per property into a structured vertex array.
+    
+    Integer properties are rounded and clipped to the range of their type.
+    
+    Args:
+        values (numpy.ndarray): Array of shape (vertex_count, len(dtype.names))
+        dtype (numpy.dtype): Structured vertex dtype, e.g. from get_vertex_dtype
+        
+    Returns:
+        numpy.ndarray: Structured vertex array
+    """
+    values = np.asarray(values).reshape(-1, len(dtype.names))
+    vertices = np.empty(len(values), dtype=dtype)
+    
+    for i, name in enumerate(dtype.names):
+        column = values[:, i]
+        if dtype[name].kind in 'iu':
+            info = np.iinfo(dtype[name])
+            column = np.clip(np.rint(column), info.min, info.max)
+        vertices[name] = column
+    
+    return vertices
+
+
+def get_pointcloud_arrays(vertices, position_properties, color_properties=None):
+    """
+    Extract positions and colors from a structured point cloud vertex array.
+    
+    Only the requested fields are read, so any extra properties (normals, scalar
+    fields, ...) are skipped without being decoded.
+    
+    Args:
+        vertices (numpy.ndarray): Structured vertex array from read_ply_vertices
+        position_properties (list): Names of the x, y and z properties
+        color_properties (list, optional): Names of the red, green and blue properties.
+                                           If None, every point is white
+        
+    Returns:
+        tuple: (points, colors) - float32 array of shape (vertex_count, 3), and an array of
+               shape (vertex_count, 3) that is uint8 for uchar colors and float32 otherwise
+    """
+    points = vertices_to_array(vertices, position_properties, dtype=np.float32)
+    
+    if color_properties is None:
+        return points, np.full((len(vertices), 3), 255, dtype=np.uint8)
+    
+    if all(vertices.dtype[name] == np.uint8 for name in color_properties):
+        color_dtype = np.uint8
+    else:
+        color_dtype = np.float32
+    return points, vertices_to_array(vertices, color_properties, dtype=color_dtype)
+
+
+def clone_file(src_filename, dst_filename):
+    """
+    Copy a file, sharing its data blocks with the source where the filesystem supports it.
+    
+    On filesystems with reflinks (Btrfs, XFS, ...) the copy is created instantly and
+    only blocks that are later modified take extra space. Elsewhere the file is copied.
+    
+    Args:
+        src_filename (str): Path to the source file
+        dst_filename (str): Path to the copy
+        
+    Returns:
+        str: Path of the copy
+    """
+    try:
+        import fcntl
+        with open(src_filename, "rb") as src, open(dst_filename, "wb") as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        return dst_filename
+    except (ImportError, OSError):
+        # Not supported on this platform or filesystem
+        pass
+    
+    shutil.copyfile(src_filename, dst_filename)
+    return dst_filename
+
+
+def patch_ply_vertices(ply_filename, header, columns):
+    """
+    Overwrite vertex properties of a binary PLY file in place.
+    
+    The vertex block is memory-mapped and each column is written as one strided
+    assignment, so the other properties are neither read nor rewritten.
+    
+    Args:
+        ply_filename (str): Path to the PLY file to modify
+        header (dict): Header information of the file from parse_ply_header
+        columns (dict): Mapping from property name to an array with one value per vertex.
+                        Values are cast like array_to_vertices (integers are rounded and clipped)
+    """
+    if header['format'] not in PLY_BYTE_ORDERS:
+        raise ValueError("Only binary PLY files can be patched in place")
+    if header['vertex_count'] == 0 or not columns:
+        return
+    
+    dtype = get_vertex_dtype(header)
+    vertices = np.memmap(ply_filename, dtype=dtype, mode='r+', offset=get_vertex_offset(header),
+                         shape=(header['vertex_count'],))
+    set_vertex_columns(vertices, columns)
+    vertices.flush()
+    del vertices
+
+
+def set_vertex_columns(vertices, columns):
+    """
+    Overwrite columns of a structured vertex array, keeping each property's type.
+    
+    Args:
+        vertices (numpy.ndarray): Structured vertex array to modify
+        columns (dict): Mapping from property name to an array with one value per vertex.
+                        Values are cast like array_to_vertices (integers are rounded and clipped)
+    """
+    for name, values in columns.items():
+        if vertices.dtype[name].kind == 'f':
+            # Floats are cast directly, without an intermediate structured array
+            vertices[name] = values
+            continue
+        column_dtype = np.dtype([(name, vertices.dtype[name])])
+        vertices[name] = array_to_vertices(np.asarray(values, dtype=np.float64), column_dtype)[name]
+
+
+def set_vertex_array(vertices, properties, values):
+    """
+    Overwrite columns of a structured vertex array from a 2D array, keeping each property's type.
+    
+    When the properties share one float type and are evenly spaced in the record (like x, y, z
+    or f_rest_*), the values are written through a 2D view of the vertices in a single assignment.
+    
+    Args:
+        vertices (numpy.ndarray): Structured vertex array to modify
+        properties (list): Property names, one per column of values
+        values (numpy.ndarray): Array of shape (vertex_count, len(properties))
+    """
+    from numpy.lib import recfunctions
+    
+    properties = list(properties)
+    values = np.asarray(values).reshape(len(vertices), len(properties))
+    types = {vertices.dtype[name] for name in properties}
+    if len(types) == 1 and next(iter(types)).kind == 'f':
+        view = recfunctions.structured_to_unstructured(vertices[properties], copy=False)
+        if np.may_share_memory(view, vertices):
+            view[...] = values
+            return
+    
+    set_vertex_columns(vertices, dict(zip(properties, values.T)))
+
+
+def set_header_vertex_count(header_text, vertex_count):
+    """
+    Replace the vertex count in the text of a PLY header.
+    
+    Args:
+        header_text (str): PLY header text including the end_header line
+        vertex_count (int): New number of vertices
+        
+    Returns:
+        str: Header text with the updated "element vertex" line
+    """
+    return re.sub(r"^element vertex \d+", f"element vertex {vertex_count}", header_text,
+                  count=1, flags=re.MULTILINE)
@@ -0,0 +1,288 @@
+"""
+3D Gaussian Splatting In-Memory Scene Module
+
+This module provides the GaussianCloud class, an in-memory 3DGS scene that can be passed
+to the converters in place of a 3DGS file path. Chaining several operations on a
+GaussianCloud avoids writing and rereading a temporary PLY file at every step.
+"""
+
+import numpy as np
+
+from .file_utils import (read_ply_vertices, write_ply_vertices, generate_ply_header, array_to_vertices,
+                         PLY_SCALAR_TYPES)
+
+# Filename used to derive output names for clouds that were not loaded from a file
+DEFAULT_CLOUD_FILENAME = "gaussian_cloud.ply"
+
+
+class GaussianCloud:
+    """
+    In-memory 3D Gaussian Splatting scene stored as float32 columns
+
+    The values are held in a single (property_count, vertex_count) float32 array, so
+    each property is one contiguous row. Indexing by property name returns that row as
+    a view, and the named groups (positions, f_dc, f_rest, opacity, scale, rot) return
+    (vertex_count, k) views whenever their properties are stored next to each other,
+    as they are in files written by 3DGS training code.
+
+    The original PLY type of every property is kept, so saving restores integer and
+    double properties with their declared types (doubles are held at float32 precision).
+    """
+
+    def __init__(self, data, properties, property_types=None, filename=None):
+        """
+        Args:
+            data (numpy.ndarray): Array of shape (len(properties), vertex_count)
+            properties (list): Property names, in file order
+            property_types (dict, optional): PLY type per property. Defaults to 'float'
+            filename (str, optional): Path of the file the cloud was loaded from
+        """
+        property_types = property_types or {}
+        self.data = np.ascontiguousarray(data, dtype=np.float32).reshape(len(properties), -1)
+        self.properties = list(properties)
+        self.property_types = {name: property_types.get(name, 'float') for name in self.properties}
+        self.filename = filename
+        self._index = {name: i for i, name in enumerate(self.properties)}
+
+    @classmethod
+    def from_vertices(cls, vertices, property_types=None, filename=None):
+        """
+        Create a cloud from a structured vertex array such as the one returned by read_ply_vertices
+
+        Args:
+            vertices (numpy.ndarray): Structured vertex array
+            property_types (dict, optional): PLY type per property
+            filename (str, optional): Path of the file the vertices were read from
+
+        Returns:
+            GaussianCloud: New cloud holding a float32 copy of the vertices
+        """
+        properties = list(vertices.dtype.names)
+        data = np.empty((len(properties), len(vertices)), dtype=np.float32)
+        for i, name in enumerate(properties):
+            data[i] = vertices[name]
+        return cls(data, properties, property_types, filename)
+
+    @classmethod
+    def from_columns(cls, columns, property_types=None, filename=None):
+        """
+        Create a cloud from a mapping of property name to 1D array
+
+        Args:
+            columns (dict): Mapping from property name to 1D array, in property order
+            property_types (dict, optional): PLY type per property
+            filename (str, optional): Path of the file the columns were read from
+
+        Returns:
+            GaussianCloud: New cloud holding a float32 copy of the columns
+        """
+        properties = list(columns)
+        lengths = {len(columns[name]) for name in properties}
+        if len(lengths) > 1:
+            raise ValueError(f"All columns must have the same length, got {sorted(lengths)}")
+
+        data = np.empty((len(properties), lengths.pop() if lengths else 0), dtype=np.float32)
+        for i, name in enumerate(properties):
+            data[i] = columns[name]
+        return cls(data, properties, property_types, filename)
+
+    @classmethod
+    def load(cls, ply_filename, memory_map=False):
+        """
+        Load a 3D Gaussian Splatting file (.ply)
+
+        Args:
+            ply_filename (str): Path to the PLY file
+            memory_map (bool, optional): Memory-map the file while copying it into the cloud
+
+        Returns:
+            GaussianCloud: Loaded cloud
+        """
+        vertices, header = read_ply_vertices(ply_filename, memory_map=memory_map)
+        return cls.from_vertices(vertices, header['property_types'], ply_filename)
+
+    def save(self, ply_filename):
+        """
+        Save the cloud as a binary little-endian 3D Gaussian Splatting file (.ply)
+
+        Args:
+            ply_filename (str): Path to the output PLY file
+
+        Returns:
+            str: Path of the generated PLY file
+        """
+        vertices, header = self.to_vertices()
+        with open(ply_filename, "wb") as f:
+            f.write(self.header_text().encode("ascii"))
+            write_ply_vertices(f, vertices, header)
+        return ply_filename
+
+    def header_text(self):
+        """
+        Get the PLY header describing the cloud in binary little-endian format
+
+        Returns:
+            str: Header text including the end_header line
+        """
+        types = [(name, self.property_types[name]) for name in self.properties]
+        return generate_ply_header(types, len(self), "binary_little_endian 1.0") + "\nend_header\n"
+
+    def get_header(self):
+        """
+        Get header information describing the cloud
+
+        Returns:
+            dict: Header information in the same form as parse_ply_header
+        """
+        types = [(name, self.property_types[name]) for name in self.properties]
+        header_text = self.header_text()
+        return {
+            'format': 'binary_little_endian',
+            'elements': [{'name': 'vertex', 'count': len(self), 'properties': types}],
+            'vertex_count': len(self),
+            'properties': list(self.properties),
+            'property_types': dict(self.property_types),
+            'header_size': len(header_text.encode("ascii")),
+            'header_lines': header_text.count("\n"),
+        }
+
+    def to_vertices(self, properties=None):
+        """
+        Convert the cloud into a structured vertex array with each property's PLY type
+
+        Args:
+            properties (list, optional): Property names to include. Defaults to all properties
+
+        Returns:
+            tuple: (vertices, header) - Structured vertex array and header information
+                   in the same form as read_ply_vertices
+        """
+        if properties is None:
+            properties = self.properties
+
+        missing = [name for name in properties if name not in self._index]
+        if missing:
+            raise ValueError(f"Properties not found in PLY vertex data: {missing}")
+
+        dtype = np.dtype([(name, '<' + PLY_SCALAR_TYPES[self.property_types[name]]) for name in properties])
+        indices = [self._index[name] for name in properties]
+        return array_to_vertices(self.data[indices].T, dtype), self.get_header()
+
+    def columns(self):
+        """
+        Get the properties as a mapping of property name to 1D view
+
+        Returns:
+            dict: Mapping from property name to float32 array
+        """
+        return {name: self.data[i] for i, name in enumerate(self.properties)}
+
+    def copy(self):
+        """Return a deep copy of the cloud"""
+        return GaussianCloud(self.data.copy(), self.properties, self.property_types, self.filename)
+
+    def keys(self):
+        """Return the property names, in file order"""
+        return list(self.properties)
+
+    def __len__(self):
+        return self.data.shape[1]
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def __getitem__(self, name):
+        return self.data[self._index[name]]
+
+    def __setitem__(self, name, values):
+        if name in self._index:
+            self.data[self._index[name]] = values
+            return
+
+        # New properties are appended, which reallocates the data and detaches earlier views
+        row = np.broadcast_to(np.asarray(values, dtype=np.float32), (len(self),))
+        self.data = np.vstack([self.data, row[np.newaxis]])
+        self.properties.append(name)
+        self.property_types[name] = 'float'
+        self._index[name] = len(self.properties) - 1
+
+    def __repr__(self):
+        return f"GaussianCloud({len(self)} vertices, {len(self.properties)} properties)"
+
+    def get_group(self, names):
+        """
+        Get several properties as a (vertex_count, len(names)) array
+
+        Args:
+            names (list): Property names
+
+        Returns:
+            numpy.ndarray: A writable view if the properties are stored consecutively, otherwise a copy
+        """
+        indices = [self._index[name] for name in names]
+        if not indices:
+            return np.zeros((len(self), 0), dtype=np.float32)
+
+        start = indices[0]
+        if indices == list(range(start, start + len(indices))):
+            return self.data[start:start + len(indices)].T
+        return self.data[indices].T
+
+    def get_prefixed_properties(self, prefix):
+        """
+        Get the names of numbered properties such as f_rest_0, f_rest_1, ... in numeric order
+
+        Args:
+            prefix (str): Property name prefix including the trailing underscore
+
+        Returns:
+            list: Matching property names
+        """
+        names = [name for name in self.properties
+                 if name.startswith(prefix) and name[len(prefix):].isdigit()]
+        return sorted(names, key=lambda name: int(name[len(prefix):]))
+
+    @property
+    def positions(self):
+        """(vertex_count, 3) array of x, y, z"""
+        return self.get_group(['x', 'y', 'z'])
+
+    @property
+    def f_dc(self):
+        """(vertex_count, 3) array of the spherical harmonics DC terms"""
+        return self.get_group(self.get_prefixed_properties('f_dc_'))
+
+    @property
+    def f_rest(self):
+        """(vertex_count, k) array of the higher-order spherical harmonics coefficients"""
+        return self.get_group(self.get_prefixed_properties('f_rest_'))
+
+    @property
+    def opacity(self):
+        """(vertex_count,) array of opacity logits"""
+        return self['opacity']
+
+    @property
+    def scale(self):
+        """(vertex_count, 3) array of log scales"""
+        return self.get_group(self.get_prefixed_properties('scale_'))
+
+    @property
+    def rot(self):
+        """(vertex_count, 4) array of rotation quaternions (w, x, y, z)"""
+        return self.get_group(self.get_prefixed_properties('rot_'))
+
+
+def get_source_filename(source):
+    """
+    Get the filename used to derive output names for a 3DGS file path or GaussianCloud
+
+    Args:
+        source (str or GaussianCloud): 3DGS file path or in-memory cloud
+
+    Returns:
+        str: The path itself, the file the cloud was loaded from, or a default name
+    """
+    if isinstance(source, GaussianCloud):
+        return source.filename or DEFAULT_CLOUD_FILENAME
+    return source
@@ -0,0 +1,237 @@
+"""
+3D Gaussian Splatting File Inspection Module
+
+This module reports the structure of a 3DGS file (element counts, property schema,
+SH degree, body size consistency) from its header, plus approximate statistics from a
+strided sample of the memory-mapped vertex block. It never decodes the whole file, so
+it finishes quickly even for multi-GB scenes.
+"""
+
+import os
+import json
+import numpy as np
+
+from .color_utils import get_sh_layout_degree
+from .file_utils import (parse_ply_header, get_element_dtype, get_vertex_dtype, get_vertex_offset,
+                         is_compressed_ply_header, PLY_BYTE_ORDERS)
+
+# Default number of vertices sampled for the statistics
+DEFAULT_SAMPLE_SIZE = 16384
+
+# Number of evenly spaced runs of consecutive vertices the sample is taken from.
+# Reading runs instead of single vertices keeps the number of pages touched small.
+SAMPLE_BLOCKS = 64
+
+
+def get_3dgs_info(ply_filename, sample_size=DEFAULT_SAMPLE_SIZE):
+    """
+    Inspect a 3D Gaussian Splatting file (.ply) without converting it
+
+    Args:
+        ply_filename (str): Path to the PLY file
+        sample_size (int, optional): Maximum number of vertices sampled for statistics.
+                                     Set to 0 to only read the header.
+
+    Returns:
+        dict: File information with keys 'file', 'file_size', 'format', 'elements',
+              'vertex_count', 'properties', 'compressed', 'sh_degree', 'bytes_per_vertex',
+              'expected_body_size', 'body_size', 'complete' and 'statistics'
+              (None if not sampled)
+    """
+    with open(ply_filename, "rb") as f:
+        header = parse_ply_header(f)
+    file_size = os.path.getsize(ply_filename)
+
+    properties = header['properties']
+    compressed = is_compressed_ply_header(header)
+    if compressed:
+        # Compressed files keep the DC color in packed_color and f_rest_* in the sh element
+        properties = ['f_dc_0'] + [prop[0] for element in header['elements'] if element['name'] == 'sh'
+                                   for prop in element['properties']]
+    info = {
+        'file': ply_filename,
+        'file_size': file_size,
+        'format': header['format'],
+        'elements': {element['name']: element['count'] for element in header['elements']},
+        'vertex_count': header['vertex_count'],
+        'properties': [{'name': name, 'type': header['property_types'][name]} for name in header['properties']],
+        'compressed': compressed,
+        'sh_degree': get_sh_layout_degree(properties),
+        'bytes_per_vertex': None,
+        'expected_body_size': None,
+        'body_size': file_size - header['header_size'],
+        'complete': None,
+        'statistics': None,
+    }
+
+    if header['format'] not in PLY_BYTE_ORDERS:
+        # ASCII records have no fixed size, so neither the body size nor a sample can be derived
+        return info
+
+    byte_order = PLY_BYTE_ORDERS[header['format']]
+    vertex_dtype = get_vertex_dtype(header)
+    info['bytes_per_vertex'] = vertex_dtype.itemsize
+
+    try:
+        info['expected_body_size'] = sum(element['count'] * get_element_dtype(element, byte_order).itemsize
+                                         for element in header['elements'])
+        info['complete'] = info['body_size'] >= info['expected_body_size']
+    except ValueError:
+        # Elements with list properties (e.g. faces) have no fixed size
+        pass
+
+    if sample_size > 0:
+        offset = get_vertex_offset(header)
+        available = min(header['vertex_count'], max(0, file_size - offset) // vertex_dtype.itemsize)
+        if info['complete'] is None and available < header['vertex_count']:
+            info['complete'] = False
+        if available > 0:
+            vertices = np.memmap(ply_filename, dtype=vertex_dtype, mode='r', offset=offset, shape=(available,))
+            info['statistics'] = get_sample_statistics(sample_vertices(vertices, sample_size))
+
+    return info
+
+
+def sample_vertices(vertices, sample_size, blocks=SAMPLE_BLOCKS):
+    """
+    Take a strided sample of runs of consecutive vertices
+
+    Args:
+        vertices (numpy.ndarray): Structured vertex array, typically memory-mapped
+        sample_size (int): Maximum number of vertices in the sample
+        blocks (int, optional): Number of evenly spaced runs the sample is taken from
+
+    Returns:
+        numpy.ndarray: Structured array with the sampled vertices
+    """
+    if len(vertices) <= sample_size:
+        return np.array(vertices)
+
+    run_length = max(1, sample_size // blocks)
+    starts = np.linspace(0, len(vertices) - run_length, min(blocks, sample_size), dtype=np.int64)
+    return np.concatenate([vertices[start:start + run_length] for start in starts])
+
+
+def get_sample_statistics(sample):
+    """
+    Compute approximate statistics from sampled vertices
+
+    Args:
+        sample (numpy.ndarray): Structured vertex array
+
+    Returns:
+        dict: 'sample_size', plus 'bbox_min'/'bbox_max' for positions, 'opacity' for the
+              activated opacity and 'scale' for the activated scales when present
+    """
+    names = sample.dtype.names
+    stats = {'sample_size': len(sample)}
+
+    if all(name in names for name in ('x', 'y', 'z')):
+        positions = np.column_stack([sample[name].astype(np.float64) for name in ('x', 'y', 'z')])
+        stats['bbox_min'] = positions.min(axis=0).tolist()
+        stats['bbox_max'] = positions.max(axis=0).tolist()
+
+    if 'opacity' in names:
+        # Opacities are stored as logits
+        opacity = 1.0 / (1.0 + np.exp(-sample['opacity'].astype(np.float64)))
+        stats['opacity'] = summarize_values(opacity)
+
+    scale_names = [name for name in names if name.startswith('scale_')]
+    if scale_names:
+        # Scales are stored as logarithms
+        scales = np.exp(np.column_stack([sample[name].astype(np.float64) for name in scale_names]))
+        stats['scale'] = summarize_values(scales.max(axis=1))
+
+    return stats
+
+
+def summarize_values(values):
+    """
+    Summarize an array of values
+
+    Args:
+        values (numpy.ndarray): Values to summarize
+
+    Returns:
+        dict: 'min', 'max', 'mean' and 'median' of the finite values
+    """
+    values = values[np.isfinite(values)]
+    if len(values) == 0:
+        return {'min': None, 'max': None, 'mean': None, 'median': None}
+    return {
+        'min': float(values.min()),
+        'max': float(values.max()),
+        'mean': float(values.mean()),
+        'median': float(np.median(values)),
+    }
+
+
+def print_3dgs_info(info):
+    """
+    Print file information in a readable format
+
+    Args:
+        info (dict): File information from get_3dgs_info
+    """
+    print(f"==== {info['file']} ====")
+    print(f"Format: {info['format']}{' (compressed)' if info['compressed'] else ''}")
+    print(f"File size: {info['file_size']} bytes")
+    print("Elements: " + ", ".join(f"{name} ({count})" for name, count in info['elements'].items()))
+    print(f"Vertices: {info['vertex_count']}")
+    print(f"Properties ({len(info['properties'])}): "
+          + ", ".join(f"{prop['type']} {prop['name']}" for prop in info['properties']))
+    if info['sh_degree'] is not None:
+        print(f"SH degree: {info['sh_degree']}")
+    elif any(prop['name'].startswith('f_rest_') for prop in info['properties']):
+        print("SH degree: unknown (the f_rest_* properties do not form a complete SH layout)")
+    if info['bytes_per_vertex'] is not None:
+        print(f"Bytes per vertex: {info['bytes_per_vertex']}")
+    if info['expected_body_size'] is not None:
+        print(f"Body size: {info['body_size']} bytes (expected {info['expected_body_size']})")
+    if info['complete'] is not None:
+        print(f"Complete: {'yes' if info['complete'] else 'no (truncated)'}")
+
+    stats = info['statistics']
+    if stats is None:
+        return
+
+    print(f"\nApproximate statistics from {stats['sample_size']} sampled vertices:")
+    if 'bbox_min' in stats:
+        print(f"  Bounding box min: {stats['bbox_min']}")
+        print(f"  Bounding box max: {stats['bbox_max']}")
+    for key, label in (('opacity', 'Opacity'), ('scale', 'Max scale')):
+        if key in stats:
+            summary = stats[key]
+            print(f"  {label}: min {summary['min']}, median {summary['median']}, "
+                  f"mean {summary['mean']}, max {summary['max']}")
+
+
+def main():
+    """Entry point for command-line execution"""
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description='Inspect a 3D Gaussian Splatting file without converting it')
+    parser.add_argument('input_ply', help='Input PLY file')
+    parser.add_argument('--sample-size', type=int, default=DEFAULT_SAMPLE_SIZE,
+                        help=f'Number of vertices sampled for statistics, 0 to skip (default: {DEFAULT_SAMPLE_SIZE})')
+    parser.add_argument('--json', action='store_true', help='Print the information as JSON')
+
+    args = parser.parse_args()
+
+    try:
+        info = get_3dgs_info(args.input_ply, args.sample_size)
+    except Exception as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        print(json.dumps(info, indent=2))
+    else:
+        print_3dgs_info(info)
+    return 0
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
@@ -0,0 +1,238 @@
+"""
+3D Gaussian Splatting Columnar Format Module
+
+This module converts 3DGS files to and from a binary columnar format: one .npy file
+per property plus a JSON manifest. Unlike CSV, values are stored exactly as in the
+PLY file, and individual properties can be memory-mapped and edited with NumPy or
+pandas without parsing text.
+"""
+
+import os
+import json
+import numpy as np
+
+from .file_utils import read_ply_vertices, generate_ply_header, PLY_SCALAR_TYPES
+from .gaussian_cloud import get_source_filename
+
+# Name of the manifest file inside a columns directory
+COLUMNS_MANIFEST = "manifest.json"
+COLUMNS_FORMAT = "3dgs-columns"
+COLUMNS_VERSION = 1
+
+# Mapping from NumPy type codes to PLY scalar type names
+NUMPY_TO_PLY_TYPES = {
+    'i1': 'char', 'u1': 'uchar',
+    'i2': 'short', 'u2': 'ushort',
+    'i4': 'int', 'u4': 'uint',
+    'f4': 'float', 'f8': 'double',
+}
+
+
+def convert_3dgs_to_columns(ply_filename, output_dir=None, memory_map=True):
+    """
+    Convert a 3D Gaussian Splatting file (.ply) to the columnar format
+
+    Args:
+        ply_filename (str or GaussianCloud): Path to the input PLY file, or an in-memory cloud
+        output_dir (str, optional): Directory for the column files. If not specified,
+                                    it's automatically generated from the input filename
+        memory_map (bool, optional): Memory-map the input so only one column is resident at a time.
+                                     Default is True.
+
+    Returns:
+        str: Path of the generated columns directory
+    """
+    if output_dir is None:
+        base_name = os.path.splitext(get_source_filename(ply_filename))[0]
+        output_dir = f"{base_name}_columns"
+
+    vertices, header = read_ply_vertices(ply_filename, memory_map=memory_map)
+    columns = {name: vertices[name] for name in header['properties']}
+    save_columns(output_dir, columns, header['property_types'])
+
+    print(f"Successfully converted 3D Gaussian Splatting data to columns ({len(vertices)} vertices)")
+    return output_dir
+
+
+def convert_columns_to_3dgs(columns_dir, output_ply_filename=None):
+    """
+    Convert a columns directory back to a 3D Gaussian Splatting file (.ply)
+
+    Args:
+        columns_dir (str): Path to the columns directory
+        output_ply_filename (str, optional): Path to the output PLY file. If not specified,
+                                             it's automatically generated from the directory name
+
+    Returns:
+        str: Path of the generated PLY file
+    """
+    if output_ply_filename is None:
+        output_ply_filename = f"{os.path.normpath(columns_dir)}_restored.ply"
+
+    columns, manifest = load_columns(columns_dir)
+    property_types = {prop['name']: prop['type'] for prop in manifest['properties']}
+    write_3dgs_from_columns(output_ply_filename, columns, property_types)
+
+    print(f"Successfully converted columns to 3D Gaussian Splatting format ({manifest['vertex_count']} vertices)")
+    return output_ply_filename
+
+
+def save_columns(output_dir, columns, property_types=None):
+    """
+    Save property arrays as one .npy file per property plus a JSON manifest
+
+    Args:
+        output_dir (str): Directory for the column files
+        columns (dict): Mapping from property name to 1D array, in property order
+        property_types (dict, optional): PLY type per property. Defaults to the type of each array
+
+    Returns:
+        str: Path of the columns directory
+    """
+    property_types = property_types or {}
+    os.makedirs(output_dir, exist_ok=True)
+
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError(f"All columns must have the same length, got {sorted(lengths)}")
+
+    manifest = {
+        'format': COLUMNS_FORMAT,
+        'version': COLUMNS_VERSION,
+        'vertex_count': lengths.pop() if lengths else 0,
+        'properties': [],
+    }
+
+    for name, values in columns.items():
+        ply_type = property_types.get(name) or get_ply_type(values.dtype)
+        filename = f"{name}.npy"
+        # Columns are stored contiguously in native byte order so they can be memory-mapped directly
+        np.save(os.path.join(output_dir, filename),
+                np.ascontiguousarray(values, dtype=np.dtype(PLY_SCALAR_TYPES[ply_type])))
+        manifest['properties'].append({'name': name, 'type': ply_type, 'file': filename})
+
+    with open(os.path.join(output_dir, COLUMNS_MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    return output_dir
+
+
+def load_columns(columns_dir, properties=None, mmap_mode='r'):
+    """
+    Load property arrays from a columns directory
+
+    Args:
+        columns_dir (str): Path to the columns directory
+        properties (list, optional): Property names to load. Defaults to all properties
+        mmap_mode (str, optional): Memory-map mode passed to np.load ('r', 'r+', 'c' or None
+                                   to read into memory). Default is 'r'.
+
+    Returns:
+        tuple: (columns, manifest) - Mapping from property name to array, and the manifest
+    """
+    with open(os.path.join(columns_dir, COLUMNS_MANIFEST), "r") as f:
+        manifest = json.load(f)
+
+    if manifest.get('format') != COLUMNS_FORMAT:
+        raise ValueError(f"Not a 3DGS columns directory: {columns_dir}")
+
+    available = [prop['name'] for prop in manifest['properties']]
+    if properties is None:
+        properties = available
+
+    missing = [name for name in properties if name not in available]
+    if missing:
+        raise ValueError(f"Properties not found in {columns_dir}: {missing}")
+
+    files = {prop['name']: prop['file'] for prop in manifest['properties']}
+    columns = {}
+    for name in properties:
+        columns[name] = np.load(os.path.join(columns_dir, files[name]), mmap_mode=mmap_mode)
+
+    return columns, manifest
+
+
+def write_3dgs_from_columns(output_ply_filename, columns, property_types=None, chunk_size=1048576):
+    """
+    Write property arrays to a binary little-endian 3DGS PLY file
+
+    Args:
+        output_ply_filename (str): Path to the output PLY file
+        columns (dict): Mapping from property name to 1D array, in property order
+        property_types (dict, optional): PLY type per property. Defaults to the type of each array
+        chunk_size (int, optional): Number of vertices interleaved and written at a time
+
+    Returns:
+        str: Path of the generated PLY file
+    """
+    property_types = property_types or {}
+    names = list(columns)
+    lengths = {len(columns[name]) for name in names}
+    if len(lengths) > 1:
+        raise ValueError(f"All columns must have the same length, got {sorted(lengths)}")
+    vertex_count = lengths.pop() if lengths else 0
+
+    types = [(name, property_types.get(name) or get_ply_type(columns[name].dtype)) for name in names]
+    dtype = np.dtype([(name, '<' + PLY_SCALAR_TYPES[ply_type]) for name, ply_type in types])
+    header = generate_ply_header(types, vertex_count, "binary_little_endian 1.0") + "\nend_header\n"
+
+    with open(output_ply_filename, "wb") as f:
+        f.write(header.encode("ascii"))
+
+        for start in range(0, vertex_count, chunk_size):
+            end = min(start + chunk_size, vertex_count)
+            block = np.empty(end - start, dtype=dtype)
+            for name in names:
+                block[name] = columns[name][start:end]
+            block.tofile(f)
+
+    return output_ply_filename
+
+
+def get_ply_type(dtype):
+    """
+    Get the PLY scalar type name for a NumPy dtype
+
+    Args:
+        dtype (numpy.dtype): Array data type
+
+    Returns:
+        str: PLY type name. Types without a PLY equivalent map to 'float' or 'int'
+    """
+    dtype = np.dtype(dtype)
+    code = f"{dtype.kind}{dtype.itemsize}"
+    if code in NUMPY_TO_PLY_TYPES:
+        return NUMPY_TO_PLY_TYPES[code]
+    return 'int' if dtype.kind in 'biu' else 'float'
+
+
+def main():
+    """Entry point for command-line execution"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Convert 3D Gaussian Splatting data to columnar .npy files')
+    parser.add_argument('input_ply', help='Input PLY file')
+    parser.add_argument('--output_dir', help='Output columns directory (default: input_filename_columns)')
+
+    args = parser.parse_args()
+
+    output_dir = convert_3dgs_to_columns(args.input_ply, args.output_dir)
+    print(f"Conversion complete: columns → {output_dir}")
+
+
+def main_columns_to_3dgs():
+    """Entry point for the columns-to-3dgs script"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Convert columnar .npy files to 3D Gaussian Splatting format')
+    parser.add_argument('input_dir', help='Input columns directory')
+    parser.add_argument('--output_ply', help='Output PLY filename (default: input_dir_restored.ply)')
+
+    args = parser.parse_args()
+
+    output_path = convert_columns_to_3dgs(args.input_dir, args.output_ply)
+    print(f"Restoration complete: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
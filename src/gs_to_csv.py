@@ -1,94 +1,108 @@
-import struct
 import csv
 import os
 import numpy as np
 from . import color_utils
+from .file_utils import read_ply_vertices, vertices_to_array
+from .gaussian_cloud import get_source_filename
+from .scene_cache import is_cache_enabled, read_cached_vertices
+from .utils import chunk_size_for_memory, get_csv_float_format, write_csv_block
 
 
-def convert_3dgs_to_csv(ply_filename, csv_filename=None, footer_filename=False):
+# Estimated working memory per value while a chunk is formatted (float64 copy plus Python objects)
+BYTES_PER_CSV_VALUE = 64
+
+
+def convert_3dgs_to_csv(ply_filename, csv_filename=None, footer_filename=False, memory_map=False,
+                        chunk_size=None, max_memory=None, float_format=None, precision=None, cache=None):
     """
     Convert 3D Gaussian Splatting format (.ply) data to CSV format
     
     Args:
-        ply_filename (str): Path to the input PLY file
+        ply_filename (str or GaussianCloud): Path to the input PLY file, or an in-memory cloud
         csv_filename (str, optional): Path to the output CSV file. If not specified, it's automatically generated from the input filename
         footer_filename (str/bool, optional): Path to save the footer data. Default is False (no footer file created).
                                            Set to None for backward compatibility (will not create a file).
+        memory_map (bool, optional): Memory-map the vertex block instead of reading the whole file into RAM.
+                                     Useful for scenes larger than available memory. Default is False.
+        chunk_size (int, optional): Stream the conversion, processing this many vertices at a time.
+                                    Default is None (convert all vertices at once).
+        max_memory (int, optional): Stream the conversion with a chunk size derived from this memory
+                                    budget in bytes. Ignored if chunk_size is given.
+        float_format (str, optional): printf-style format for float values, e.g. '%.9g' (exact for float32)
+                                      or '%.6g' for smaller files. Default writes the shortest exact representation.
+        precision (int, optional): Number of significant digits for float values (used if float_format is not given)
+        cache (bool, optional): Load the decoded vertices through the on-disk scene cache. Default is None
+                                (use the cache if GS_EDIT_CACHE_DIR is set). Not used when streaming.
         
     Returns:
         tuple: (csv_filename, footer_filename) - Paths of the generated files (footer_filename is only kept for backwards compatibility)
     """
     # Automatically generate output filename
     if csv_filename is None:
-        base_name = os.path.splitext(ply_filename)[0]
+        base_name = os.path.splitext(get_source_filename(ply_filename))[0]
         csv_filename = f"{base_name}.csv"
     
     # No longer automatically generate footer_filename - only use if explicitly provided
 
-    with open(ply_filename, "rb") as f:
-        content = f.read()
-
-    # Find the end of header position
-    header_end = content.find(b'end_header\n') + len(b'end_header\n')
-    header = content[:header_end].decode("ascii")
-
-    # Parse header
-    lines = header.splitlines()
-    vertex_count = 0
-    properties = []
-
-    for line in lines:
-        if line.startswith("element vertex"):
-            vertex_count = int(line.split()[-1])
-        elif line.startswith("property float"):
-            properties.append(line.split()[-1])
-
-    num_floats = len(properties)
-    expected_data_size = vertex_count * num_floats * 4  # float32 = 4 bytes
+    # Streaming always memory-maps the input so only the current chunk is resident
+    streaming = chunk_size is not None or max_memory is not None
+    if not streaming and is_cache_enabled(cache, ply_filename):
+        vertices, header = read_cached_vertices(ply_filename)
+    else:
+        vertices, header = read_ply_vertices(ply_filename, memory_map=memory_map or streaming)
+    properties = header['properties']
+    vertex_count = len(vertices)
     
-    data_start = header_end
-    data_end = data_start + expected_data_size
-
-    # Get binary data section (footer section is not needed)
-    data_section = content[data_start:data_end]
-
-    # Convert binary data to float
-    data = []
-    for i in range(vertex_count):
-        start = i * num_floats * 4
-        end = start + num_floats * 4
-        floats = struct.unpack("<" + "f" * num_floats, data_section[start:end])
-        data.append(list(floats))  # Convert to list for easier modification
+    if chunk_size is None:
+        if max_memory is not None:
+            chunk_size = chunk_size_for_memory(max_memory, len(properties) * BYTES_PER_CSV_VALUE)
+        else:
+            chunk_size = vertex_count
+    chunk_size = max(1, chunk_size)
 
     # Detect spherical harmonic color coefficients using color_utils
     r_idx, g_idx, b_idx, is_sh_color = color_utils.detect_color_properties(properties)
+    color_indices = []
     
     # If we have color coefficients, normalize them to a more user-friendly range for editing
-    if r_idx is not None and g_idx is not None and b_idx is not None:
-        color_props = [properties[i] for i in [r_idx, g_idx, b_idx]]
+    if r_idx is not None and g_idx is not None and b_idx is not None and vertex_count > 0:
+        color_indices = [r_idx, g_idx, b_idx]
+        color_props = [properties[i] for i in color_indices]
         print(f"Detected color properties: {color_props}, SH color: {is_sh_color}")
         
-        # Extract color values for analysis and normalization
-        color_values = np.array([[data[row_idx][col_idx] for col_idx in [r_idx, g_idx, b_idx]] 
-                                for row_idx in range(len(data))])
-        
-        # Use color_utils to normalize colors for easier editing
-        normalized_colors, min_val, max_val, is_signed = color_utils.normalize_color_for_editing(color_values, is_sh_color)
+        # Normalization needs the global range, so scan only the color columns first
+        min_val, max_val = color_utils.get_color_column_range(vertices, color_props, chunk_size)
+        is_signed = min_val < 0
+        if is_sh_color:
+            color_utils.store_sh_color_range(min_val, max_val)
         print(f"Original color range: {min_val} to {max_val}, signed: {is_signed}")
-        
-        # Replace the color values with normalized versions
-        for row_idx in range(len(data)):
-            data[row_idx][r_idx] = normalized_colors[row_idx][0]
-            data[row_idx][g_idx] = normalized_colors[row_idx][1]
-            data[row_idx][b_idx] = normalized_colors[row_idx][2]
-        
-        print("Color values normalized to 0-1 range for easier editing")
 
-    # Save to CSV
+    # Integer properties keep their type; float and normalized color columns use the float format
+    float_format = get_csv_float_format(float_format, precision)
+    formats = []
+    for i, name in enumerate(properties):
+        if vertices.dtype[name].kind in 'iu' and i not in color_indices:
+            formats.append("%d")
+        else:
+            formats.append(float_format)
+
+    # Save to CSV one chunk at a time, formatting each chunk as a block
     with open(csv_filename, "w", newline="") as csvfile:
         writer = csv.writer(csvfile)
         writer.writerow(properties)
-        writer.writerows(data)
+        
+        for start in range(0, vertex_count, chunk_size):
+            data = vertices_to_array(vertices[start:start + chunk_size], dtype=np.float64)
+            
+            # Replace the color values with normalized versions
+            if color_indices:
+                data[:, color_indices] = color_utils.normalize_color_with_range(
+                    data[:, color_indices], min_val, max_val)
+            
+            write_csv_block(csvfile, data, formats)
+    
+    if color_indices:
+        print("Color values normalized to 0-1 range for easier editing")
     
     print(f"Successfully converted 3D Gaussian Splatting data to CSV format ({vertex_count} vertices)")
     
@@ -109,13 +123,31 @@ def main():
     parser.add_argument('input_ply', help='Input PLY file')
     parser.add_argument('--output_csv', help='Output CSV filename (default: input_filename.csv)')
     parser.add_argument('--footer', help='Footer filename (deprecated, not used)', default=False)
+    parser.add_argument('--memory-map', action='store_true',
+                        help='Memory-map the input file instead of loading it into RAM')
+    parser.add_argument('--chunk-size', type=int, default=None,
+                        help='Stream the conversion, processing this many vertices at a time')
+    parser.add_argument('--max-memory', type=float, default=None,
+                        help='Stream the conversion within this memory budget in megabytes')
+    parser.add_argument('--precision', type=int, default=None,
+                        help='Significant digits for float values (default: shortest exact representation)')
+    parser.add_argument('--float-format', default=None,
+                        help="printf-style format for float values, e.g. '%%.9g' (overrides --precision)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Do not use the scene cache even if GS_EDIT_CACHE_DIR is set')
     
     args = parser.parse_args()
     
     csv_path, _ = convert_3dgs_to_csv(
         args.input_ply, 
         args.output_csv,
-        args.footer
+        args.footer,
+        memory_map=args.memory_map,
+        chunk_size=args.chunk_size,
+        max_memory=int(args.max_memory * 1024 * 1024) if args.max_memory else None,
+        float_format=args.float_format,
+        precision=args.precision,
+        cache=False if args.no_cache else None
     )
     
     print(f"Conversion complete: CSV → {csv_path}")
@@ -17,6 +17,7 @@ import sys
 from pathlib import Path
 from .gs_to_pointcloud import convert_3dgs_to_pointcloud
 from .pointcloud_to_mesh import convert_pointcloud_to_mesh
+from .gaussian_cloud import get_source_filename
 
 def convert_3dgs_to_mesh(
     input_file,
@@ -43,8 +44,8 @@ def convert_3dgs_to_mesh(
     
     Parameters:
     -----------
-    input_file : str
-        Path to the input 3DGS PLY file
+    input_file : str or GaussianCloud
+        Path to the input 3DGS PLY file, or an in-memory cloud
     output_file : str, optional
         Path to the output mesh file. If None, it will be created based on input_file
     output_format : str, optional
@@ -83,7 +84,7 @@ def convert_3dgs_to_mesh(
         Path to the output mesh file
     """
     # Generate a temporary filename for the intermediate point cloud
-    input_path = Path(input_file)
+    input_path = Path(get_source_filename(input_file))
     temp_dir = input_path.parent
     if save_to_converted:
         # Create 'converted' subfolder if it doesn't exist
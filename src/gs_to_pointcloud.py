@@ -1,138 +1,93 @@
-import struct
 import os
+import warnings
 import numpy as np
+from .file_utils import read_ply_header_info, read_ply_properties, vertices_to_array
+from .gaussian_cloud import get_source_filename
 from .color_utils import detect_color_properties, get_color_value_range, store_sh_color_range
+from .utils import detect_coordinate_properties
 
 
-def convert_3dgs_to_pointcloud(ply_filename, output_ply_filename=None):
+def convert_3dgs_to_pointcloud(ply_filename, output_ply_filename=None, memory_map=None):
     """
     Convert 3D Gaussian Splatting format (.ply) to a standard point cloud PLY file with only
     position and color information.
     
     Args:
-        ply_filename (str): Path to the input 3D Gaussian Splatting PLY file
+        ply_filename (str or GaussianCloud): Path to the input 3D Gaussian Splatting PLY file, or an in-memory cloud
         output_ply_filename (str, optional): Path to the output point cloud PLY file. 
                                              If not specified, it's automatically generated from the input filename
+        memory_map (bool, optional): Deprecated and ignored. Binary vertex blocks are always
+                                     memory-mapped so that only the position and color columns are read.
         
     Returns:
         str: Path of the generated PLY file
     """
+    if memory_map is not None:
+        warnings.warn("memory_map is deprecated and has no effect: binary vertex blocks are always memory-mapped",
+                      DeprecationWarning, stacklevel=2)
+    
     # Automatically generate output filename
     if output_ply_filename is None:
-        base_name = os.path.splitext(ply_filename)[0]
+        base_name = os.path.splitext(get_source_filename(ply_filename))[0]
         output_ply_filename = f"{base_name}_pointcloud.ply"
 
-    with open(ply_filename, "rb") as f:
-        content = f.read()
-
-    # Find the end of header position
-    header_end = content.find(b'end_header\n') + len(b'end_header\n')
-    header = content[:header_end].decode("ascii")
-
-    # Parse header
-    lines = header.splitlines()
-    vertex_count = 0
-    properties = []
-    property_types = {}
-    original_color_type = "uchar"  # Default color type
-
-    for line in lines:
-        if line.startswith("element vertex"):
-            vertex_count = int(line.split()[-1])
-        elif line.startswith("property"):
-            parts = line.split()
-            prop_type = parts[1]
-            prop_name = parts[2]
-            properties.append(prop_name)
-            property_types[prop_name] = prop_type
-            
-            # Detect original color type
-            if prop_name in ["red", "green", "blue", "r", "g", "b"]:
-                original_color_type = prop_type
-
-    num_floats = len(properties)
-    expected_data_size = vertex_count * num_floats * 4  # assuming float32 = 4 bytes
-    
-    data_start = header_end
-    data_end = data_start + expected_data_size
-
-    # Get the binary data section
-    data_section = content[data_start:data_end]
-
-    # Convert binary data to float values
-    points = []
-    colors = []
-    sh_colors = []
+    # Only positions and colors are needed, so read just those columns of the vertex block
+    header = read_ply_header_info(ply_filename)
+    property_types = header['property_types']
+    position_properties = [header['properties'][i] for i in detect_coordinate_properties(header['properties'])]
+    r_idx, g_idx, b_idx, is_sh_color = detect_color_properties(header['properties'])
+    color_properties = []
+    if r_idx is not None and g_idx is not None and b_idx is not None:
+        color_properties = [header['properties'][i] for i in (r_idx, g_idx, b_idx)]
     
-    # Find the indices of position and color properties
-    x_idx = properties.index('x')
-    y_idx = properties.index('y')
-    z_idx = properties.index('z')
-    
-    # Find color information using the utility function
-    r_idx, g_idx, b_idx, is_sh_color = detect_color_properties(properties)
+    vertices, header = read_ply_properties(ply_filename, position_properties + color_properties)
+    vertex_count = len(vertices)
+    original_color_type = "uchar"  # Default color type
 
-    # Extract position and color data
-    for i in range(vertex_count):
-        start = i * num_floats * 4
-        end = start + num_floats * 4
-        values = struct.unpack("<" + "f" * num_floats, data_section[start:end])
-        
-        point = [values[x_idx], values[y_idx], values[z_idx]]
-        points.append(point)
-        
-        # Add color if available, otherwise use default white
-        if r_idx is not None and g_idx is not None and b_idx is not None:
-            # Collect SH colors for range detection
-            if is_sh_color:
-                sh_colors.append([values[r_idx], values[g_idx], values[b_idx]])
-            
-            # Process color values based on type
-            if is_sh_color:
-                # Store raw SH colors for now, we'll process them after determining the range
-                colors.append([values[r_idx], values[g_idx], values[b_idx]])
-            else:
-                # Normal color processing
-                if property_types.get(properties[r_idx], "") == "float":
-                    # If values are in 0-1 range, multiply by 255 to scale to 0-255
-                    if 0 <= values[r_idx] <= 1.0 and 0 <= values[g_idx] <= 1.0 and 0 <= values[b_idx] <= 1.0:
-                        r = int(values[r_idx] * 255)
-                        g = int(values[g_idx] * 255)
-                        b = int(values[b_idx] * 255)
-                    else:
-                        # If values are in 0-255 range, use them directly
-                        r = max(0, min(255, int(values[r_idx])))
-                        g = max(0, min(255, int(values[g_idx])))
-                        b = max(0, min(255, int(values[b_idx])))
-                else:
-                    # For uchar type, use values directly
-                    r = max(0, min(255, int(values[r_idx])))
-                    g = max(0, min(255, int(values[g_idx])))
-                    b = max(0, min(255, int(values[b_idx])))
-                colors.append([r, g, b])
+    for prop_name, prop_type in property_types.items():
+        # Detect original color type
+        if prop_name in ["red", "green", "blue", "r", "g", "b"]:
+            original_color_type = prop_type
+
+    points = vertices_to_array(vertices, position_properties, dtype=np.float64)
+
+    # Colors are computed on the whole (vertex_count, 3) matrix
+    if color_properties:
+        color_values = vertices_to_array(vertices, color_properties, dtype=np.float64)
+        if is_sh_color and vertex_count > 0:
+            # Normalize SH colors based on their actual range
+            min_val, max_val, is_signed = get_color_value_range(color_values)
+            store_sh_color_range(min_val, max_val)
+            normalized = (color_values - min_val) / (max_val - min_val)
+            colors = np.trunc(np.clip(normalized, 0, 1) * 255)
+        elif property_types.get(color_properties[0], "") == "float":
+            # Rows with all values in the 0-1 range are scaled to 0-255, others are used directly
+            in_unit_range = ((color_values >= 0) & (color_values <= 1.0)).all(axis=1, keepdims=True)
+            colors = np.where(in_unit_range, np.trunc(color_values * 255),
+                              np.clip(np.trunc(color_values), 0, 255))
         else:
-            colors.append([255, 255, 255])  # Default white color
-
-    # For SH colors, properly normalize based on actual range
-    if is_sh_color and sh_colors:
-        min_val, max_val, is_signed = get_color_value_range(sh_colors)
-        store_sh_color_range(min_val, max_val)
-        
-        # Normalize SH colors to 0-1 range
-        for i in range(len(colors)):
-            # Properly normalize from the actual range to 0-1
-            r_normalized = (colors[i][0] - min_val) / (max_val - min_val)
-            g_normalized = (colors[i][1] - min_val) / (max_val - min_val)
-            b_normalized = (colors[i][2] - min_val) / (max_val - min_val)
-            
-            # Convert to 0-255 range for PLY
-            r = int(max(0, min(1, r_normalized)) * 255)
-            g = int(max(0, min(1, g_normalized)) * 255)
-            b = int(max(0, min(1, b_normalized)) * 255)
-            colors[i] = [r, g, b]
-
-    points = np.array(points)
-    colors = np.array(colors)
+            # For uchar type, use values directly
+            colors = np.clip(np.trunc(color_values), 0, 255)
+    else:
+        colors = np.full((vertex_count, 3), 255)  # Default white color
+    colors = colors.astype(np.uint8)
+
+    # Output color type matching the original file's property type
+    color_type = original_color_type if original_color_type in ["uchar", "float"] else "uchar"
+    if color_type == "float":
+        # Save as float color information (0-1 scale)
+        color_dtype = '<f4'
+        colors = colors / 255.0
+    else:
+        # Save as uchar color information (0-255 scale)
+        color_dtype = 'u1'
+
+    output = np.empty(vertex_count, dtype=[('x', '<f4'), ('y', '<f4'), ('z', '<f4'),
+                                           ('red', color_dtype), ('green', color_dtype), ('blue', color_dtype)])
+    for i, axis in enumerate(('x', 'y', 'z')):
+        output[axis] = points[:, i]
+    for i, channel in enumerate(('red', 'green', 'blue')):
+        output[channel] = colors[:, i]
 
     # Create standard PLY file with position and color data
     with open(output_ply_filename, 'wb') as f:
@@ -143,25 +98,13 @@ def convert_3dgs_to_pointcloud(ply_filename, output_ply_filename=None):
         f.write(b"property float x\n")
         f.write(b"property float y\n")
         f.write(b"property float z\n")
-        # Output color type matching the original file's property type
-        color_type = original_color_type if original_color_type in ["uchar", "float"] else "uchar"
         f.write(f"property {color_type} red\n".encode())
         f.write(f"property {color_type} green\n".encode())
         f.write(f"property {color_type} blue\n".encode())
         f.write(b"end_header\n")
-        
-        # Write data
-        for i in range(vertex_count):
-            f.write(struct.pack('<3f', *points[i]))
-            if color_type == "float":
-                # Save as float color information (0-1 scale)
-                r_float = colors[i][0] / 255.0
-                g_float = colors[i][1] / 255.0
-                b_float = colors[i][2] / 255.0
-                f.write(struct.pack('3f', r_float, g_float, b_float))
-            else:
-                # Save as uchar color information (0-255 scale)
-                f.write(struct.pack('3B', *colors[i]))
+
+        # Write all points at once
+        output.tofile(f)
     
     return output_ply_filename
 
@@ -173,8 +116,12 @@ def main():
     parser = argparse.ArgumentParser(description='Convert 3D Gaussian Splatting data to standard point cloud PLY')
     parser.add_argument('input_ply', help='Input 3D Gaussian Splatting PLY file')
     parser.add_argument('--output_ply', help='Output point cloud PLY filename (default: input_filename_pointcloud.ply)')
+    # Deprecated: the input is always memory-mapped. Still accepted so existing scripts keep working
+    parser.add_argument('--memory-map', action='store_true', help=argparse.SUPPRESS)
     
     args = parser.parse_args()
+    if args.memory_map:
+        print("Note: --memory-map is deprecated and has no effect (the input is always memory-mapped)")
     
     output_path = convert_3dgs_to_pointcloud(
         args.input_ply,
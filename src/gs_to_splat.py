@@ -0,0 +1,231 @@
+"""
+3D Gaussian Splatting .splat Format Module
+
+This module converts 3DGS files to and from the 32-byte .splat layout read by many
+lightweight web viewers. Each gaussian is stored as:
+
+- position: 3 x float32
+- scale: 3 x float32 (activated, i.e. exp of the stored log scales)
+- color: 4 x uint8 (RGB from the SH DC terms, alpha from the activated opacity)
+- rotation: 4 x uint8 (normalized quaternion w, x, y, z mapped from [-1, 1] to [0, 255])
+
+Higher-order SH coefficients and normals are not stored, so the conversion is lossy.
+"""
+
+import os
+import numpy as np
+
+from .file_utils import read_ply_header_info, read_ply_properties
+from .gaussian_cloud import get_source_filename
+from .gs_to_columns import write_3dgs_from_columns
+from .color_utils import detect_color_properties
+from .compressed_ply import SH_C0
+from .utils import detect_coordinate_properties, detect_quaternion_properties, detect_scale_properties
+from .transform_utils import normalize_quaternions
+
+# Record layout of one gaussian in a .splat file (32 bytes)
+SPLAT_DTYPE = np.dtype([
+    ('x', '<f4'), ('y', '<f4'), ('z', '<f4'),
+    ('scale_0', '<f4'), ('scale_1', '<f4'), ('scale_2', '<f4'),
+    ('red', 'u1'), ('green', 'u1'), ('blue', 'u1'), ('alpha', 'u1'),
+    ('rot_0', 'u1'), ('rot_1', 'u1'), ('rot_2', 'u1'), ('rot_3', 'u1'),
+])
+
+# Alpha values are clamped to this range before conversion back to opacity logits
+ALPHA_EPSILON = 1e-7
+
+
+def convert_3dgs_to_splat(ply_filename, output_splat_filename=None, sort=True):
+    """
+    Convert a 3D Gaussian Splatting file (.ply) to the .splat format
+
+    Args:
+        ply_filename (str or GaussianCloud): Path to the input PLY file, or an in-memory cloud
+        output_splat_filename (str, optional): Path to the output .splat file. If not specified,
+                                               it's automatically generated from the input filename
+        sort (bool, optional): Order gaussians by importance (volume times opacity, largest first)
+                               so progressive viewers show the most visible splats first. Default is True.
+
+    Returns:
+        str: Path of the generated .splat file
+    """
+    if output_splat_filename is None:
+        base_name = os.path.splitext(get_source_filename(ply_filename))[0]
+        output_splat_filename = f"{base_name}.splat"
+
+    header = read_ply_header_info(ply_filename)
+    properties = header['properties']
+    x_idx, y_idx, z_idx = detect_coordinate_properties(properties)
+    r_idx, g_idx, b_idx, is_sh_color = detect_color_properties(properties)
+    scale_indices = detect_scale_properties(properties)
+    quat_indices = detect_quaternion_properties(properties)
+    if None in (x_idx, y_idx, z_idx, r_idx, g_idx, b_idx) or scale_indices is None or quat_indices is None:
+        raise ValueError(".splat output needs position, color, scale and rotation properties")
+
+    names = [properties[i] for i in (x_idx, y_idx, z_idx, r_idx, g_idx, b_idx) + scale_indices + quat_indices]
+    if 'opacity' in properties:
+        names.append('opacity')
+    vertices, _ = read_ply_properties(ply_filename, names)
+    splats = encode_splat(vertices, names, is_sh_color, sort=sort)
+    splats.tofile(output_splat_filename)
+
+    print(f"Successfully converted 3D Gaussian Splatting data to .splat ({len(splats)} gaussians)")
+    return output_splat_filename
+
+
+def encode_splat(vertices, names, is_sh_color=True, sort=True):
+    """
+    Encode vertex properties into .splat records
+
+    Args:
+        vertices (numpy.ndarray): Structured vertex array
+        names (list): Property names in the order x, y, z, red, green, blue, three scales,
+                      four rotation components and optionally opacity
+        is_sh_color (bool, optional): Whether the colors are SH DC terms (f_dc_*)
+        sort (bool, optional): Order the records by importance. Default is True.
+
+    Returns:
+        numpy.ndarray: Structured array with SPLAT_DTYPE
+    """
+    def stack(selected):
+        return np.column_stack([np.asarray(vertices[name], dtype=np.float64) for name in selected])
+
+    positions = stack(names[0:3])
+    colors = stack(names[3:6])
+    log_scales = stack(names[6:9])
+    rotations = stack(names[9:13])
+    if len(names) > 13:
+        alpha = 1.0 / (1.0 + np.exp(-np.asarray(vertices[names[13]], dtype=np.float64)))
+    else:
+        alpha = np.ones(len(vertices))
+
+    if is_sh_color:
+        colors = (0.5 + SH_C0 * colors) * 255
+    elif len(colors) > 0 and vertices.dtype[names[3]].kind == 'f' and colors.max() <= 1.0:
+        # Float colors in the 0-1 range
+        colors = colors * 255
+
+    order = np.arange(len(vertices))
+    if sort:
+        # Largest, most opaque gaussians first
+        importance = np.exp(log_scales.sum(axis=1)) * alpha
+        order = np.argsort(-importance, kind='stable')
+
+    rotations = normalize_quaternions(rotations)
+
+    splats = np.empty(len(vertices), dtype=SPLAT_DTYPE)
+    for i, axis in enumerate('xyz'):
+        splats[axis] = positions[order, i]
+    for i in range(3):
+        splats[f'scale_{i}'] = np.exp(log_scales[order, i])
+    for i, channel in enumerate(('red', 'green', 'blue')):
+        splats[channel] = np.clip(np.rint(colors[order, i]), 0, 255)
+    splats['alpha'] = np.clip(np.rint(alpha[order] * 255), 0, 255)
+    for i in range(4):
+        splats[f'rot_{i}'] = np.clip(np.rint(rotations[order, i] * 128 + 128), 0, 255)
+
+    return splats
+
+
+def read_splat(splat_filename):
+    """
+    Read the records of a .splat file
+
+    Args:
+        splat_filename (str): Path to the .splat file
+
+    Returns:
+        numpy.ndarray: Structured array with SPLAT_DTYPE
+    """
+    file_size = os.path.getsize(splat_filename)
+    if file_size % SPLAT_DTYPE.itemsize != 0:
+        raise ValueError(f".splat file size {file_size} is not a multiple of {SPLAT_DTYPE.itemsize} bytes")
+    return np.fromfile(splat_filename, dtype=SPLAT_DTYPE)
+
+
+def decode_splat(splats):
+    """
+    Decode .splat records into standard 3DGS properties
+
+    Args:
+        splats (numpy.ndarray): Structured array with SPLAT_DTYPE
+
+    Returns:
+        dict: Mapping from property name to float32 array, in standard 3DGS property order
+              (normals and f_rest_* are not stored in .splat files; normals are set to zero)
+    """
+    columns = {}
+    for axis in 'xyz':
+        columns[axis] = splats[axis]
+    for axis in ('nx', 'ny', 'nz'):
+        columns[axis] = np.zeros(len(splats), dtype=np.float32)
+    for i, channel in enumerate(('red', 'green', 'blue')):
+        columns[f'f_dc_{i}'] = (splats[channel] / 255.0 - 0.5) / SH_C0
+    alpha = np.clip(splats['alpha'] / 255.0, ALPHA_EPSILON, 1 - ALPHA_EPSILON)
+    columns['opacity'] = -np.log(1.0 / alpha - 1.0)
+    for i in range(3):
+        # Zero scales would give -inf log scales
+        scales = np.maximum(splats[f'scale_{i}'].astype(np.float64), np.finfo(np.float32).tiny)
+        columns[f'scale_{i}'] = np.log(scales)
+
+    rotations = normalize_quaternions(np.column_stack([(splats[f'rot_{i}'] - 128.0) / 128.0 for i in range(4)]))
+    for i in range(4):
+        columns[f'rot_{i}'] = rotations[:, i]
+
+    return {name: np.asarray(values, dtype=np.float32) for name, values in columns.items()}
+
+
+def convert_splat_to_3dgs(splat_filename, output_ply_filename=None):
+    """
+    Convert a .splat file to a 3D Gaussian Splatting file (.ply)
+
+    Args:
+        splat_filename (str): Path to the input .splat file
+        output_ply_filename (str, optional): Path to the output PLY file. If not specified,
+                                             it's automatically generated from the input filename
+
+    Returns:
+        str: Path of the generated PLY file
+    """
+    if output_ply_filename is None:
+        base_name = os.path.splitext(splat_filename)[0]
+        output_ply_filename = f"{base_name}_restored.ply"
+
+    splats = read_splat(splat_filename)
+    write_3dgs_from_columns(output_ply_filename, decode_splat(splats))
+
+    print(f"Successfully converted .splat data to 3D Gaussian Splatting ({len(splats)} gaussians)")
+    return output_ply_filename
+
+
+def main():
+    """Entry point for command-line execution"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Convert 3D Gaussian Splatting data to the .splat format')
+    parser.add_argument('input_ply', help='Input PLY file')
+    parser.add_argument('--output_splat', help='Output .splat filename (default: input_filename.splat)')
+    parser.add_argument('--no-sort', action='store_true', help='Keep the original gaussian order')
+
+    args = parser.parse_args()
+
+    output_path = convert_3dgs_to_splat(args.input_ply, args.output_splat, sort=not args.no_sort)
+    print(f"Conversion complete: {output_path}")
+
+
+def main_splat_to_3dgs():
+    """Entry point for the splat-to-3dgs script"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Convert a .splat file to 3D Gaussian Splatting format')
+    parser.add_argument('input_splat', help='Input .splat file')
+    parser.add_argument('--output_ply', help='Output PLY filename (default: input_filename_restored.ply)')
+
+    args = parser.parse_args()
+
+    output_path = convert_splat_to_3dgs(args.input_splat, args.output_ply)
+    print(f"Conversion complete: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
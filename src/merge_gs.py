@@ -2,98 +2,401 @@
 """
 3D Gaussian Splatting Merge Module
 
-This module provides functions to merge two 3DGS files by converting them to CSV and combining the data.
+This module provides functions to merge any number of 3DGS files. A header-only first pass
+sums the vertex counts and fixes the output schema, then the vertex block of each input is
+memory-mapped and streamed into the output in chunks, so memory use does not grow with the
+number or size of the inputs.
 """
 
 import os
 import sys
-import csv
 import numpy as np
-import pandas as pd
 import argparse
 
-from .gs_to_csv import convert_3dgs_to_csv
-from .csv_to_gs import convert_csv_to_3dgs
+from .file_utils import (read_ply_header_info, read_ply_vertices, generate_ply_header,
+                         array_to_vertices, PLY_SCALAR_TYPES)
+from .gaussian_cloud import GaussianCloud, get_source_filename
+from .scene_cache import is_cache_enabled, load_cached_columns, get_cached_header
+from .compressed_ply import write_compressed_ply
+from .color_utils import get_sh_rest_names, get_sh_layout_degree
+from .transform_utils import create_rotation_matrix
+from .transform_gs import rotate_orientations
 
-def merge_3dgs_files(file1, file2, output_file=None, transform=None):
+# Number of vertices of one input converted and written at a time
+DEFAULT_MERGE_CHUNK_SIZE = 1048576
+
+# Ways of choosing the output properties from the properties of the inputs
+MERGE_SCHEMAS = ("first", "union", "intersection")
+
+# Ways of handling inputs whose SH degree differs from the output's
+SH_PADDING_POLICIES = ("zero", "drop", "dc")
+
+def merge_3dgs_files(file1, file2, output_file=None, transform=None, cache=None, compressed=False,
+                     chunk_size=DEFAULT_MERGE_CHUNK_SIZE, schema="first", sh_padding="zero"):
     """
     Merge two 3D Gaussian Splatting files by combining their data
-
+    
+    This is the two-file form of merge_3dgs, whose inputs are all positional.
+    
     Args:
-        file1 (str): Path to the first 3DGS file
-        file2 (str): Path to the second 3DGS file
+        file1 (str or GaussianCloud): Path to the first 3DGS file, or an in-memory cloud
+        file2 (str or GaussianCloud): Path to the second 3DGS file, or an in-memory cloud
         output_file (str, optional): Path to the output merged 3DGS file
         transform (dict, optional): Optional transformation to apply to the second file
                                    e.g. {'translate': [0.1, 0, 0]} for 10cm translation on X axis
+        cache (bool, optional): Load the inputs through the on-disk scene cache. Default is None
+                                (use the cache if GS_EDIT_CACHE_DIR is set)
+        compressed (bool, optional): Write the chunked compressed PLY layout read by SuperSplat. Default is False.
+        chunk_size (int, optional): Number of vertices of one input converted and written at a time
+        schema (str, optional): Output properties and SH degree: "first", "union" or "intersection"
+                                (see merge_3dgs)
+        sh_padding (str, optional): Handling of inputs whose SH degree differs from the output's:
+                                    "zero", "drop" or "dc" (see merge_3dgs)
+    
+    Returns:
+        str or GaussianCloud: Path of the generated merged 3DGS file, or the merged cloud if either
+                              input is a GaussianCloud and output_file is not specified
+    """
+    return merge_3dgs(file1, file2, output_file=output_file, transform=transform, cache=cache,
+                      compressed=compressed, chunk_size=chunk_size, schema=schema, sh_padding=sh_padding)
+
+def merge_3dgs(*inputs, output_file=None, transform=None, cache=None, compressed=False,
+               chunk_size=DEFAULT_MERGE_CHUNK_SIZE, schema="first", sh_padding="zero"):
+    """
+    Merge any number of 3D Gaussian Splatting files by combining their data
+
+    The output schema is computed once from the headers. Properties missing from an input are
+    filled with zeros. Higher-order SH coefficients (f_rest_*) are stored channel by channel, so they
+    are remapped band by band rather than by name when the SH degrees of the inputs differ.
+
+    Args:
+        *inputs (str or GaussianCloud): Paths to the 3DGS files, or in-memory clouds (at least two)
+        output_file (str, optional): Path to the output merged 3DGS file
+        transform (dict or list, optional): Transformation applied to every input after the first,
+                                            e.g. {'translate': [0.1, 0, 0]} for 10cm translation on X axis
+                                            or {'rotate': [0, 0, 90]} for a rotation in degrees,
+                                            or a list with one transformation (or None) per input
+        cache (bool, optional): Load the inputs through the on-disk scene cache. Default is None
+                                (use the cache if GS_EDIT_CACHE_DIR is set)
+        compressed (bool, optional): Write the chunked compressed PLY layout read by SuperSplat. Default is False.
+        chunk_size (int, optional): Number of vertices of one input converted and written at a time
+        schema (str, optional): Output properties and SH degree:
+                                - "first": those of the first input (default)
+                                - "union": every property found in any input, and the highest SH degree
+                                - "intersection": only properties found in every input, and the lowest SH degree
+        sh_padding (str, optional): Handling of inputs whose SH degree differs from the output's:
+                                    - "zero": pad missing SH bands with zeros and drop extra bands (default)
+                                    - "drop": lower the output to the lowest SH degree of all inputs
+                                    - "dc": keep only the DC color terms (f_dc_*)
     
     Returns:
-        str: Path of the generated merged 3DGS file
+        str or GaussianCloud: Path of the generated merged 3DGS file, or the merged cloud if any
+                              input is a GaussianCloud and output_file is not specified
     """
-    if not os.path.exists(file1) or not os.path.exists(file2):
-        raise ValueError(f"One or both files do not exist: {file1}, {file2}")
+    if len(inputs) < 2:
+        raise ValueError(f"At least two files are needed for merging, got {len(inputs)}")
+    if schema not in MERGE_SCHEMAS:
+        raise ValueError(f"Unknown schema '{schema}', expected one of {', '.join(MERGE_SCHEMAS)}")
+    if sh_padding not in SH_PADDING_POLICIES:
+        raise ValueError(f"Unknown SH padding '{sh_padding}', expected one of {', '.join(SH_PADDING_POLICIES)}")
+    missing = [source for source in inputs if not isinstance(source, GaussianCloud) and not os.path.exists(source)]
+    if missing:
+        raise ValueError(f"Files do not exist: {', '.join(missing)}")
+    
+    if transform is None or isinstance(transform, dict):
+        transforms = [None] + [transform] * (len(inputs) - 1)
+    else:
+        transforms = list(transform)
+        if len(transforms) != len(inputs):
+            raise ValueError(f"Expected {len(inputs)} transformations, got {len(transforms)}")
+    
+    # An in-memory input without an output path produces an in-memory result
+    return_cloud = output_file is None and any(isinstance(source, GaussianCloud) for source in inputs)
     
     # Automatically generate output filename if not specified
     if output_file is None:
-        base_name1 = os.path.splitext(os.path.basename(file1))[0]
-        base_name2 = os.path.splitext(os.path.basename(file2))[0]
-        output_file = f"{base_name1}_merged_{base_name2}.ply"
-    
-    # Convert both files to CSV
-    print(f"Converting {file1} to CSV...")
-    csv1_path, _ = convert_3dgs_to_csv(file1, None)
-    
-    print(f"Converting {file2} to CSV...")
-    csv2_path, _ = convert_3dgs_to_csv(file2, None)
-    
-    # Read CSV files
-    print("Loading CSV data...")
-    df1 = pd.read_csv(csv1_path)
-    df2 = pd.read_csv(csv2_path)
-    
-    # Check if the structure of the two files is compatible
-    if set(df1.columns) != set(df2.columns):
-        print("Warning: The two files have different column structures. Using columns from the first file.")
-        missing_cols = set(df1.columns) - set(df2.columns)
-        for col in missing_cols:
-            df2[col] = 0.0  # Add missing columns with default values
-        df2 = df2[df1.columns]  # Reorder columns to match first file
-    
-    # Apply transformations to the second file if specified
-    if transform is not None:
-        df2 = apply_transformation(df2, transform)
-
-    # Combine the data
-    df_merged = pd.concat([df1, df2], ignore_index=True)
+        base_names = [os.path.splitext(os.path.basename(get_source_filename(source)))[0] for source in inputs]
+        if len(inputs) == 2:
+            output_file = f"{base_names[0]}_merged_{base_names[1]}.ply"
+        else:
+            output_file = f"{base_names[0]}_merged_{len(inputs)}_files.ply"
+    
+    # First pass: read only the headers to size the output and fix its schema
+    headers = [read_merge_header(source, cache) for source in inputs]
+    properties, property_types, sh_degree = reconcile_schema(headers, schema, sh_padding)
+    vertex_count = sum(header['vertex_count'] for header in headers)
+    
+    mappings = []
+    for source, header in zip(inputs, headers):
+        mapping = get_property_mapping(header['properties'], properties, sh_degree)
+        mappings.append(mapping)
+        padded = sum(1 for name in mapping if name is None)
+        dropped = len(set(header['properties']) - set(mapping))
+        if padded or dropped:
+            print(f"Warning: {get_source_filename(source)} has a different column structure: "
+                  f"{padded} properties padded with zeros, {dropped} properties dropped")
+    
+    dtype = np.dtype([(name, '<' + PLY_SCALAR_TYPES[property_types[name]]) for name in properties])
+    print(f"Merging {len(inputs)} files with {vertex_count} vertices in total...")
     
-    # Save merged data to CSV
-    merged_csv_path = os.path.splitext(output_file)[0] + "_merged.csv"
-    df_merged.to_csv(merged_csv_path, index=False)
-    print(f"Merged data saved to CSV: {merged_csv_path}")
+    if return_cloud or compressed:
+        # Both outputs need every vertex at once; the blocks are gathered into one preallocated array
+        merged = np.empty(vertex_count, dtype=dtype)
+        start = 0
+        for source, mapping, source_transform in zip(inputs, mappings, transforms):
+            for block in iter_merge_blocks(source, dtype, mapping, source_transform, cache, chunk_size):
+                merged[start:start + len(block)] = block
+                start += len(block)
+        
+        if return_cloud:
+            print(f"Merged {vertex_count} vertices in memory")
+            return GaussianCloud.from_vertices(merged, property_types, output_file)
+        
+        print(f"Writing merged data to compressed 3DGS format...")
+        write_compressed_ply(output_file, {name: merged[name] for name in properties})
+        print(f"Merged 3DGS file created: {output_file}")
+        return output_file
     
-    # Convert merged CSV back to 3DGS format
-    print(f"Converting merged CSV to 3DGS format...")
-    output_ply = convert_csv_to_3dgs(merged_csv_path, None, output_file)
+    # Second pass: stream each input's vertex block to its offset in the output
+    print(f"Writing merged data to 3DGS format...")
+    types = [(name, property_types[name]) for name in properties]
+    header_text = generate_ply_header(types, vertex_count, "binary_little_endian 1.0") + "\nend_header\n"
+    with open(output_file, "wb") as f:
+        f.write(header_text.encode("ascii"))
+        for source, mapping, source_transform in zip(inputs, mappings, transforms):
+            for block in iter_merge_blocks(source, dtype, mapping, source_transform, cache, chunk_size):
+                block.tofile(f)
     print(f"Merged 3DGS file created: {output_file}")
     
     return output_file
 
-def apply_transformation(df, transform):
+def reconcile_schema(headers, schema="first", sh_padding="zero"):
+    """
+    Compute the output properties of a merge from the headers of its inputs
+    
+    Args:
+        headers (list): Header information of every input
+        schema (str, optional): "first", "union" or "intersection" (see merge_3dgs)
+        sh_padding (str, optional): "zero", "drop" or "dc" (see merge_3dgs)
+    
+    Returns:
+        tuple: (properties, property_types, sh_degree) - Output property names and PLY types, and the
+               output SH degree (None if f_rest_* properties are matched by name because an input
+               has no complete SH layout)
+    """
+    degrees = [get_sh_layout_degree(header['properties']) for header in headers]
+    sh_degree = None
+    if all(degree is not None for degree in degrees):
+        if schema == "first":
+            sh_degree = degrees[0]
+        elif schema == "union":
+            sh_degree = max(degrees)
+        else:
+            sh_degree = min(degrees)
+        if len(set(degrees)) > 1:
+            if sh_padding == "drop":
+                sh_degree = min(degrees)
+            elif sh_padding == "dc":
+                sh_degree = 0
+            print(f"Warning: Inputs have SH degrees {sorted(set(degrees))}, writing SH degree {sh_degree}")
+    
+    def is_sh_rest(name):
+        return sh_degree is not None and name.startswith('f_rest_') and name[7:].isdigit()
+    
+    # Other properties in order of first appearance, with the type of their first occurrence
+    property_types = {}
+    for header in headers if schema != "first" else headers[:1]:
+        for name in header['properties']:
+            if not is_sh_rest(name) and name not in property_types:
+                property_types[name] = header['property_types'][name]
+    properties = list(property_types)
+    if schema == "intersection":
+        properties = [name for name in properties if all(name in header['property_types'] for header in headers)]
+    
+    if sh_degree:
+        rest_type = next((header['property_types'][name] for header in headers
+                          for name in get_sh_rest_names(header['properties'])), 'float')
+        rest_names = [f'f_rest_{i}' for i in range(3 * ((sh_degree + 1) ** 2 - 1))]
+        # The SH coefficients follow the DC color terms as in standard 3DGS files
+        dc_positions = [i for i, name in enumerate(properties) if name.startswith('f_dc_')]
+        insert_at = dc_positions[-1] + 1 if dc_positions else len(properties)
+        properties[insert_at:insert_at] = rest_names
+        property_types.update((name, rest_type) for name in rest_names)
+    
+    return properties, {name: property_types[name] for name in properties}, sh_degree
+
+def get_property_mapping(input_properties, output_properties, sh_degree=None):
+    """
+    Find the input property that supplies each output property
+    
+    Args:
+        input_properties (list): Property names of the input
+        output_properties (list): Property names of the output
+        sh_degree (int, optional): Output SH degree. If given, f_rest_* properties are matched by
+                                   SH channel and coefficient instead of by name
+    
+    Returns:
+        list: Input property name for every output property, or None where it is padded with zeros
+    """
+    input_set = set(input_properties)
+    mapping = [name if name in input_set else None for name in output_properties]
+    if sh_degree is None:
+        return mapping
+    
+    input_degree = get_sh_layout_degree(input_properties)
+    input_count = (input_degree + 1) ** 2 - 1
+    output_count = (sh_degree + 1) ** 2 - 1
+    for i, name in enumerate(output_properties):
+        if name.startswith('f_rest_') and name[7:].isdigit():
+            channel, coefficient = divmod(int(name[7:]), output_count)
+            mapping[i] = f'f_rest_{channel * input_count + coefficient}' if coefficient < input_count else None
+    return mapping
+
+def read_merge_header(source, cache=None):
+    """
+    Read the header information of a merge input without reading its vertex data
+    
+    Args:
+        source (str or GaussianCloud): Path to the 3DGS file, or an in-memory cloud
+        cache (bool, optional): Describe the cached columns of the file instead of the file itself
+    
+    Returns:
+        dict: Header information with at least 'vertex_count', 'properties' and 'property_types'
+    """
+    if not is_cache_enabled(cache, source):
+        return read_ply_header_info(source)
+    
+    _, manifest = load_cached_columns(source)
+    return get_cached_header(source, manifest)
+
+def read_merge_columns(source, cache=None):
+    """
+    Open a 3DGS file or GaussianCloud as columns for merging
+    
+    File inputs are memory-mapped, so their data is only read when a block is accessed.
+    
+    Args:
+        source (str or GaussianCloud): Path to the 3DGS file, or an in-memory cloud
+        cache (bool, optional): Load the file through the on-disk scene cache
+    
+    Returns:
+        tuple: (columns, vertices) - Mapping from property name to array, and the structured
+               vertex array the columns are fields of (None for clouds and cached columns)
+    """
+    if isinstance(source, GaussianCloud):
+        return source.columns(), None
+    
+    if is_cache_enabled(cache, source):
+        columns, _ = load_cached_columns(source)
+        return columns, None
+    
+    vertices, header = read_ply_vertices(source, memory_map=True)
+    return {name: vertices[name] for name in header['properties']}, vertices
+
+def iter_merge_blocks(source, dtype, mapping=None, transform=None, cache=None,
+                      chunk_size=DEFAULT_MERGE_CHUNK_SIZE):
+    """
+    Yield the vertices of a merge input in the output layout, one block at a time
+    
+    Each block is remapped with one fancy-index column gather into a preallocated buffer,
+    whose padded columns stay zero.
+    
+    Args:
+        source (str or GaussianCloud): Path to the 3DGS file, or an in-memory cloud
+        dtype (numpy.dtype): Structured dtype of the output vertices
+        mapping (list, optional): Input property name for every output property, or None where it is
+                                  padded with zeros (from get_property_mapping). Defaults to matching names
+        transform (dict, optional): Transformation applied to the positions
+        cache (bool, optional): Load the file through the on-disk scene cache
+        chunk_size (int, optional): Number of vertices per block
+    
+    Yields:
+        numpy.ndarray: Structured array with dtype. It may share the buffer of the next block,
+                       so it has to be written or copied before the next block is requested
+    """
+    columns, vertices = read_merge_columns(source, cache)
+    vertex_count = len(next(iter(columns.values()))) if columns else 0
+    if mapping is None:
+        mapping = [name if name in columns else None for name in dtype.names]
+    if transform is not None:
+        print(f"Applying transformation to {get_source_filename(source)}: {transform}")
+    
+    # Output columns with an input property, and the input columns they are gathered from
+    names = list(columns)
+    targets = np.array([i for i, name in enumerate(mapping) if name is not None], dtype=np.int64)
+    sources = np.array([names.index(name) for name in mapping if name is not None], dtype=np.int64)
+    
+    # Blocks of float32 records are gathered without widening; other layouts go through float64
+    float32_layout = (vertices is not None and is_float32_layout(vertices.dtype) and is_float32_layout(dtype))
+    buffer = np.zeros((min(chunk_size, vertex_count), len(dtype.names)),
+                      dtype=np.float32 if float32_layout else np.float64)
+    
+    for start in range(0, vertex_count, chunk_size):
+        end = min(start + chunk_size, vertex_count)
+        if transform is None and vertices is not None and vertices.dtype == dtype:
+            # Same layout as the output: the records are copied without being decoded
+            yield vertices[start:end]
+            continue
+        
+        block = buffer[:end - start]
+        if float32_layout:
+            values = np.asarray(vertices[start:end]).view(np.float32).reshape(end - start, len(names))
+            block[:, targets] = values[:, sources]
+            if transform is not None:
+                # Transform the gathered block in its own precision and in the output layout,
+                # where the SH bands form a complete layout even if some were padded
+                gathered = {name: block[:, i] for i, name in enumerate(dtype.names)}
+                for name, values in apply_transformation(gathered, transform, verbose=False).items():
+                    if values is not gathered[name]:
+                        block[:, dtype.names.index(name)] = values
+            yield block.view(dtype).reshape(end - start)
+            continue
+        
+        block_columns = {name: values[start:end] for name, values in columns.items()}
+        if transform is not None:
+            block_columns = apply_transformation(block_columns, transform, verbose=False)
+        block[:, targets] = np.column_stack([np.asarray(block_columns[name], dtype=np.float64)
+                                             for name in names])[:, sources]
+        yield array_to_vertices(block, dtype)
+
+def is_float32_layout(dtype):
+    """
+    Check whether a structured dtype consists of packed little-endian float32 fields only
+    
+    Args:
+        dtype (numpy.dtype): Structured dtype
+    
+    Returns:
+        bool: True if records can be viewed as rows of float32 values
+    """
+    return (all(dtype[name] == np.dtype('<f4') for name in dtype.names)
+            and dtype.itemsize == 4 * len(dtype.names))
+
+def apply_transformation(df, transform, verbose=True):
     """
     Apply transformation to the position data in the dataframe
     
+    The positions are scaled, then rotated around the origin, then translated, the same order
+    as transform_3dgs. 'rotate' also turns the gaussians and their view-dependent color, but
+    'scale' only moves the positions: it may differ per axis and leaves the gaussians' sizes
+    (scale_*) unchanged. Use transform_3dgs to scale whole gaussians.
+    
     Args:
-        df (pandas.DataFrame): Dataframe with 3DGS data
-        transform (dict): Transformation parameters
+        df (pandas.DataFrame, dict or GaussianCloud): Dataframe, mapping of property name to array,
+                                                      or cloud with 3DGS data
+        transform (dict): Transformation parameters: 'scale' [sx, sy, sz], 'rotate' [rx, ry, rz]
+                          in degrees and 'translate' [tx, ty, tz]
+        verbose (bool, optional): Print the applied transformations. Default is True.
     
     Returns:
-        pandas.DataFrame: Transformed dataframe
+        pandas.DataFrame, dict or GaussianCloud: Transformed data of the same type as the input
     """
     # Make a copy to avoid modifying the original dataframe
     transformed_df = df.copy()
     
     # Find the position columns
     x_col, y_col, z_col = None, None, None
-    for col in df.columns:
+    for col in df.keys():
         if col in ['x', 'pos_0']:
             x_col = col
         elif col in ['y', 'pos_1']:
@@ -105,21 +408,40 @@ def apply_transformation(df, transform):
         print("Warning: Position columns not found, no transformation applied")
         return df
     
-    # Apply translation if specified
-    if 'translate' in transform and len(transform['translate']) == 3:
-        tx, ty, tz = transform['translate']
-        transformed_df[x_col] = df[x_col] + tx
-        transformed_df[y_col] = df[y_col] + ty
-        transformed_df[z_col] = df[z_col] + tz
-        print(f"Applied translation: [{tx}, {ty}, {tz}]")
+    # Positions are transformed in double precision and stored back in their own type,
+    # whatever the layout of the input
+    positions = np.column_stack([np.asarray(df[col], dtype=np.float64) for col in (x_col, y_col, z_col)])
+    updates = []
     
     # Apply scale if specified
     if 'scale' in transform and len(transform['scale']) == 3:
         sx, sy, sz = transform['scale']
-        transformed_df[x_col] = df[x_col] * sx
-        transformed_df[y_col] = df[y_col] * sy
-        transformed_df[z_col] = df[z_col] * sz
-        print(f"Applied scaling: [{sx}, {sy}, {sz}]")
+        positions = positions * [sx, sy, sz]
+        if verbose:
+            print(f"Applied scaling: [{sx}, {sy}, {sz}]")
+    
+    # Apply rotation around the origin if specified, turning the gaussians and their
+    # view-dependent color along with their positions
+    if 'rotate' in transform and len(transform['rotate']) == 3:
+        rx, ry, rz = transform['rotate']
+        rotation = create_rotation_matrix(rx, ry, rz)
+        positions = positions @ rotation.T
+        updates += rotate_orientations(df, rotation)
+        if verbose:
+            print(f"Applied rotation: [{rx}, {ry}, {rz}] degrees")
+    
+    # Apply translation if specified
+    if 'translate' in transform and len(transform['translate']) == 3:
+        tx, ty, tz = transform['translate']
+        positions = positions + [tx, ty, tz]
+        if verbose:
+            print(f"Applied translation: [{tx}, {ty}, {tz}]")
+    
+    if any(key in transform for key in ('scale', 'rotate', 'translate')):
+        updates.append(((x_col, y_col, z_col), positions))
+    for names, values in updates:
+        for col, column in zip(names, values.T):
+            transformed_df[col] = column.astype(np.asarray(df[col]).dtype)
     
     return transformed_df
 
@@ -127,41 +449,65 @@ def main():
     """
     Command-line interface for merging 3DGS files
     """
-    parser = argparse.ArgumentParser(description='Merge two 3DGS files')
-    parser.add_argument('file1', type=str, help='Path to the first 3DGS file')
-    parser.add_argument('file2', type=str, help='Path to the second 3DGS file')
+    parser = argparse.ArgumentParser(description='Merge 3DGS files')
+    parser.add_argument('files', type=str, nargs='+', help='Paths to the 3DGS files to merge (at least two)')
     parser.add_argument('--output', '-o', type=str, default=None, 
                         help='Path to the output merged 3DGS file')
     parser.add_argument('--translate-x', type=float, default=0.0,
-                        help='Translation along X axis for the second file')
+                        help='Translation along X axis for every file after the first')
     parser.add_argument('--translate-y', type=float, default=0.0,
-                        help='Translation along Y axis for the second file')
+                        help='Translation along Y axis for every file after the first')
     parser.add_argument('--translate-z', type=float, default=0.0,
-                        help='Translation along Z axis for the second file')
+                        help='Translation along Z axis for every file after the first')
+    parser.add_argument('--rotate-x', type=float, default=0.0,
+                        help='Rotation around X axis in degrees for every file after the first')
+    parser.add_argument('--rotate-y', type=float, default=0.0,
+                        help='Rotation around Y axis in degrees for every file after the first')
+    parser.add_argument('--rotate-z', type=float, default=0.0,
+                        help='Rotation around Z axis in degrees for every file after the first')
     parser.add_argument('--scale-x', type=float, default=1.0,
-                        help='Scale factor for X axis for the second file')
+                        help='Scale factor of the positions along X axis for every file after the first')
     parser.add_argument('--scale-y', type=float, default=1.0,
-                        help='Scale factor for Y axis for the second file')
+                        help='Scale factor of the positions along Y axis for every file after the first')
     parser.add_argument('--scale-z', type=float, default=1.0,
-                        help='Scale factor for Z axis for the second file')
+                        help='Scale factor of the positions along Z axis for every file after the first')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Do not use the scene cache even if GS_EDIT_CACHE_DIR is set')
+    parser.add_argument('--compressed', action='store_true',
+                        help='Write the merged file in the chunked compressed PLY layout read by SuperSplat')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_MERGE_CHUNK_SIZE,
+                        help='Number of vertices converted and written at a time')
+    parser.add_argument('--schema', choices=MERGE_SCHEMAS, default='first',
+                        help='Output properties: those of the first file (default), the union or the intersection')
+    parser.add_argument('--sh-padding', choices=SH_PADDING_POLICIES, default='zero',
+                        help='Inputs with a different SH degree: pad with zeros (default), drop to the lowest '
+                             'degree, or keep only the DC color')
     
     args = parser.parse_args()
+    if len(args.files) < 2:
+        parser.error("at least two files are needed for merging")
     
     # Create transformation dictionary
     transform = {
+        'rotate': [args.rotate_x, args.rotate_y, args.rotate_z],
         'translate': [args.translate_x, args.translate_y, args.translate_z],
         'scale': [args.scale_x, args.scale_y, args.scale_z]
     }
     
     # Skip transformation if all values are default
-    if all(x == 0 for x in transform['translate']) and all(x == 1 for x in transform['scale']):
+    if (all(x == 0 for x in transform['rotate']) and all(x == 0 for x in transform['translate'])
+            and all(x == 1 for x in transform['scale'])):
         transform = None
+    elif all(x == 0 for x in transform['rotate']):
+        del transform['rotate']
     
     try:
-        output_file = merge_3dgs_files(args.file1, args.file2, args.output, transform)
+        output_file = merge_3dgs(*args.files, output_file=args.output, transform=transform,
+                                 cache=False if args.no_cache else None, compressed=args.compressed,
+                                 chunk_size=args.chunk_size, schema=args.schema, sh_padding=args.sh_padding)
         print(f"\nSuccessfully merged 3DGS files:")
-        print(f"- File 1: {args.file1}")
-        print(f"- File 2: {args.file2}")
+        for i, filename in enumerate(args.files):
+            print(f"- File {i + 1}: {filename}")
         print(f"- Output: {output_file}")
         return 0
     except Exception as e:
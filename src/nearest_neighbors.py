@@ -0,0 +1,250 @@
+"""
+Nearest Neighbour Search Module
+
+This module finds, for every query point, the index of the nearest reference point.
+It uses scipy's cKDTree when scipy is installed. Otherwise a NumPy uniform grid is
+used: each query only looks at the 27 grid cells around it, and the few queries whose
+nearest neighbour may lie further away are searched again on coarser grids. Both methods
+are exact and process all queries in batches, without a Python loop per point.
+"""
+
+import numpy as np
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
+
+# Target number of reference points sharing a grid cell with a typical reference point
+GRID_POINTS_PER_CELL = 8
+
+# Cell size growth between grids searched for queries without a guaranteed neighbour
+GRID_COARSENING_FACTOR = 4
+
+# Number of queries searched at a time by the grid search
+GRID_QUERY_CHUNK_SIZE = 65536
+
+# Upper limit of the number of grid cells, so flat cell keys fit into int64
+MAX_GRID_CELLS = 2.0 ** 62
+
+# Number of query/reference distances computed at a time by the brute-force search
+BRUTE_FORCE_CHUNK_PAIRS = 2 ** 22
+
+
+def find_nearest_indices(reference_points, query_points):
+    """
+    Find the nearest reference point of every query point
+
+    Args:
+        reference_points (numpy.ndarray): Array of shape (N, 3)
+        query_points (numpy.ndarray): Array of shape (M, 3)
+
+    Returns:
+        tuple: (indices, distances) - int64 index into reference_points and the Euclidean
+               distance for every query point
+    """
+    reference_points = np.asarray(reference_points, dtype=np.float64).reshape(-1, 3)
+    query_points = np.asarray(query_points, dtype=np.float64).reshape(-1, 3)
+    if len(reference_points) == 0:
+        raise ValueError("Cannot search for nearest neighbours without reference points")
+    if len(query_points) == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float64)
+
+    if cKDTree is not None:
+        tree = cKDTree(reference_points)
+        try:
+            distances, indices = tree.query(query_points, k=1, workers=-1)
+        except TypeError:
+            # scipy < 1.6 names the parallelism option n_jobs
+            distances, indices = tree.query(query_points, k=1, n_jobs=-1)
+        return indices.astype(np.int64), distances
+
+    return grid_nearest_indices(reference_points, query_points)
+
+
+def get_grid_shape(points, origin, cell_size):
+    """
+    Get the number of grid cells along each axis needed to cover the points
+
+    Args:
+        points (numpy.ndarray): Array of shape (N, 3)
+        origin (numpy.ndarray): Minimum corner of the grid
+        cell_size (float): Cell edge length
+
+    Returns:
+        numpy.ndarray: int64 array of 3 cell counts
+    """
+    return np.floor((points.max(axis=0) - origin) / cell_size).astype(np.int64) + 1
+
+
+def get_grid_cell_size(points, points_per_cell=GRID_POINTS_PER_CELL):
+    """
+    Choose a grid cell size that puts about points_per_cell points in the cell of a typical point
+
+    Args:
+        points (numpy.ndarray): Array of shape (N, 3)
+        points_per_cell (int, optional): Target number of points sharing a cell with a point
+
+    Returns:
+        float: Cell edge length
+    """
+    origin = points.min(axis=0)
+    extent = float(np.max(points.max(axis=0) - origin))
+    if extent <= 0:
+        return 1.0
+
+    # Start from a uniform volume estimate and refine it from the measured occupancy,
+    # which also adapts the size to points lying on surfaces or clustered densely
+    cell_size = extent / max(1.0, (len(points) / points_per_cell) ** (1 / 3))
+    for _ in range(4):
+        grid_shape = get_grid_shape(points, origin, cell_size)
+        if np.prod(grid_shape.astype(np.float64)) >= MAX_GRID_CELLS:
+            break
+        cells = np.floor((points - origin) / cell_size).astype(np.int64)
+        _, counts = np.unique(np.ravel_multi_index(cells.T, grid_shape), return_counts=True)
+        # Average over points rather than cells, so dense regions dominate the estimate
+        occupancy = np.sum(counts.astype(np.float64) ** 2) / len(points)
+        if 0.5 * points_per_cell <= occupancy <= 2 * points_per_cell:
+            break
+        # Occupancy grows roughly with the square of the cell size for surface-like data
+        cell_size *= np.sqrt(points_per_cell / occupancy)
+    return cell_size
+
+
+def grid_nearest_indices(reference_points, query_points, cell_size=None):
+    """
+    Find nearest reference points with a uniform grid (used when scipy is not installed)
+
+    Queries without a guaranteed neighbour in the grid are searched again on coarser grids.
+
+    Args:
+        reference_points (numpy.ndarray): float64 array of shape (N, 3)
+        query_points (numpy.ndarray): float64 array of shape (M, 3)
+        cell_size (float, optional): Grid cell edge length. Chosen automatically by default
+
+    Returns:
+        tuple: (indices, distances) - int64 index into reference_points and the Euclidean
+               distance for every query point
+    """
+    if cell_size is None:
+        cell_size = get_grid_cell_size(reference_points)
+    origin = reference_points.min(axis=0)
+
+    indices = np.zeros(len(query_points), dtype=np.int64)
+    squared = np.full(len(query_points), np.inf)
+    remaining = np.arange(len(query_points))
+    while len(remaining) > 0:
+        grid_shape = get_grid_shape(reference_points, origin, cell_size)
+        if np.prod(grid_shape.astype(np.float64)) >= MAX_GRID_CELLS:
+            # Keep the flat cell keys within int64
+            cell_size *= 2
+            continue
+
+        found, found_squared = search_grid(reference_points, query_points[remaining], origin, cell_size, grid_shape)
+        indices[remaining] = found
+        squared[remaining] = found_squared
+        if np.all(grid_shape == 1):
+            break
+        # A neighbour within one cell size is guaranteed to be the nearest, since every point
+        # outside the 27 searched cells is further away than that
+        remaining = remaining[found_squared > cell_size ** 2]
+        cell_size *= GRID_COARSENING_FACTOR
+
+    # Queries far outside a single-cell grid are compared against every reference point
+    chunk_size = max(1, BRUTE_FORCE_CHUNK_PAIRS // len(reference_points))
+    for start in range(0, len(remaining), chunk_size):
+        queries = remaining[start:start + chunk_size]
+        distances = np.zeros((len(queries), len(reference_points)))
+        for axis in range(3):
+            distances += (query_points[queries, axis, np.newaxis] - reference_points[:, axis]) ** 2
+        indices[queries] = np.argmin(distances, axis=1)
+        squared[queries] = distances[np.arange(len(queries)), indices[queries]]
+
+    return indices, np.sqrt(squared)
+
+
+def search_grid(reference_points, query_points, origin, cell_size, grid_shape):
+    """
+    Find the nearest reference point within the 27 grid cells around every query point
+
+    Args:
+        reference_points (numpy.ndarray): float64 array of shape (N, 3)
+        query_points (numpy.ndarray): float64 array of shape (M, 3)
+        origin (numpy.ndarray): Minimum corner of the grid
+        cell_size (float): Cell edge length
+        grid_shape (numpy.ndarray): Number of cells along each axis
+
+    Returns:
+        tuple: (indices, squared_distances) - index into reference_points and squared distance
+               of the nearest point found, with an infinite distance where no point was found
+    """
+    # Sort the reference points by cell so the points of a cell are contiguous
+    reference_cells = np.floor((reference_points - origin) / cell_size).astype(np.int64)
+    reference_keys = np.ravel_multi_index(reference_cells.T, grid_shape)
+    reference_order = np.argsort(reference_keys, kind='stable')
+    cell_keys, cell_starts, cell_counts = np.unique(reference_keys[reference_order], return_index=True,
+                                                    return_counts=True)
+    # One contiguous array per axis makes the candidate gathers cheaper
+    sorted_axes = [np.ascontiguousarray(reference_points[reference_order, axis]) for axis in range(3)]
+
+    # Visit the queries in cell order too, so neighbouring queries read neighbouring memory
+    query_cells = np.clip(np.floor((query_points - origin) / cell_size), -2, grid_shape + 1).astype(np.int64)
+    query_order = np.argsort(np.ravel_multi_index(query_cells.T + 2, grid_shape + 4), kind='stable')
+
+    # The query's own cell comes first, so the other cells can often be skipped
+    offsets = sorted(np.ndindex(3, 3, 3), key=lambda offset: offset != (1, 1, 1))
+
+    best_squared = np.full(len(query_points), np.inf)
+    best_sorted = np.zeros(len(query_points), dtype=np.int64)
+    for start in range(0, len(query_points), GRID_QUERY_CHUNK_SIZE):
+        queries = query_order[start:start + GRID_QUERY_CHUNK_SIZE]
+        chunk_points = query_points[queries]
+        chunk_cells = query_cells[queries]
+        chunk_squared = best_squared[queries]
+        chunk_sorted = best_sorted[queries]
+        chunk_axes = [np.ascontiguousarray(chunk_points[:, axis]) for axis in range(3)]
+
+        # Squared distance along each axis from every query to the cells before, at and after its own,
+        # and whether those cells are inside the grid
+        cell_min = origin[:, np.newaxis] + (chunk_cells[:, :, np.newaxis] + np.arange(-1, 2)) * cell_size
+        axis_gaps = np.maximum(np.maximum(cell_min - chunk_points[:, :, np.newaxis],
+                                          chunk_points[:, :, np.newaxis] - (cell_min + cell_size)), 0) ** 2
+        axis_cells = chunk_cells[:, :, np.newaxis] + np.arange(-1, 2)
+        axis_gaps[(axis_cells < 0) | (axis_cells >= grid_shape[:, np.newaxis])] = np.inf
+        axis_gaps = np.ascontiguousarray(axis_gaps.transpose(1, 2, 0))
+
+        for offset in offsets:
+            # Skip cells outside the grid and cells further away than the best point found so far
+            gap = axis_gaps[0, offset[0]] + axis_gaps[1, offset[1]] + axis_gaps[2, offset[2]]
+            local = np.flatnonzero(gap < chunk_squared)
+            if len(local) == 0:
+                continue
+            cells = chunk_cells[local] + np.array(offset) - 1
+            keys = np.ravel_multi_index(cells.T, grid_shape)
+            positions = np.minimum(np.searchsorted(cell_keys, keys), len(cell_keys) - 1)
+            occupied = cell_keys[positions] == keys
+            local, positions = local[occupied], positions[occupied]
+            if len(local) == 0:
+                continue
+            starts, counts = cell_starts[positions], cell_counts[positions]
+
+            # Expand every query into one (query, candidate) pair per point of the cell
+            first = np.cumsum(counts) - counts
+            pair_queries = np.repeat(local, counts)
+            pair_candidates = np.repeat(starts - first, counts) + np.arange(first[-1] + counts[-1])
+            squared = np.zeros(len(pair_candidates))
+            for axis in range(3):
+                squared += (sorted_axes[axis][pair_candidates] - chunk_axes[axis][pair_queries]) ** 2
+
+            # Closest candidate of each query; ties go to the first candidate
+            cell_squared = np.minimum.reduceat(squared, first)
+            is_closest = squared == np.repeat(cell_squared, counts)
+            closest = np.minimum.reduceat(np.where(is_closest, np.arange(len(squared)), len(squared)), first)
+            closer = cell_squared < chunk_squared[local]
+            chunk_squared[local[closer]] = cell_squared[closer]
+            chunk_sorted[local[closer]] = pair_candidates[closest[closer]]
+
+        best_squared[queries] = chunk_squared
+        best_sorted[queries] = chunk_sorted
+
+    return reference_order[best_sorted], best_squared
@@ -1,10 +1,19 @@
-import struct
 import os
 import csv
+import shutil
 import numpy as np
+from .file_utils import read_ply_vertices, get_pointcloud_arrays
+from .utils import chunk_size_for_memory, iter_csv_blocks, write_csv_block
 
 
-def convert_pointcloud_to_csv(ply_filename, csv_filename=None):
+# Estimated working memory per value while a chunk is parsed or formatted
+BYTES_PER_CSV_VALUE = 64
+
+# Number of rows processed at a time when no chunk size or memory budget is given
+DEFAULT_CSV_BLOCK_SIZE = 65536
+
+
+def convert_pointcloud_to_csv(ply_filename, csv_filename=None, chunk_size=None, max_memory=None):
     """
     Convert point cloud PLY file to CSV format for easier editing.
     
@@ -12,6 +21,10 @@ def convert_pointcloud_to_csv(ply_filename, csv_filename=None):
         ply_filename (str): Path to the input point cloud PLY file
         csv_filename (str, optional): Path to the output CSV file
             If not specified, it's automatically generated from the input filename
+        chunk_size (int, optional): Stream the conversion, processing this many points at a time.
+            Default is None (convert all points at once).
+        max_memory (int, optional): Stream the conversion with a chunk size derived from this memory
+            budget in bytes. Ignored if chunk_size is given.
         
     Returns:
         str: Path of the generated CSV file
@@ -21,45 +34,33 @@ def convert_pointcloud_to_csv(ply_filename, csv_filename=None):
         base_name = os.path.splitext(ply_filename)[0]
         csv_filename = f"{base_name}.csv"
 
-    # Read point cloud data
-    points, colors, color_type = read_pointcloud_ply(ply_filename)
-    
-    # Create CSV header - always include x,y,z and r,g,b
-    header = ['x', 'y', 'z', 'red', 'green', 'blue']
-    
-    # Create rows with position and color data
-    rows = []
-    for i in range(len(points)):
-        # If color data uses float (0-1), convert to 0-255 range for better readability in CSV
-        if color_type == "float":
-            color_vals = [
-                min(255, int(colors[i][0] * 255)) if colors[i][0] <= 1.0 else int(colors[i][0]),
-                min(255, int(colors[i][1] * 255)) if colors[i][1] <= 1.0 else int(colors[i][1]),
-                min(255, int(colors[i][2] * 255)) if colors[i][2] <= 1.0 else int(colors[i][2])
-            ]
+    # The vertex block is memory-mapped, so only the current chunk is resident
+    vertices, header = read_ply_vertices(ply_filename, memory_map=True)
+    color_properties, color_type = get_pointcloud_color_properties(header)
+    
+    if chunk_size is None:
+        if max_memory is not None:
+            chunk_size = chunk_size_for_memory(max_memory, 6 * BYTES_PER_CSV_VALUE)
         else:
-            color_vals = [int(colors[i][0]), int(colors[i][1]), int(colors[i][2])]
-            
-        row = [
-            points[i][0],  # x
-            points[i][1],  # y
-            points[i][2],  # z
-            color_vals[0], # red
-            color_vals[1], # green
-            color_vals[2]  # blue
-        ]
-        rows.append(row)
-    
-    # Write data to CSV
+            chunk_size = len(vertices)
+    chunk_size = max(1, chunk_size)
+    
+    # Always include x,y,z and r,g,b; colors are written as 0-255 integers
     with open(csv_filename, 'w', newline='') as f:
         writer = csv.writer(f)
-        writer.writerow(header)
-        writer.writerows(rows)
+        writer.writerow(['x', 'y', 'z', 'red', 'green', 'blue'])
+        
+        for start in range(0, len(vertices), chunk_size):
+            points, colors = get_pointcloud_arrays(vertices[start:start + chunk_size], ['x', 'y', 'z'],
+                                                   color_properties)
+            values = np.hstack([points.astype(np.float64), colors_to_csv_values(colors, color_type)])
+            write_csv_block(f, values, ['%r'] * 3 + ['%d'] * 3)
     
     return csv_filename
 
 
-def convert_csv_to_pointcloud(csv_filename, output_ply_filename=None, color_type="uchar"):
+def convert_csv_to_pointcloud(csv_filename, output_ply_filename=None, color_type="uchar",
+                              chunk_size=None, max_memory=None):
     """
     Convert CSV file to point cloud PLY format.
     
@@ -68,6 +69,10 @@ def convert_csv_to_pointcloud(csv_filename, output_ply_filename=None, color_type
         output_ply_filename (str, optional): Path to the output point cloud PLY file
             If not specified, it's automatically generated from the input filename
         color_type (str): Type of color data to use in PLY file ('float' or 'uchar')
+        chunk_size (int, optional): Stream the conversion, parsing this many rows at a time and
+            writing them out immediately. Default is None (convert all rows at once).
+        max_memory (int, optional): Stream the conversion with a chunk size derived from this memory
+            budget in bytes. Ignored if chunk_size is given.
         
     Returns:
         str: Path of the generated PLY file
@@ -77,12 +82,59 @@ def convert_csv_to_pointcloud(csv_filename, output_ply_filename=None, color_type
         base_name = os.path.splitext(csv_filename)[0]
         output_ply_filename = f"{base_name}.ply"
     
-    # Read CSV data
+    streaming = chunk_size is not None or max_memory is not None
+    if chunk_size is None:
+        if max_memory is not None:
+            chunk_size = chunk_size_for_memory(max_memory, 6 * BYTES_PER_CSV_VALUE)
+        else:
+            chunk_size = DEFAULT_CSV_BLOCK_SIZE
+    chunk_size = max(1, chunk_size)
+    
     with open(csv_filename, 'r', newline='') as f:
-        reader = csv.reader(f)
-        header = next(reader)  # Get header
-        rows = list(reader)    # Get all data rows
+        header = next(csv.reader(f))  # Get header
+        blocks = iter_pointcloud_csv_blocks(f, header, color_type, chunk_size)
+        
+        if not streaming:
+            blocks = list(blocks)
+            vertex_count = sum(len(block) for block in blocks)
+            with open(output_ply_filename, 'wb') as out:
+                write_pointcloud_header(out, vertex_count, color_type)
+                for block in blocks:
+                    block.tofile(out)
+            return output_ply_filename
+        
+        # The vertex count is only known at the end, so the body is written to a temporary file first
+        body_filename = f"{output_ply_filename}.tmp-{os.getpid()}"
+        try:
+            vertex_count = 0
+            with open(body_filename, 'wb') as body:
+                for block in blocks:
+                    block.tofile(body)
+                    vertex_count += len(block)
+            
+            with open(output_ply_filename, 'wb') as out, open(body_filename, 'rb') as body:
+                write_pointcloud_header(out, vertex_count, color_type)
+                shutil.copyfileobj(body, out, 16 * 1024 * 1024)
+        finally:
+            if os.path.exists(body_filename):
+                os.remove(body_filename)
+    
+    return output_ply_filename
+
+
+def iter_pointcloud_csv_blocks(file_obj, header, color_type, block_size):
+    """
+    Parse the rows of a point cloud CSV file into blocks of point cloud PLY vertices
     
+    Args:
+        file_obj: Text file object positioned after the header row
+        header (list): CSV header row
+        color_type (str): Type of color data to use in PLY file ('float' or 'uchar')
+        block_size (int): Number of rows parsed per block
+        
+    Yields:
+        numpy.ndarray: Structured vertex array in the point cloud PLY layout
+    """
     # Extract column indices
     try:
         x_idx = header.index('x')
@@ -103,187 +155,158 @@ def convert_csv_to_pointcloud(csv_filename, output_ply_filename=None, color_type
         except ValueError:
             raise ValueError("CSV file must contain x,y,z and red,green,blue (or r,g,b) columns")
     
-    # Extract point and color data
-    points = []
-    colors = []
+    dtype = get_pointcloud_dtype(color_type)
+    skipped_rows = 0
     
-    for row in rows:
-        if len(row) > max(x_idx, y_idx, z_idx, r_idx, g_idx, b_idx):
-            points.append([float(row[x_idx]), float(row[y_idx]), float(row[z_idx])])
-            
-            # Handle color data - convert to the required type
-            if color_type == "float":
-                # Convert to float range 0-1 if values are in 0-255 range
-                r_val = float(row[r_idx])
-                g_val = float(row[g_idx])
-                b_val = float(row[b_idx])
-                
-                # Check if values are in 0-255 range and convert to 0-1
-                if r_val > 1.0 or g_val > 1.0 or b_val > 1.0:
-                    r_val /= 255.0
-                    g_val /= 255.0
-                    b_val /= 255.0
-                
-                colors.append([r_val, g_val, b_val])
-            else:
-                # Convert to integers in 0-255 range
-                r_val = float(row[r_idx])
-                g_val = float(row[g_idx])
-                b_val = float(row[b_idx])
-                
-                # If values are in 0-1 range, convert to 0-255
-                if r_val <= 1.0 and g_val <= 1.0 and b_val <= 1.0 and (r_val > 0 or g_val > 0 or b_val > 0):
-                    r_val *= 255
-                    g_val *= 255
-                    b_val *= 255
-                
-                colors.append([int(r_val), int(g_val), int(b_val)])
-    
-    points = np.array(points)
-    colors = np.array(colors)
-    
-    # Create PLY file
-    with open(output_ply_filename, 'wb') as f:
-        # Write header
-        f.write(b"ply\n")
-        f.write(b"format binary_little_endian 1.0\n")
-        f.write(f"element vertex {len(points)}\n".encode())
-        f.write(b"property float x\n")
-        f.write(b"property float y\n")
-        f.write(b"property float z\n")
+    for values, malformed_rows in iter_csv_blocks(file_obj, len(header), block_size):
+        if malformed_rows:
+            # Rows that cannot be parsed are skipped
+            skipped_rows += len(malformed_rows)
+            values = np.delete(values, malformed_rows, axis=0)
         
-        if color_type == "float":
-            f.write(b"property float red\n")
-            f.write(b"property float green\n")
-            f.write(b"property float blue\n")
-        else:
-            f.write(b"property uchar red\n")
-            f.write(b"property uchar green\n")
-            f.write(b"property uchar blue\n")
+        block = np.empty(len(values), dtype=dtype)
+        block['x'] = values[:, x_idx]
+        block['y'] = values[:, y_idx]
+        block['z'] = values[:, z_idx]
+        colors = csv_values_to_colors(values[:, [r_idx, g_idx, b_idx]], color_type)
+        for i, channel in enumerate(('red', 'green', 'blue')):
+            block[channel] = colors[:, i]
+        yield block
+    
+    if skipped_rows:
+        print(f"WARNING: Skipped {skipped_rows} malformed rows")
+
+
+def colors_to_csv_values(colors, color_type):
+    """
+    Convert point cloud colors to the 0-255 integer values written to CSV
+    
+    Args:
+        colors (numpy.ndarray): Array of shape (N, 3)
+        color_type (str): Color data type of the PLY file
         
-        f.write(b"end_header\n")
+    Returns:
+        numpy.ndarray: float64 array of integer values
+    """
+    colors = colors.astype(np.float64)
+    if color_type == "float":
+        # Float colors (0-1) are converted to 0-255 for better readability in CSV
+        return np.where(colors <= 1.0, np.minimum(255, np.trunc(colors * 255)), np.trunc(colors))
+    return np.trunc(colors)
+
+
+def csv_values_to_colors(values, color_type):
+    """
+    Convert CSV color values to the color data type of the PLY file
+    
+    Args:
+        values (numpy.ndarray): float64 array of shape (N, 3)
+        color_type (str): Type of color data to use in PLY file ('float' or 'uchar')
         
-        # Write data
-        for i in range(len(points)):
-            f.write(struct.pack('<3f', *points[i]))  # Position data
-            
-            if color_type == "float":
-                f.write(struct.pack('<3f', *colors[i]))  # Color as float
-            else:
-                # Ensure values are within 0-255 range
-                r = max(0, min(255, int(colors[i][0])))
-                g = max(0, min(255, int(colors[i][1])))
-                b = max(0, min(255, int(colors[i][2])))
-                f.write(struct.pack('3B', r, g, b))  # Color as uchar
+    Returns:
+        numpy.ndarray: float32 colors in the 0-1 range, or uint8 colors in the 0-255 range
+    """
+    if color_type == "float":
+        # Rows with any value in the 0-255 range are converted to 0-1
+        in_byte_range = (values > 1.0).any(axis=1, keepdims=True)
+        return np.where(in_byte_range, values / 255.0, values).astype(np.float32)
+    
+    # Rows with all values in the 0-1 range (and not all zero) are converted to 0-255
+    in_unit_range = (values <= 1.0).all(axis=1, keepdims=True) & (values > 0).any(axis=1, keepdims=True)
+    values = np.where(in_unit_range, values * 255, values)
+    return np.clip(np.trunc(values), 0, 255).astype(np.uint8)
+
+
+def get_pointcloud_dtype(color_type):
+    """
+    Get the vertex dtype of a point cloud PLY file written by this module
     
-    return output_ply_filename
+    Args:
+        color_type (str): Type of color data ('float' or 'uchar')
+        
+    Returns:
+        numpy.dtype: Structured dtype with float x, y, z and red, green, blue colors
+    """
+    color_dtype = '<f4' if color_type == "float" else 'u1'
+    return np.dtype([('x', '<f4'), ('y', '<f4'), ('z', '<f4'),
+                     ('red', color_dtype), ('green', color_dtype), ('blue', color_dtype)])
 
 
-def read_pointcloud_ply(filename):
+def write_pointcloud_header(file_obj, vertex_count, color_type):
     """
-    Read position and color information from a point cloud PLY file.
+    Write the header of a point cloud PLY file
     
     Args:
-        filename (str): Path to the PLY file
+        file_obj: Binary file object to write to
+        vertex_count (int): Number of points
+        color_type (str): Type of color data ('float' or 'uchar')
+    """
+    file_obj.write(b"ply\n")
+    file_obj.write(b"format binary_little_endian 1.0\n")
+    file_obj.write(f"element vertex {vertex_count}\n".encode())
+    file_obj.write(b"property float x\n")
+    file_obj.write(b"property float y\n")
+    file_obj.write(b"property float z\n")
+    
+    if color_type == "float":
+        file_obj.write(b"property float red\n")
+        file_obj.write(b"property float green\n")
+        file_obj.write(b"property float blue\n")
+    else:
+        file_obj.write(b"property uchar red\n")
+        file_obj.write(b"property uchar green\n")
+        file_obj.write(b"property uchar blue\n")
+    
+    file_obj.write(b"end_header\n")
+
+
+def get_pointcloud_color_properties(header):
+    """
+    Find the color properties of a point cloud PLY file
+    
+    Args:
+        header (dict): Header information from parse_ply_header
         
     Returns:
-        tuple: (points, colors, color_type) where:
-            - points is a numpy array of (x,y,z) coordinates
-            - colors is a numpy array of (r,g,b) values
-            - color_type is a string indicating the data type of colors ("float" or "uchar")
+        tuple: (color_properties, color_type) - Names of the red, green and blue properties
+               (None if the file has no colors) and the color data type
     """
-    with open(filename, "rb") as f:
-        content = f.read()
-    
-    # Find the end of header position
-    header_end = content.find(b'end_header\n') + len(b'end_header\n')
-    header = content[:header_end].decode("ascii")
-    
-    # Parse header
-    lines = header.splitlines()
-    vertex_count = 0
-    properties = []
-    formats = {}
+    properties = header['properties']
     color_type = "uchar"  # Default color type
     
-    for line in lines:
-        if line.startswith("element vertex"):
-            vertex_count = int(line.split()[-1])
-        elif line.startswith("property"):
-            parts = line.split()
-            prop_type = parts[1]  # float, uchar, etc.
-            prop_name = parts[2]
-            properties.append(prop_name)
-            formats[prop_name] = prop_type
-            
-            # Detect color type
-            if prop_name in ["red", "green", "blue", "r", "g", "b"]:
-                color_type = prop_type
-    
-    # Determine the format of each vertex
-    format_str = "<"  # little endian
-    size_sum = 0
-    
-    for prop in properties:
-        if formats[prop] == "float":
-            format_str += "f"
-            size_sum += 4
-        elif formats[prop] == "uchar":
-            format_str += "B"
-            size_sum += 1
-        elif formats[prop] == "double":
-            format_str += "d"
-            size_sum += 8
-        elif formats[prop] == "int":
-            format_str += "i"
-            size_sum += 4
-        elif formats[prop] == "short":
-            format_str += "h"
-            size_sum += 2
-        elif formats[prop] == "uint":
-            format_str += "I"
-            size_sum += 4
-    
-    # Extract the data section
-    data_section = content[header_end:]
-    
-    # Find the indices of position and color properties
-    x_idx = properties.index('x')
-    y_idx = properties.index('y')
-    z_idx = properties.index('z')
+    for prop_name in properties:
+        # Detect color type
+        if prop_name in ["red", "green", "blue", "r", "g", "b"]:
+            color_type = header['property_types'][prop_name]
     
     # Try to find color information (could be named differently in different formats)
-    try:
-        r_idx = properties.index('red')
-        g_idx = properties.index('green')
-        b_idx = properties.index('blue')
-    except ValueError:
-        try:
-            r_idx = properties.index('r')
-            g_idx = properties.index('g')
-            b_idx = properties.index('b')
-        except ValueError:
-            r_idx = g_idx = b_idx = None
+    for names in (['red', 'green', 'blue'], ['r', 'g', 'b']):
+        if all(name in properties for name in names):
+            return names, color_type
+    return None, color_type
+
+
+def read_pointcloud_ply(filename):
+    """
+    Read position and color information from a point cloud PLY file.
     
-    # Read the binary data
-    points = []
-    colors = []
+    The vertex block is decoded with its typed structured dtype, so any byte order, mixed
+    float/uchar layouts and extra properties such as normals or scalar fields are supported.
     
-    for i in range(vertex_count):
-        start = i * size_sum
-        end = start + size_sum
-        values = struct.unpack(format_str, data_section[start:end])
-        
-        # Extract position
-        points.append([values[x_idx], values[y_idx], values[z_idx]])
+    Args:
+        filename (str): Path to the PLY file
         
-        # Extract color if available
-        if r_idx is not None and g_idx is not None and b_idx is not None:
-            colors.append([values[r_idx], values[g_idx], values[b_idx]])
-        else:
-            colors.append([255, 255, 255])  # Default to white if no color
+    Returns:
+        tuple: (points, colors, color_type) where:
+            - points is a float32 numpy array of (x,y,z) coordinates
+            - colors is a numpy array of (r,g,b) values (uint8 for uchar colors, float32 otherwise)
+            - color_type is a string indicating the data type of colors ("float" or "uchar")
+    """
+    vertices, header = read_ply_vertices(filename, memory_map=True)
+    color_properties, color_type = get_pointcloud_color_properties(header)
     
-    return np.array(points), np.array(colors), color_type
+    points, colors = get_pointcloud_arrays(vertices, ['x', 'y', 'z'], color_properties)
+    return points, colors, color_type
 
 
 def main():
@@ -297,27 +320,63 @@ def main():
     ply2csv_parser = subparsers.add_parser('ply2csv', help='Convert point cloud PLY to CSV')
     ply2csv_parser.add_argument('input_ply', help='Input point cloud PLY file')
     ply2csv_parser.add_argument('--output_csv', help='Output CSV filename (default: input_filename.csv)')
+    add_streaming_arguments(ply2csv_parser)
     
     # CSV to pointcloud command
     csv2ply_parser = subparsers.add_parser('csv2ply', help='Convert CSV to point cloud PLY')
-    csv2ply_parser.add_argument('input_csv', help='Input CSV file')
-    csv2ply_parser.add_argument('--output_ply', help='Output PLY filename (default: input_filename.ply)')
-    csv2ply_parser.add_argument('--color_type', choices=['float', 'uchar'], default='uchar',
-                               help='Color data type to use in PLY file')
+    add_csv_to_ply_arguments(csv2ply_parser)
     
     args = parser.parse_args()
     
     if args.command == 'ply2csv':
-        output_path = convert_pointcloud_to_csv(args.input_ply, args.output_csv)
+        output_path = convert_pointcloud_to_csv(args.input_ply, args.output_csv,
+                                                chunk_size=args.chunk_size, max_memory=get_max_memory(args))
         print(f"Conversion complete: {output_path}")
     
     elif args.command == 'csv2ply':
-        output_path = convert_csv_to_pointcloud(args.input_csv, args.output_ply, args.color_type)
-        print(f"Conversion complete: {output_path}")
+        run_csv_to_ply(args)
     
     else:
         parser.print_help()
 
 
+def main_csv_to_ply():
+    """Entry point for the csv-to-pointcloud script"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Convert CSV to point cloud PLY')
+    add_csv_to_ply_arguments(parser)
+    run_csv_to_ply(parser.parse_args())
+
+
+def add_streaming_arguments(parser):
+    """Add the --chunk-size and --max-memory options to an argument parser"""
+    parser.add_argument('--chunk-size', type=int, default=None,
+                        help='Stream the conversion, processing this many points at a time')
+    parser.add_argument('--max-memory', type=float, default=None,
+                        help='Stream the conversion within this memory budget in megabytes')
+
+
+def add_csv_to_ply_arguments(parser):
+    """Add the arguments of the CSV to point cloud conversion to an argument parser"""
+    parser.add_argument('input_csv', help='Input CSV file')
+    parser.add_argument('--output_ply', help='Output PLY filename (default: input_filename.ply)')
+    parser.add_argument('--color_type', choices=['float', 'uchar'], default='uchar',
+                        help='Color data type to use in PLY file')
+    add_streaming_arguments(parser)
+
+
+def get_max_memory(args):
+    """Convert the --max-memory option from megabytes to bytes"""
+    return int(args.max_memory * 1024 * 1024) if args.max_memory else None
+
+
+def run_csv_to_ply(args):
+    """Run the CSV to point cloud conversion for parsed command-line arguments"""
+    output_path = convert_csv_to_pointcloud(args.input_csv, args.output_ply, args.color_type,
+                                            chunk_size=args.chunk_size, max_memory=get_max_memory(args))
+    print(f"Conversion complete: {output_path}")
+
+
 if __name__ == "__main__":
     main()
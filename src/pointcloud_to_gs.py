@@ -1,25 +1,51 @@
-import struct
 import os
 import numpy as np
 from . import color_utils
+from .file_utils import (read_ply_vertices, get_vertex_offset, vertices_to_array,
+                         write_ply_vertices, generate_ply_header, get_pointcloud_arrays, clone_file,
+                         patch_ply_vertices, set_vertex_columns, set_header_vertex_count)
+from .gaussian_cloud import GaussianCloud
+from .nearest_neighbors import find_nearest_indices
 
 
-def convert_pointcloud_to_3dgs(pointcloud_ply, original_3dgs_ply, output_ply=None, metadata_file=None):
+def convert_pointcloud_to_3dgs(pointcloud_ply, original_3dgs_ply, output_ply=None, metadata_file=None,
+                               memory_map=False, in_place=True, match="index"):
     """
     Convert a point cloud PLY file back to 3D Gaussian Splatting format,
     using an original 3DGS file as a reference for structure and metadata.
     
     Args:
         pointcloud_ply (str): Path to the input point cloud PLY file
-        original_3dgs_ply (str): Path to the original 3D Gaussian Splatting PLY file
+        original_3dgs_ply (str or GaussianCloud): Path to the original 3D Gaussian Splatting PLY file,
+                                                  or an in-memory cloud
         output_ply (str, optional): Path to the output 3DGS PLY file.
-                                    If not specified, it's automatically generated from the input filename
+                                    If not specified, it's automatically generated from the input filename,
+                                    unless original_3dgs_ply is a GaussianCloud
         metadata_file (str, optional): Path to the metadata file saved during conversion.
                                        If not provided, uses original_3dgs_ply directly
+        memory_map (bool, optional): Memory-map the original 3DGS vertex block instead of reading
+                                     the whole file into RAM. Default is False.
+        in_place (bool, optional): Copy the original file (as a reflink where the filesystem supports it)
+                                   and overwrite only the position and color columns of the memory-mapped
+                                   copy, instead of decoding and rewriting every property. Used when the
+                                   original is a complete binary PLY file. Default is True.
+        match (str, optional): How edited points are associated with original gaussians:
+                               - "index": point i updates gaussian i; a shorter cloud is padded with
+                                 its last point and a longer one is truncated (default)
+                               - "nearest": each point updates the gaussian closest to it, so
+                                 deleted gaussians are dropped and reordered points keep their
+                                 properties. The output has one gaussian per point
         
     Returns:
-        str: Path of the generated PLY file
+        str or GaussianCloud: Path of the generated PLY file, or the updated cloud if original_3dgs_ply
+                              is a GaussianCloud and output_ply is not specified
     """
+    if match not in ("index", "nearest"):
+        raise ValueError(f"Unknown match mode '{match}', expected 'index' or 'nearest'")
+    
+    # An in-memory reference without an output path produces an in-memory result
+    return_cloud = output_ply is None and isinstance(original_3dgs_ply, GaussianCloud)
+    
     # Automatically generate output filename
     if output_ply is None:
         base_name = os.path.splitext(pointcloud_ply)[0]
@@ -32,42 +58,60 @@ def convert_pointcloud_to_3dgs(pointcloud_ply, original_3dgs_ply, output_ply=Non
     except Exception as e:
         raise ValueError(f"Failed to read point cloud data: {e}")
     
-    # Read the original 3DGS file structure
+    # Read the original 3DGS file structure and decode its vertex block in one pass
     try:
-        with open(original_3dgs_ply, "rb") as f:
-            original_content = f.read()
-        
-        # Find the end of header position
-        header_end = original_content.find(b'end_header\n')
-        if header_end == -1:
-            raise ValueError("Invalid PLY file format: end_header not found")
-        header_end += len(b'end_header\n')
-        original_header = original_content[:header_end].decode("ascii")
+        original_vertices, original_header_info = read_ply_vertices(original_3dgs_ply, allow_truncated=True,
+                                                                     memory_map=memory_map or in_place)
+        header_end = original_header_info['header_size']
+        if isinstance(original_3dgs_ply, GaussianCloud) or original_header_info.get('compressed'):
+            # In-memory and decoded compressed sources are written as standard float properties
+            types = [(name, original_header_info['property_types'][name]) for name in original_header_info['properties']]
+            original_header = generate_ply_header(types, original_header_info['vertex_count'],
+                                                  "binary_little_endian 1.0") + "\nend_header\n"
+            footer_section = b''
+            in_place = False
+        else:
+            with open(original_3dgs_ply, "rb") as f:
+                original_header = f.read(header_end).decode("ascii")
+                # Keep whatever follows a complete binary vertex block as the footer section
+                footer_section = b''
+                if (original_header_info['format'] != "ascii"
+                        and len(original_vertices) == original_header_info['vertex_count']):
+                    f.seek(get_vertex_offset(original_header_info) + original_vertices.nbytes)
+                    footer_section = f.read()
+                else:
+                    # ASCII and truncated files have to be rewritten
+                    in_place = False
     except Exception as e:
         raise ValueError(f"Failed to read original 3DGS file: {e}")
     
-    # Parse original header
-    lines = original_header.splitlines()
-    vertex_count = 0
-    properties = []
-    property_types = {}
-    
-    for line in lines:
-        if line.startswith("element vertex"):
-            vertex_count = int(line.split()[-1])
-        elif line.startswith("property"):
-            parts = line.split()
-            if len(parts) < 3:
-                continue
-            prop_type = parts[1]
-            prop_name = parts[2]
-            properties.append(prop_name)
-            property_types[prop_name] = prop_type
+    vertex_count = original_header_info['vertex_count']
+    properties = original_header_info['properties']
+    property_types = original_header_info['property_types']
     
     print(f"Original file has {vertex_count} vertices with {len(properties)} properties")
     
-    # Check if the point counts match
-    if len(points) != vertex_count:
+    # Find position property indices in original 3DGS data
+    try:
+        x_idx = properties.index('x')
+        y_idx = properties.index('y')
+        z_idx = properties.index('z')
+    except ValueError as e:
+        raise ValueError(f"Missing position property in original file: {e}")
+    
+    source_indices = None
+    if match == "nearest":
+        # Look up the original gaussian of every edited point
+        if len(original_vertices) == 0:
+            raise ValueError("Original 3DGS file has no vertices to match points against")
+        original_points = vertices_to_array(original_vertices, [properties[x_idx], properties[y_idx], properties[z_idx]],
+                                            dtype=np.float64)
+        source_indices, distances = find_nearest_indices(original_points, points)
+        dropped = len(original_vertices) - len(np.unique(source_indices))
+        print(f"Matched {len(points)} points to original gaussians "
+              f"({np.count_nonzero(distances == 0)} exact, max distance {distances.max(initial=0.0):g}), "
+              f"{dropped} gaussians dropped")
+    elif len(points) != vertex_count:
         print(f"WARNING: Point count mismatch - Original: {vertex_count}, Point cloud: {len(points)}")
         # Adjust either the point cloud or the expected vertex count to match
         if len(points) < vertex_count:
@@ -84,34 +128,6 @@ def convert_pointcloud_to_3dgs(pointcloud_ply, original_3dgs_ply, output_ply=Non
             colors = colors[:vertex_count]
             print(f"Truncated point cloud to {vertex_count} points")
     
-    num_floats = len(properties)
-    expected_data_size = vertex_count * num_floats * 4  # assuming float32 = 4 bytes
-    
-    # Extract the data section from the original file
-    data_start = header_end
-    data_end = data_start + expected_data_size
-    
-    # Safety check for data size
-    if data_end > len(original_content):
-        print(f"WARNING: Expected data size ({expected_data_size} bytes) exceeds file size")
-        data_end = len(original_content)
-    
-    original_data_section = original_content[data_start:data_end]
-    
-    # Extract the footer section from the original file
-    if data_end < len(original_content):
-        footer_section = original_content[data_end:]
-    else:
-        footer_section = b''
-    
-    # Find position property indices in original 3DGS data
-    try:
-        x_idx = properties.index('x')
-        y_idx = properties.index('y')
-        z_idx = properties.index('z')
-    except ValueError as e:
-        raise ValueError(f"Missing position property in original file: {e}")
-    
     # Find color information in the original file using color_utils
     r_idx, g_idx, b_idx, is_sh_color = color_utils.detect_color_properties(properties)
     original_color_type = "unknown"
@@ -122,78 +138,70 @@ def convert_pointcloud_to_3dgs(pointcloud_ply, original_3dgs_ply, output_ply=Non
     else:
         print("WARNING: Color properties not found in original file, color information will be skipped")
     
-    # Read the original data as floats
-    original_data = []
-    total_values = len(original_data_section) // 4  # Each float is 4 bytes
-    expected_values = vertex_count * num_floats
-    
-    if total_values != expected_values:
-        print(f"WARNING: Data size mismatch - Expected {expected_values} values, got {total_values}")
-    
-    # Safely unpack the values
-    try:
-        for i in range(min(vertex_count, total_values // num_floats)):
-            start = i * num_floats * 4
-            end = start + num_floats * 4
-            if end <= len(original_data_section):
-                values = list(struct.unpack("<" + "f" * num_floats, original_data_section[start:end]))
-                original_data.append(values)
-            else:
-                # If data is truncated, pad with zeros
-                values = [0.0] * num_floats
-                original_data.append(values)
-                print(f"WARNING: Data truncated at vertex {i}")
-    except Exception as e:
-        raise ValueError(f"Error unpacking original data: {e}")
-    
-    # If we have fewer data points than expected, pad with zeros
-    while len(original_data) < vertex_count:
-        original_data.append([0.0] * num_floats)
+    # New values of the updated columns; all other properties are kept as they are
+    updates = {
+        properties[x_idx]: points[:, 0],
+        properties[y_idx]: points[:, 1],
+        properties[z_idx]: points[:, 2],
+    }
     
-    # Extract original colors for reference if color properties exist
-    original_colors = []
     if r_idx is not None and g_idx is not None and b_idx is not None:
-        for i in range(len(original_data)):
-            original_colors.append([
-                original_data[i][r_idx],
-                original_data[i][g_idx],
-                original_data[i][b_idx]
-            ])
-    
+        color_props = [properties[r_idx], properties[g_idx], properties[b_idx]]
+        original_colors = vertices_to_array(original_vertices, color_props, dtype=np.float64)
+        if len(original_colors) < vertex_count:
+            # Vertices missing from a truncated file count as zeros
+            original_colors = np.vstack([original_colors, np.zeros((1, 3))])
+        
         # Get color value ranges and debug info
         orig_min, orig_max, is_signed = color_utils.get_color_value_range(original_colors)
         print(f"Color value range: {orig_min} to {orig_max}, signed: {is_signed}")
     
+    if source_indices is not None:
+        # Keep only the matched gaussians, in point cloud order
+        original_vertices = original_vertices[source_indices]
+        vertex_count = len(original_vertices)
+        original_header = set_header_vertex_count(original_header, vertex_count)
+        in_place = False
+    
     # Debug color information from point cloud
     if len(colors) > 0:
         color_utils.print_color_debug_info(colors, pointcloud_color_type, False)
     
-    # Update position and color information in the original data
-    for i in range(min(len(original_data), len(points))):
-        # Update position
-        original_data[i][x_idx] = points[i][0]
-        original_data[i][y_idx] = points[i][1]
-        original_data[i][z_idx] = points[i][2]
+    if r_idx is not None and g_idx is not None and b_idx is not None and vertex_count > 0:
+        # Convert all colors at once, detecting the 0-255 range per color as before
+        converted_colors = color_utils.convert_colors_between_formats(
+            colors,
+            pointcloud_color_type,
+            original_color_type,
+            is_sh_source=False,
+            is_sh_target=is_sh_color,
+            orig_min=orig_min,
+            orig_max=orig_max,
+            per_row=True
+        )
+        for i, name in enumerate(color_props):
+            updates[name] = converted_colors[:, i]
+    
+    if in_place and not return_cloud:
+        # Copy the original file and overwrite only the updated columns of the copy
+        try:
+            if not (os.path.exists(output_ply) and os.path.samefile(original_3dgs_ply, output_ply)):
+                clone_file(original_3dgs_ply, output_ply)
+            patch_ply_vertices(output_ply, original_header_info, updates)
+            print(f"Successfully updated {len(updates)} properties of {vertex_count} vertices in place")
+        except Exception as e:
+            raise ValueError(f"Failed to write output file: {e}")
         
-        # Update color if applicable
-        if r_idx is not None and g_idx is not None and b_idx is not None and len(colors) > i:
-            try:
-                # Convert colors using the utility function
-                converted_colors = color_utils.convert_colors_between_formats(
-                    np.array([colors[i]]),
-                    pointcloud_color_type,
-                    original_color_type,
-                    is_sh_source=False,
-                    is_sh_target=is_sh_color,
-                    orig_min=orig_min,
-                    orig_max=orig_max
-                )[0]
-                
-                original_data[i][r_idx] = converted_colors[0]
-                original_data[i][g_idx] = converted_colors[1]
-                original_data[i][b_idx] = converted_colors[2]
-            except Exception as e:
-                print(f"WARNING: Error updating color for vertex {i}: {e}")
+        return output_ply
+    
+    # Copy the decoded vertices, padding missing vertices with zeros, and cast the updated columns
+    output_vertices = np.zeros(vertex_count, dtype=original_vertices.dtype)
+    output_vertices[:len(original_vertices)] = original_vertices
+    set_vertex_columns(output_vertices, updates)
+    
+    if return_cloud:
+        print(f"Successfully updated {len(output_vertices)} vertices")
+        return GaussianCloud.from_vertices(output_vertices, property_types, original_3dgs_ply.filename)
     
     # Write the updated 3DGS file
     try:
@@ -201,14 +209,13 @@ def convert_pointcloud_to_3dgs(pointcloud_ply, original_3dgs_ply, output_ply=Non
             # Write header
             f.write(original_header.encode("ascii"))
             
-            # Write binary data
-            for values in original_data:
-                f.write(struct.pack("<" + "f" * num_floats, *values))
+            # Write vertex data with each property's original type and encoding
+            write_ply_vertices(f, output_vertices, original_header_info)
             
             # Write footer
             f.write(footer_section)
         
-        print(f"Successfully wrote {len(original_data)} vertices to output file")
+        print(f"Successfully wrote {len(output_vertices)} vertices to output file")
     except Exception as e:
         raise ValueError(f"Failed to write output file: {e}")
     
@@ -219,104 +226,41 @@ def read_pointcloud_ply_with_type(filename):
     """
     Read position and color information from a point cloud PLY file, including color type info.
     
+    The vertex block is decoded with its typed structured dtype, so any byte order, mixed
+    float/uchar layouts and extra properties such as normals or scalar fields are supported.
+    
     Args:
         filename (str): Path to the PLY file
         
     Returns:
         tuple: (points, colors, color_type) where:
-            - points is a numpy array of (x,y,z) coordinates
-            - colors is a numpy array of (r,g,b) values
+            - points is a float32 numpy array of (x,y,z) coordinates
+            - colors is a numpy array of (r,g,b) values (uint8 for uchar colors, float32 otherwise)
             - color_type is a string indicating the color data type ("float" or "uchar")
     """
-    with open(filename, "rb") as f:
-        content = f.read()
-    
-    # Find the end of header position
-    header_end = content.find(b'end_header\n') + len(b'end_header\n')
-    header = content[:header_end].decode("ascii")
-    
-    # Parse header
-    lines = header.splitlines()
-    vertex_count = 0
-    properties = []
-    formats = {}
+    vertices, header = read_ply_vertices(filename, memory_map=True)
+    properties = header['properties']
     color_type = "uchar"  # Default
     
-    for line in lines:
-        if line.startswith("element vertex"):
-            vertex_count = int(line.split()[-1])
-        elif line.startswith("property"):
-            parts = line.split()
-            if len(parts) < 3:
-                continue
-            prop_type = parts[1]  # float, uchar, etc.
-            prop_name = parts[2]
-            properties.append(prop_name)
-            formats[prop_name] = prop_type
-            
-            # Detect color type
-            if prop_name in ["red", "green", "blue", "r", "g", "b"]:
-                color_type = prop_type
-    
-    print(f"Pointcloud has {vertex_count} vertices, color type: {color_type}")
-    
-    # Determine the format of each vertex
-    format_str = "<"  # little endian
-    size_sum = 0
-    
-    for prop in properties:
-        if formats[prop] == "float":
-            format_str += "f"
-            size_sum += 4
-        elif formats[prop] == "uchar":
-            format_str += "B"
-            size_sum += 1
-        elif formats[prop] == "double":
-            format_str += "d"
-            size_sum += 8
-        elif formats[prop] == "int":
-            format_str += "i"
-            size_sum += 4
-        elif formats[prop] == "short":
-            format_str += "h"
-            size_sum += 2
-        elif formats[prop] == "uint":
-            format_str += "I"
-            size_sum += 4
-    
-    # Extract the data section
-    data_section = content[header_end:]
+    for prop_name in properties:
+        # Detect color type
+        if prop_name in ["red", "green", "blue", "r", "g", "b"]:
+            color_type = header['property_types'][prop_name]
+    
+    print(f"Pointcloud has {header['vertex_count']} vertices, color type: {color_type}")
     
     # Let color_utils handle the color property detection
     r_idx, g_idx, b_idx, _ = color_utils.detect_color_properties(properties)
     
-    # Find the indices of position properties
-    try:
-        x_idx = properties.index('x')
-        y_idx = properties.index('y')
-        z_idx = properties.index('z')
-    except ValueError as e:
-        raise ValueError(f"Missing position property: {e}")
-    
-    # Read the binary data
-    points = []
-    colors = []
+    if not all(name in properties for name in ('x', 'y', 'z')):
+        raise ValueError(f"Missing position property: {[name for name in ('x', 'y', 'z') if name not in properties]}")
     
-    for i in range(vertex_count):
-        start = i * size_sum
-        end = start + size_sum
-        values = struct.unpack(format_str, data_section[start:end])
-        
-        # Extract position
-        points.append([values[x_idx], values[y_idx], values[z_idx]])
-        
-        # Extract color if available
-        if r_idx is not None and g_idx is not None and b_idx is not None:
-            colors.append([values[r_idx], values[g_idx], values[b_idx]])
-        else:
-            colors.append([255, 255, 255])  # Default to white if no color
+    color_properties = None
+    if r_idx is not None and g_idx is not None and b_idx is not None:
+        color_properties = [properties[r_idx], properties[g_idx], properties[b_idx]]
     
-    return np.array(points), np.array(colors), color_type
+    points, colors = get_pointcloud_arrays(vertices, ['x', 'y', 'z'], color_properties)
+    return points, colors, color_type
 
 
 def main():
@@ -328,6 +272,13 @@ def main():
     parser.add_argument('original_3dgs', help='Original 3D Gaussian Splatting file to use as reference')
     parser.add_argument('--output_ply', help='Output 3DGS PLY filename (default: input_filename_3dgs.ply)')
     parser.add_argument('--metadata', help='Metadata file saved during original conversion (optional)')
+    parser.add_argument('--memory-map', action='store_true',
+                        help='Memory-map the original 3DGS file instead of loading it into RAM')
+    parser.add_argument('--no-in-place', action='store_true',
+                        help='Rewrite every property instead of patching a copy of the original file')
+    parser.add_argument('--match', choices=['index', 'nearest'], default='index',
+                        help='Associate points with original gaussians by index (default) or by nearest '
+                             'position, which handles deleted and reordered points')
     
     args = parser.parse_args()
     
@@ -335,7 +286,10 @@ def main():
         args.pointcloud_ply,
         args.original_3dgs,
         args.output_ply,
-        args.metadata
+        args.metadata,
+        memory_map=args.memory_map,
+        in_place=not args.no_in_place,
+        match=args.match
     )
     
     print(f"Conversion complete: {output_path}")
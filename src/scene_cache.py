@@ -0,0 +1,299 @@
+"""
+3D Gaussian Splatting Scene Cache Module
+
+This module keeps decoded 3DGS files in an on-disk cache in the columnar format
+(one .npy file per property plus a manifest). Entries are keyed by the source path,
+size, modification time and a hash of its header, so an edited file is never served
+from a stale entry. The cache is size-bounded and evicts the least recently used
+entries first.
+
+The cache is opt-in: it is used when the GS_EDIT_CACHE_DIR environment variable is set
+or when a function is called with cache=True, and can be disabled per call with
+cache=False (--no-cache on the command line).
+"""
+
+import os
+import shutil
+import hashlib
+import numpy as np
+
+from .file_utils import parse_ply_header, is_compressed_ply_header, read_ply_vertices
+from .gs_to_columns import convert_3dgs_to_columns, load_columns, COLUMNS_MANIFEST
+from .gaussian_cloud import GaussianCloud
+
+# Environment variables that enable the cache and bound its size (in MB)
+CACHE_DIR_ENV = "GS_EDIT_CACHE_DIR"
+CACHE_SIZE_ENV = "GS_EDIT_CACHE_SIZE"
+
+# Default cache location when the cache is enabled without a directory
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "3dgs-edit-tools")
+
+# Default maximum total size of the cache in bytes
+DEFAULT_CACHE_SIZE = 10 * 1024 ** 3
+
+
+def is_cache_enabled(cache=None, source=None):
+    """
+    Decide whether the cache should be used
+
+    Args:
+        cache (bool, optional): True or False to force the cache on or off.
+                                None uses the cache if GS_EDIT_CACHE_DIR is set
+        source (str or GaussianCloud, optional): Input to be loaded. In-memory clouds are never cached
+
+    Returns:
+        bool: True if the cache should be used
+    """
+    if isinstance(source, GaussianCloud):
+        return False
+    if cache is None:
+        return bool(os.environ.get(CACHE_DIR_ENV))
+    return bool(cache)
+
+
+def get_cache_dir(cache_dir=None):
+    """
+    Get the cache directory
+
+    Args:
+        cache_dir (str, optional): Explicit cache directory
+
+    Returns:
+        str: cache_dir, GS_EDIT_CACHE_DIR, or the default location
+    """
+    return cache_dir or os.environ.get(CACHE_DIR_ENV) or DEFAULT_CACHE_DIR
+
+
+def get_cache_size(max_size=None):
+    """
+    Get the maximum total size of the cache
+
+    Args:
+        max_size (int, optional): Explicit size bound in bytes
+
+    Returns:
+        int: max_size, GS_EDIT_CACHE_SIZE (in MB), or the default size
+    """
+    if max_size is not None:
+        return max_size
+    if os.environ.get(CACHE_SIZE_ENV):
+        return int(float(os.environ[CACHE_SIZE_ENV]) * 1024 * 1024)
+    return DEFAULT_CACHE_SIZE
+
+
+def get_cache_key(ply_filename):
+    """
+    Compute the cache key of a PLY file from its path, size, mtime and header
+
+    Args:
+        ply_filename (str): Path to the PLY file
+
+    Returns:
+        str: Hex digest identifying the current contents of the file
+    """
+    stat = os.stat(ply_filename)
+    with open(ply_filename, "rb") as f:
+        header = parse_ply_header(f)
+        f.seek(0)
+        header_bytes = f.read(header['header_size'])
+
+    digest = hashlib.sha1()
+    digest.update(os.path.abspath(ply_filename).encode("utf-8"))
+    digest.update(f"\0{stat.st_size}\0{stat.st_mtime_ns}\0".encode("ascii"))
+    digest.update(header_bytes)
+    return digest.hexdigest()
+
+
+def get_cached_columns_dir(ply_filename, cache_dir=None, max_size=None):
+    """
+    Get the columns directory of a PLY file from the cache, decoding the file on a miss
+
+    Args:
+        ply_filename (str): Path to the PLY file
+        cache_dir (str, optional): Cache directory. Defaults to get_cache_dir()
+        max_size (int, optional): Maximum total cache size in bytes. Defaults to get_cache_size()
+
+    Returns:
+        str: Path of the cached columns directory
+    """
+    cache_dir = get_cache_dir(cache_dir)
+    key = get_cache_key(ply_filename)
+    entry_dir = os.path.join(cache_dir, key)
+    manifest_path = os.path.join(entry_dir, COLUMNS_MANIFEST)
+
+    if os.path.exists(manifest_path):
+        # Record the access for least-recently-used eviction
+        os.utime(manifest_path)
+        print(f"Using cached columns for {ply_filename}")
+        return entry_dir
+
+    # Decode into a private directory and move it into place, so readers never see a partial entry
+    os.makedirs(cache_dir, exist_ok=True)
+    temp_dir = f"{entry_dir}.tmp-{os.getpid()}"
+    try:
+        convert_3dgs_to_columns(ply_filename, temp_dir)
+        try:
+            os.replace(temp_dir, entry_dir)
+        except OSError:
+            # Another process stored the same entry first
+            if not os.path.exists(manifest_path):
+                raise
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    evict_cache(cache_dir, get_cache_size(max_size), keep=key)
+    return entry_dir
+
+
+def load_cached_columns(ply_filename, properties=None, cache_dir=None, max_size=None, mmap_mode='r'):
+    """
+    Load the property arrays of a PLY file through the cache
+
+    Args:
+        ply_filename (str): Path to the PLY file
+        properties (list, optional): Property names to load. Defaults to all properties
+        cache_dir (str, optional): Cache directory. Defaults to get_cache_dir()
+        max_size (int, optional): Maximum total cache size in bytes. Defaults to get_cache_size()
+        mmap_mode (str, optional): Memory-map mode passed to load_columns. Default is 'r'.
+
+    Returns:
+        tuple: (columns, manifest) - Mapping from property name to array, and the manifest
+    """
+    entry_dir = get_cached_columns_dir(ply_filename, cache_dir, max_size)
+    return load_columns(entry_dir, properties, mmap_mode)
+
+
+def read_cached_vertices(ply_filename, cache_dir=None, max_size=None):
+    """
+    Read the vertex block of a PLY file through the cache
+
+    Uncompressed binary little-endian files are memory-mapped directly instead, since
+    that is faster than rebuilding their vertices from the cached columns.
+
+    Args:
+        ply_filename (str): Path to the PLY file
+        cache_dir (str, optional): Cache directory. Defaults to get_cache_dir()
+        max_size (int, optional): Maximum total cache size in bytes. Defaults to get_cache_size()
+
+    Returns:
+        tuple: (vertices, header) - Structured vertex array and header information,
+               as returned by read_ply_vertices
+    """
+    with open(ply_filename, "rb") as f:
+        header = parse_ply_header(f)
+    if header['format'] == 'binary_little_endian' and not is_compressed_ply_header(header):
+        return read_ply_vertices(ply_filename, memory_map=True)
+
+    columns, manifest = load_cached_columns(ply_filename, cache_dir=cache_dir, max_size=max_size)
+    header = get_cached_header(ply_filename, manifest)
+
+    vertices = np.empty(header['vertex_count'], dtype=[(name, values.dtype) for name, values in columns.items()])
+    for name, values in columns.items():
+        vertices[name] = values
+    return vertices, header
+
+
+def get_cached_header(ply_filename, manifest):
+    """
+    Describe the cached columns of a PLY file as header information
+
+    The properties are those of the cache entry, i.e. the decoded 3DGS properties
+    for compressed files rather than their packed_* properties.
+
+    Args:
+        ply_filename (str): Path to the PLY file
+        manifest (dict): Manifest of the file's cache entry
+
+    Returns:
+        dict: Header information with the entry's 'vertex_count', 'properties' and
+              'property_types', as returned by read_ply_vertices
+    """
+    with open(ply_filename, "rb") as f:
+        header = parse_ply_header(f)
+    compressed = is_compressed_ply_header(header)
+
+    properties = [prop['name'] for prop in manifest['properties']]
+    property_types = {prop['name']: prop['type'] for prop in manifest['properties']}
+    header.update({
+        'vertex_count': manifest['vertex_count'],
+        'properties': properties,
+        'property_types': property_types,
+    })
+    if compressed:
+        # Match the header of a decoded compressed file, which has a single vertex element
+        header.update({
+            'format': 'binary_little_endian',
+            'elements': [{'name': 'vertex', 'count': manifest['vertex_count'],
+                          'properties': [(name, property_types[name]) for name in properties]}],
+            'compressed': True,
+        })
+    return header
+
+
+def get_directory_size(path):
+    """
+    Get the total size of the files in a directory
+
+    Args:
+        path (str): Directory path
+
+    Returns:
+        int: Size in bytes
+    """
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def evict_cache(cache_dir=None, max_size=None, keep=None):
+    """
+    Remove least recently used entries until the cache fits in max_size
+
+    Args:
+        cache_dir (str, optional): Cache directory. Defaults to get_cache_dir()
+        max_size (int, optional): Maximum total cache size in bytes. Defaults to get_cache_size()
+        keep (str, optional): Key of an entry that must not be evicted
+
+    Returns:
+        int: Number of entries removed
+    """
+    cache_dir = get_cache_dir(cache_dir)
+    max_size = get_cache_size(max_size)
+    if not os.path.isdir(cache_dir):
+        return 0
+
+    entries = []
+    for key in os.listdir(cache_dir):
+        manifest_path = os.path.join(cache_dir, key, COLUMNS_MANIFEST)
+        if os.path.exists(manifest_path):
+            entries.append((os.path.getmtime(manifest_path), key, get_directory_size(os.path.join(cache_dir, key))))
+
+    total = sum(size for _, _, size in entries)
+    removed = 0
+    for _, key, size in sorted(entries):
+        if total <= max_size:
+            break
+        if key == keep:
+            continue
+        shutil.rmtree(os.path.join(cache_dir, key), ignore_errors=True)
+        total -= size
+        removed += 1
+
+    return removed
+
+
+def clear_cache(cache_dir=None):
+    """
+    Remove all entries from the cache
+
+    Args:
+        cache_dir (str, optional): Cache directory. Defaults to get_cache_dir()
+    """
+    cache_dir = get_cache_dir(cache_dir)
+    if os.path.isdir(cache_dir):
+        shutil.rmtree(cache_dir)
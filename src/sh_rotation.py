@@ -0,0 +1,197 @@
+"""
+Spherical Harmonics Rotation Module
+
+This module rotates the view-dependent color of 3DGS gaussians, stored as the higher-order
+spherical harmonics (SH) coefficients f_rest_*. Rotating a scene by R turns the color seen
+from direction d into the color previously seen from R^T d. Each SH band l mixes only its
+own 2l+1 coefficients under rotation, so the rotation is one small matrix per band. The
+band matrices are built once per rotation, and the coefficients of all gaussians and color
+channels are then rotated with one batched matrix product.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from .color_utils import get_sh_rest_names, get_sh_layout_degree
+from .file_utils import columns_to_array, get_column_names
+
+# Highest SH degree used by 3DGS files
+MAX_SH_DEGREE = 3
+
+# SH basis constants of the 3DGS renderer, for bands 1 to 3
+SH_C1 = 0.4886025119029199
+SH_C2 = (1.0925484305920792, -1.0925484305920792, 0.31539156525252005, -1.0925484305920792,
+         0.5462742152960396)
+SH_C3 = (-0.5900435899266435, 2.890611442640554, -0.4570457994644658, 0.3731763325901154,
+         -0.4570457994644658, 1.445305721320277, -0.5900435899266435)
+
+# Number of directions the SH basis is evaluated at when fitting the band matrices
+SH_FIT_DIRECTIONS = 64
+
+
+def evaluate_sh_basis(directions, degree=MAX_SH_DEGREE):
+    """
+    Evaluate the higher-order SH basis functions of the 3DGS renderer
+
+    Args:
+        directions (numpy.ndarray): Unit vectors of shape (M, 3)
+        degree (int, optional): Highest SH band, 1 to 3
+
+    Returns:
+        numpy.ndarray: Array of shape (M, (degree+1)^2 - 1) in f_rest_* coefficient order
+    """
+    x, y, z = np.asarray(directions, dtype=np.float64).T
+    xx, yy, zz = x * x, y * y, z * z
+
+    bands = [
+        [-SH_C1 * y, SH_C1 * z, -SH_C1 * x],
+        [SH_C2[0] * x * y,
+         SH_C2[1] * y * z,
+         SH_C2[2] * (2 * zz - xx - yy),
+         SH_C2[3] * x * z,
+         SH_C2[4] * (xx - yy)],
+        [SH_C3[0] * y * (3 * xx - yy),
+         SH_C3[1] * x * y * z,
+         SH_C3[2] * y * (4 * zz - xx - yy),
+         SH_C3[3] * z * (2 * zz - 3 * xx - 3 * yy),
+         SH_C3[4] * x * (4 * zz - xx - yy),
+         SH_C3[5] * z * (xx - yy),
+         SH_C3[6] * x * (xx - 3 * yy)],
+    ]
+    return np.stack([value for band in bands[:degree] for value in band], axis=-1)
+
+
+def get_sh_fit_directions(count=SH_FIT_DIRECTIONS):
+    """
+    Get unit vectors spread evenly over the sphere (Fibonacci lattice)
+
+    Args:
+        count (int, optional): Number of directions
+
+    Returns:
+        numpy.ndarray: Array of shape (count, 3)
+    """
+    z = 1 - (2 * np.arange(count) + 1) / count
+    radius = np.sqrt(1 - z * z)
+    angle = np.pi * (3 - np.sqrt(5)) * np.arange(count)
+    return np.column_stack([radius * np.cos(angle), radius * np.sin(angle), z])
+
+
+def get_sh_rotation_matrices(rotation, degree=MAX_SH_DEGREE):
+    """
+    Build the rotation matrix of every SH band
+
+    A rotated band is again a combination of the same band's basis functions, so its matrix
+    is found exactly by fitting the rotated basis against the basis at a set of directions.
+    This uses the renderer's basis as is, including its sign conventions.
+
+    Args:
+        rotation (numpy.ndarray): 3x3 rotation matrix applied to the scene
+        degree (int, optional): Highest SH band, 1 to 3
+
+    Returns:
+        list: One (2l+1)x(2l+1) matrix per band l = 1..degree, mapping the band's coefficients
+              to the rotated coefficients
+    """
+    rotation = np.asarray(rotation, dtype=np.float64)
+    return list(get_cached_sh_rotation_matrices(tuple(rotation.ravel()), int(degree)))
+
+
+@lru_cache(maxsize=16)
+def get_cached_sh_rotation_matrices(rotation, degree):
+    """
+    Build the SH band rotation matrices, reusing them for repeated rotations (e.g. per block)
+
+    Args:
+        rotation (tuple): Row-major values of the 3x3 rotation matrix
+        degree (int): Highest SH band, 1 to 3
+
+    Returns:
+        tuple: Read-only band matrices, as returned by get_sh_rotation_matrices
+    """
+    if not 1 <= degree <= MAX_SH_DEGREE:
+        raise ValueError(f"SH degree must be between 1 and {MAX_SH_DEGREE}, got {degree}")
+    rotation = np.array(rotation).reshape(3, 3)
+    directions = get_sh_fit_directions()
+
+    # The rotated color at d equals the original color at R^T d (row vectors: d @ R)
+    basis = evaluate_sh_basis(directions, degree)
+    rotated_basis = evaluate_sh_basis(directions @ rotation, degree)
+
+    matrices = []
+    for band in range(1, degree + 1):
+        columns = slice(band * band - 1, (band + 1) ** 2 - 1)
+        matrix = np.linalg.lstsq(basis[:, columns], rotated_basis[:, columns], rcond=None)[0]
+        matrix.setflags(write=False)
+        matrices.append(matrix)
+    return tuple(matrices)
+
+
+def get_sh_rotation_matrix(rotation, degree=MAX_SH_DEGREE):
+    """
+    Build the block-diagonal rotation matrix of all higher-order SH coefficients of a channel
+
+    Args:
+        rotation (numpy.ndarray): 3x3 rotation matrix applied to the scene
+        degree (int, optional): Highest SH band, 1 to 3
+
+    Returns:
+        numpy.ndarray: Matrix of shape (K, K) with K = (degree+1)^2 - 1
+    """
+    size = (degree + 1) ** 2 - 1
+    matrix = np.zeros((size, size))
+    for band, band_matrix in enumerate(get_sh_rotation_matrices(rotation, degree), start=1):
+        columns = slice(band * band - 1, (band + 1) ** 2 - 1)
+        matrix[columns, columns] = band_matrix
+    return matrix
+
+
+def rotate_sh_coefficients(coefficients, sh_rotation):
+    """
+    Rotate SH coefficients with a matrix from get_sh_rotation_matrix
+
+    Args:
+        coefficients (numpy.ndarray): Array of shape (..., K), e.g. (N, 3, K) for N gaussians
+                                      with K coefficients per color channel
+        sh_rotation (numpy.ndarray): Matrix of shape (K, K)
+
+    Returns:
+        numpy.ndarray: Rotated coefficients with the same shape
+    """
+    coefficients = np.asarray(coefficients)
+    # One 2D product over all gaussians and channels, which runs as a single BLAS call
+    rotated = coefficients.reshape(-1, coefficients.shape[-1]) @ np.asarray(sh_rotation).T
+    return rotated.reshape(coefficients.shape)
+
+
+def rotate_sh_properties(columns, rotation, sh_rotation=None):
+    """
+    Rotate the f_rest_* properties of a set of gaussians
+
+    The f_rest_* properties hold the coefficients channel by channel: f_rest_{c*K + k} is
+    coefficient k of color channel c.
+
+    Args:
+        columns (numpy.ndarray or dict): Structured vertex array, or mapping of property name to
+                                         array, containing f_dc_* and f_rest_*
+        rotation (numpy.ndarray): 3x3 rotation matrix applied to the scene
+        sh_rotation (numpy.ndarray, optional): Matrix from get_sh_rotation_matrix, built from
+                                               rotation if not given
+
+    Returns:
+        tuple: (names, coefficients) - f_rest_* property names and a float64 array with one
+               rotated column per name, or ([], None) if the properties do not form a complete
+               SH layout of degree 1 or higher
+    """
+    properties = get_column_names(columns)
+    degree = get_sh_layout_degree(properties)
+    if not degree:
+        return [], None
+    if sh_rotation is None:
+        sh_rotation = get_sh_rotation_matrix(rotation, degree)
+
+    names = get_sh_rest_names(properties)
+    coefficients = columns_to_array(columns, names, dtype=np.float64)
+    rotated = rotate_sh_coefficients(coefficients.reshape(len(coefficients), 3, -1), sh_rotation)
+    return names, rotated.reshape(len(coefficients), len(names))
@@ -0,0 +1,248 @@
+"""
+3D Gaussian Splatting Transform Module
+
+This module applies a similarity transformation (uniform scale, rotation and translation)
+to every gaussian of a scene. Positions are transformed, the rotation quaternions (rot_*) are
+pre-multiplied by the rotation, log scales (scale_*) are offset by the log of the scale factor,
+and normals and the view-dependent color (f_rest_*) are rotated. All operations work on whole
+blocks of vertices at once, and files are memory-mapped and written in chunks so scenes larger
+than memory can be transformed.
+"""
+
+import os
+import numpy as np
+
+from .file_utils import (read_ply_vertices, generate_ply_header, vertices_to_array, columns_to_array,
+                         get_column_names, set_vertex_array, PLY_SCALAR_TYPES)
+from .gaussian_cloud import GaussianCloud, get_source_filename
+from .color_utils import get_sh_layout_degree
+from .sh_rotation import get_sh_rotation_matrix, rotate_sh_properties
+from .transform_utils import (create_rotation_matrix, quaternion_to_rotation_matrix, rotation_matrix_to_quaternion,
+                              quaternion_multiply, create_similarity_matrix, decompose_similarity_matrix)
+from .utils import detect_coordinate_properties, detect_quaternion_properties, detect_scale_properties
+
+# Number of vertices transformed and written at a time
+DEFAULT_TRANSFORM_CHUNK_SIZE = 1048576
+
+
+def transform_3dgs(ply_filename, output_ply_filename=None, matrix=None, rotation=None, translation=None,
+                   scale=None, chunk_size=DEFAULT_TRANSFORM_CHUNK_SIZE):
+    """
+    Apply a similarity transformation to a 3D Gaussian Splatting file
+
+    The transformation is given either as a matrix, or as a rotation, translation and uniform
+    scale, which are applied in the order scale, rotation, translation.
+
+    Args:
+        ply_filename (str or GaussianCloud): Path to the input PLY file, or an in-memory cloud
+        output_ply_filename (str, optional): Path to the output PLY file. If not specified,
+                                             it's automatically generated from the input filename,
+                                             unless ply_filename is a GaussianCloud
+        matrix (array_like, optional): 4x4 or 3x4 similarity matrix applied to column vectors
+        rotation (array_like, optional): 3x3 rotation matrix, quaternion (w, x, y, z), or Euler
+                                         angles in degrees (x, y, z), applied in X, Y, Z order
+        translation (array_like, optional): Translation vector (x, y, z)
+        scale (float, optional): Uniform scale factor
+        chunk_size (int, optional): Number of vertices transformed and written at a time
+
+    Returns:
+        str or GaussianCloud: Path of the generated PLY file, or the transformed cloud if
+                              ply_filename is a GaussianCloud and output_ply_filename is not specified
+    """
+    if matrix is not None and (rotation is not None or translation is not None or scale is not None):
+        raise ValueError("Specify either a matrix or rotation/translation/scale, not both")
+    if matrix is None:
+        matrix = create_similarity_matrix(get_rotation_matrix(rotation), translation,
+                                          1.0 if scale is None else scale)
+    scale, rotation, translation = decompose_similarity_matrix(matrix)
+
+    # An in-memory input without an output path produces an in-memory result
+    return_cloud = output_ply_filename is None and isinstance(ply_filename, GaussianCloud)
+
+    if output_ply_filename is None:
+        base_name = os.path.splitext(get_source_filename(ply_filename))[0]
+        output_ply_filename = f"{base_name}_transformed.ply"
+
+    vertices, header = read_ply_vertices(ply_filename, memory_map=True)
+    properties = header['properties']
+    property_types = header['property_types']
+    types = [(name, property_types[name]) for name in properties]
+    dtype = np.dtype([(name, '<' + PLY_SCALAR_TYPES[ply_type]) for name, ply_type in types])
+
+    # The SH rotation is built once and shared by all chunks
+    sh_degree = get_sh_layout_degree(properties)
+    sh_rotation = get_sh_rotation_matrix(rotation, sh_degree) if sh_degree else None
+
+    if return_cloud:
+        transformed = vertices.astype(dtype)
+        transform_vertices(transformed, scale, rotation, translation, sh_rotation)
+        print(f"Successfully transformed {len(transformed)} gaussians")
+        return GaussianCloud.from_vertices(transformed, property_types, output_ply_filename)
+
+    header_text = generate_ply_header(types, len(vertices), "binary_little_endian 1.0") + "\nend_header\n"
+    with open(output_ply_filename, "wb") as f:
+        f.write(header_text.encode("ascii"))
+        for start in range(0, len(vertices), chunk_size):
+            block = vertices[start:start + chunk_size].astype(dtype)
+            transform_vertices(block, scale, rotation, translation, sh_rotation)
+            block.tofile(f)
+
+    print(f"Successfully transformed {len(vertices)} gaussians")
+    return output_ply_filename
+
+
+def get_rotation_matrix(rotation):
+    """
+    Convert a rotation given in any supported form to a 3x3 matrix
+
+    Args:
+        rotation (array_like or None): 3x3 rotation matrix, quaternion (w, x, y, z), or Euler
+                                       angles in degrees (x, y, z)
+
+    Returns:
+        numpy.ndarray or None: 3x3 rotation matrix, or None without rotation
+    """
+    if rotation is None:
+        return None
+
+    rotation = np.asarray(rotation, dtype=np.float64)
+    if rotation.shape == (3, 3):
+        return rotation
+    if rotation.shape == (4,):
+        w, x, y, z = rotation
+        return quaternion_to_rotation_matrix(x, y, z, w)
+    if rotation.shape == (3,):
+        return create_rotation_matrix(*rotation)
+    raise ValueError("Rotation must be a 3x3 matrix, a quaternion (w, x, y, z) or Euler angles (x, y, z)")
+
+
+def transform_vertices(vertices, scale=1.0, rotation=None, translation=None, sh_rotation=None):
+    """
+    Apply a similarity transformation to a structured vertex array in place
+
+    Args:
+        vertices (numpy.ndarray): Structured vertex array with 3DGS properties
+        scale (float, optional): Uniform scale factor
+        rotation (numpy.ndarray, optional): 3x3 rotation matrix
+        translation (array_like, optional): Translation vector
+        sh_rotation (numpy.ndarray, optional): SH rotation matrix from get_sh_rotation_matrix,
+                                               built from rotation if not given
+    """
+    properties = list(vertices.dtype.names)
+    rotation = np.eye(3) if rotation is None else np.asarray(rotation, dtype=np.float64)
+    translation = np.zeros(3) if translation is None else np.asarray(translation, dtype=np.float64)
+
+    # Every group of properties is computed from the original values before any is written
+    updates = []
+
+    position_names = [properties[i] for i in detect_coordinate_properties(properties)]
+    positions = vertices_to_array(vertices, position_names, dtype=np.float64)
+    updates.append((position_names, scale * positions @ rotation.T + translation))
+
+    updates.extend(rotate_orientations(vertices, rotation, sh_rotation))
+
+    scale_indices = detect_scale_properties(properties)
+    if scale_indices is not None and scale != 1.0:
+        # Scales are stored as logarithms
+        scale_names = [properties[i] for i in scale_indices]
+        updates.append((scale_names, vertices_to_array(vertices, scale_names, dtype=np.float64) + np.log(scale)))
+
+    for names, values in updates:
+        set_vertex_array(vertices, names, values)
+
+
+def rotate_orientations(columns, rotation, sh_rotation=None):
+    """
+    Rotate the direction-dependent properties of gaussians: normals, rotation quaternions and
+    higher-order SH coefficients
+
+    Args:
+        columns (numpy.ndarray or dict): Structured vertex array, or mapping of property name to array
+        rotation (numpy.ndarray): 3x3 rotation matrix
+        sh_rotation (numpy.ndarray, optional): SH rotation matrix from get_sh_rotation_matrix,
+                                               built from rotation if not given
+
+    Returns:
+        list: (names, values) pairs of property names and a float64 array with one rotated
+              column per name (empty without a rotation)
+    """
+    rotation = np.asarray(rotation, dtype=np.float64)
+    if np.array_equal(rotation, np.eye(3)):
+        return []
+
+    properties = get_column_names(columns)
+    updates = []
+
+    if all(name in properties for name in ('nx', 'ny', 'nz')):
+        normals = columns_to_array(columns, ['nx', 'ny', 'nz'], dtype=np.float64)
+        updates.append((['nx', 'ny', 'nz'], normals @ rotation.T))
+
+    quat_indices = detect_quaternion_properties(properties)
+    if quat_indices is not None:
+        # rot_0..rot_3 hold (w, x, y, z); the gaussian's rotation is applied before the scene rotation
+        quat_names = [properties[i] for i in quat_indices]
+        quaternions = columns_to_array(columns, quat_names, dtype=np.float64)
+        qx, qy, qz, qw = rotation_matrix_to_quaternion(rotation)
+        updates.append((quat_names, quaternion_multiply([qw, qx, qy, qz], quaternions)))
+
+    sh_names, coefficients = rotate_sh_properties(columns, rotation, sh_rotation)
+    if sh_names:
+        updates.append((sh_names, coefficients))
+    return updates
+
+
+def parse_matrix(values):
+    """
+    Parse a transformation matrix from 12 or 16 row-major numbers or a text/.npy file
+
+    Args:
+        values (list): Numbers as strings, or a single path to a file with the matrix
+
+    Returns:
+        numpy.ndarray: 3x4 or 4x4 matrix
+    """
+    if len(values) == 1:
+        matrix = np.load(values[0]) if values[0].endswith('.npy') else np.loadtxt(values[0], delimiter=None)
+    else:
+        matrix = np.array([float(value.strip(',')) for value in values])
+    if matrix.size not in (12, 16):
+        raise ValueError(f"Matrix must have 12 or 16 values, got {matrix.size}")
+    return matrix.reshape(-1, 4)
+
+
+def main():
+    """Entry point for command-line execution"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Apply a similarity transformation to a 3D Gaussian Splatting file')
+    parser.add_argument('input_ply', help='Input PLY file')
+    parser.add_argument('--output_ply', help='Output PLY filename (default: input_filename_transformed.ply)')
+    parser.add_argument('--matrix', nargs='+', metavar='VALUE',
+                        help='4x4 (or 3x4) matrix as 16 (or 12) row-major numbers, or a text or .npy file')
+    parser.add_argument('--rotate', type=float, nargs=3, metavar=('RX', 'RY', 'RZ'),
+                        help='Rotation in degrees around the X, Y and Z axes (applied in that order)')
+    parser.add_argument('--quaternion', type=float, nargs=4, metavar=('W', 'X', 'Y', 'Z'),
+                        help='Rotation as a quaternion')
+    parser.add_argument('--translate', type=float, nargs=3, metavar=('TX', 'TY', 'TZ'), help='Translation')
+    parser.add_argument('--scale', type=float, help='Uniform scale factor')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_TRANSFORM_CHUNK_SIZE,
+                        help='Number of vertices transformed and written at a time')
+
+    args = parser.parse_args()
+    if args.rotate is not None and args.quaternion is not None:
+        parser.error("--rotate and --quaternion cannot be combined")
+
+    output_path = transform_3dgs(
+        args.input_ply,
+        args.output_ply,
+        matrix=parse_matrix(args.matrix) if args.matrix else None,
+        rotation=args.rotate if args.rotate is not None else args.quaternion,
+        translation=args.translate,
+        scale=args.scale,
+        chunk_size=args.chunk_size
+    )
+    print(f"Transformation complete: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
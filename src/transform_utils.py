@@ -216,3 +216,212 @@ def apply_transformation(points, rotation=None, scaling=None, translation=None):
         transformed_points = transformed_points + translation
     
     return transformed_points
+
+
+def quaternion_multiply(q1, q2):
+    """
+    Multiply quaternions element-wise over any number of leading dimensions.
+    
+    Quaternions are stored in (w, x, y, z) order, like the rot_0..rot_3 properties of 3DGS files.
+    
+    Args:
+        q1 (array_like): Array of shape (..., 4)
+        q2 (array_like): Array of shape (..., 4), broadcastable against q1
+        
+    Returns:
+        numpy.ndarray: Hamilton product q1 * q2 (the rotation q2 followed by q1), shape (..., 4)
+    """
+    w1, x1, y1, z1 = np.moveaxis(np.asarray(q1, dtype=float), -1, 0)
+    w2, x2, y2, z2 = np.moveaxis(np.asarray(q2, dtype=float), -1, 0)
+    
+    return np.stack([
+        w1*w2 - x1*x2 - y1*y2 - z1*z2,
+        w1*x2 + x1*w2 + y1*z2 - z1*y2,
+        w1*y2 - x1*z2 + y1*w2 + z1*x2,
+        w1*z2 + x1*y2 - y1*x2 + z1*w2,
+    ], axis=-1)
+
+
+def create_similarity_matrix(rotation=None, translation=None, scale=1.0):
+    """
+    Create a 4x4 similarity transformation matrix (uniform scale, then rotation, then translation).
+    
+    Args:
+        rotation (numpy.ndarray, optional): 3x3 rotation matrix
+        translation (array_like, optional): Translation vector
+        scale (float, optional): Uniform scale factor
+        
+    Returns:
+        numpy.ndarray: 4x4 transformation matrix
+    """
+    matrix = np.eye(4)
+    matrix[:3, :3] = scale * (np.eye(3) if rotation is None else np.asarray(rotation, dtype=float))
+    if translation is not None:
+        matrix[:3, 3] = translation
+    return matrix
+
+
+def decompose_similarity_matrix(matrix, tolerance=1e-6):
+    """
+    Split a similarity transformation matrix into uniform scale, rotation and translation.
+    
+    Args:
+        matrix (array_like): 4x4 or 3x4 matrix mapping column vectors, p' = M @ [p, 1]
+        tolerance (float, optional): Allowed deviation of the rotation part from orthonormality
+        
+    Returns:
+        tuple: (scale, rotation, translation) - float, 3x3 rotation matrix and translation vector
+    """
+    matrix = np.asarray(matrix, dtype=float)
+    if matrix.shape not in ((4, 4), (3, 4)):
+        raise ValueError("Input must be a 4x4 or 3x4 transformation matrix")
+    if matrix.shape == (4, 4) and not np.allclose(matrix[3], [0, 0, 0, 1], atol=tolerance):
+        raise ValueError("Projective transformations are not supported")
+    
+    linear = matrix[:3, :3]
+    determinant = np.linalg.det(linear)
+    if determinant <= 0:
+        raise ValueError("Transformation must preserve orientation (mirroring cannot be applied to rotations)")
+    
+    scale = determinant ** (1 / 3)
+    rotation = linear / scale
+    if not np.allclose(rotation @ rotation.T, np.eye(3), atol=tolerance):
+        raise ValueError("Matrix is not a similarity transformation (it contains non-uniform scaling or shear)")
+    
+    return scale, rotation, matrix[:3, 3].copy()
+
+
+def normalize_quaternions(quaternions):
+    """
+    Normalize quaternions to unit length over any number of leading dimensions.
+    
+    Zero quaternions are returned unchanged.
+    
+    Args:
+        quaternions (array_like): Array of shape (..., 4)
+        
+    Returns:
+        numpy.ndarray: Unit quaternions, shape (..., 4)
+    """
+    quaternions = np.asarray(quaternions, dtype=float)
+    norms = np.linalg.norm(quaternions, axis=-1, keepdims=True)
+    return quaternions / np.where(norms > 0, norms, 1.0)
+
+
+def quaternions_to_rotation_matrices(quaternions):
+    """
+    Convert quaternions to rotation matrices over any number of leading dimensions.
+    
+    Array counterpart of quaternion_to_rotation_matrix, with quaternions in (w, x, y, z) order
+    like the rot_0..rot_3 properties of 3DGS files. Quaternions are normalized first.
+    
+    Args:
+        quaternions (array_like): Array of shape (..., 4)
+        
+    Returns:
+        numpy.ndarray: Rotation matrices, shape (..., 3, 3)
+    """
+    w, x, y, z = np.moveaxis(normalize_quaternions(quaternions), -1, 0)
+    
+    xx, yy, zz = x * x, y * y, z * z
+    xy, xz, yz = x * y, x * z, y * z
+    wx, wy, wz = w * x, w * y, w * z
+    
+    matrices = np.stack([
+        1 - 2 * (yy + zz), 2 * (xy - wz), 2 * (xz + wy),
+        2 * (xy + wz), 1 - 2 * (xx + zz), 2 * (yz - wx),
+        2 * (xz - wy), 2 * (yz + wx), 1 - 2 * (xx + yy),
+    ], axis=-1)
+    return matrices.reshape(matrices.shape[:-1] + (3, 3))
+
+
+def rotation_matrices_to_quaternions(matrices):
+    """
+    Convert rotation matrices to quaternions over any number of leading dimensions.
+    
+    Array counterpart of rotation_matrix_to_quaternion. Instead of branching per matrix, the
+    four candidate formulas are evaluated for every matrix and the numerically stable one
+    (largest of the trace and the diagonal elements) is selected with an index.
+    
+    Args:
+        matrices (array_like): Array of shape (..., 3, 3)
+        
+    Returns:
+        numpy.ndarray: Unit quaternions in (w, x, y, z) order with w >= 0, shape (..., 4)
+    """
+    matrices = np.asarray(matrices, dtype=float)
+    if matrices.shape[-2:] != (3, 3):
+        raise ValueError("Input must be an array of 3x3 rotation matrices")
+    
+    r00, r01, r02 = matrices[..., 0, 0], matrices[..., 0, 1], matrices[..., 0, 2]
+    r10, r11, r12 = matrices[..., 1, 0], matrices[..., 1, 1], matrices[..., 1, 2]
+    r20, r21, r22 = matrices[..., 2, 0], matrices[..., 2, 1], matrices[..., 2, 2]
+    trace = r00 + r11 + r22
+    
+    # Each row is proportional to the quaternion; row i is accurate when its i-th element,
+    # 1 + trace or 1 + 2 * r_ii - trace, is the largest
+    candidates = np.stack([
+        np.stack([1 + trace, r21 - r12, r02 - r20, r10 - r01], axis=-1),
+        np.stack([r21 - r12, 1 + r00 - r11 - r22, r01 + r10, r02 + r20], axis=-1),
+        np.stack([r02 - r20, r01 + r10, 1 + r11 - r00 - r22, r12 + r21], axis=-1),
+        np.stack([r10 - r01, r02 + r20, r12 + r21, 1 + r22 - r00 - r11], axis=-1),
+    ], axis=-2)
+    choice = np.argmax(np.stack([trace, r00, r11, r22], axis=-1), axis=-1)
+    quaternions = np.take_along_axis(candidates, choice[..., np.newaxis, np.newaxis], axis=-2)[..., 0, :]
+    
+    quaternions = normalize_quaternions(quaternions)
+    return np.where(quaternions[..., :1] < 0, -quaternions, quaternions)
+
+
+def quaternion_slerp(q1, q2, t):
+    """
+    Spherically interpolate between quaternions over any number of leading dimensions.
+    
+    Interpolation follows the shorter arc, and nearly identical rotations are interpolated
+    linearly to avoid dividing by a vanishing sine.
+    
+    Args:
+        q1 (array_like): Start quaternions, shape (..., 4)
+        q2 (array_like): End quaternions, shape (..., 4), broadcastable against q1
+        t (float or array_like): Interpolation parameter, 0 gives q1 and 1 gives q2.
+                                 Broadcast against the leading dimensions
+        
+    Returns:
+        numpy.ndarray: Unit quaternions, shape (..., 4)
+    """
+    q1 = normalize_quaternions(q1)
+    q2 = normalize_quaternions(q2)
+    t = np.asarray(t, dtype=float)[..., np.newaxis]
+    
+    # q and -q are the same rotation; flip q2 so the arc is the shorter one
+    dot = np.sum(q1 * q2, axis=-1, keepdims=True)
+    q2 = np.where(dot < 0, -q2, q2)
+    dot = np.clip(np.abs(dot), 0.0, 1.0)
+    
+    angle = np.arccos(dot)
+    sin_angle = np.sin(angle)
+    is_close = sin_angle < 1e-6
+    safe_sin = np.where(is_close, 1.0, sin_angle)
+    w1 = np.where(is_close, 1 - t, np.sin((1 - t) * angle) / safe_sin)
+    w2 = np.where(is_close, t, np.sin(t * angle) / safe_sin)
+    
+    return normalize_quaternions(w1 * q1 + w2 * q2)
+
+
+def scale_rotation_to_covariance(scales, quaternions):
+    """
+    Compute gaussian covariance matrices from per-axis scales and rotations.
+    
+    The covariance is R S S R^T, where R is the rotation matrix of the quaternion and S the
+    diagonal scale matrix. 3DGS files store log scales, so pass np.exp(scale_*).
+    
+    Args:
+        scales (array_like): Scales along the gaussian's axes, shape (..., 3)
+        quaternions (array_like): Rotations in (w, x, y, z) order, shape (..., 4)
+        
+    Returns:
+        numpy.ndarray: Symmetric covariance matrices, shape (..., 3, 3)
+    """
+    # Scaling the columns of R by the scales gives M = R S, and the covariance is M M^T
+    scaled = quaternions_to_rotation_matrices(quaternions) * np.asarray(scales, dtype=float)[..., np.newaxis, :]
+    return np.matmul(scaled, np.swapaxes(scaled, -1, -2))
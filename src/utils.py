@@ -52,6 +52,21 @@ def auto_output_filename(input_filename, suffix, extension):
         return f"{name_without_ext}{suffix}.{extension}"
 
 
+def chunk_size_for_memory(max_memory, bytes_per_row, minimum=1024):
+    """
+    Calculate how many rows can be processed at once within a memory budget.
+    
+    Args:
+        max_memory (int): Memory budget in bytes
+        bytes_per_row (int): Estimated working memory needed per row
+        minimum (int, optional): Smallest chunk size to return. Defaults to 1024.
+        
+    Returns:
+        int: Number of rows per chunk
+    """
+    return max(minimum, int(max_memory) // max(1, int(bytes_per_row)))
+
+
 def detect_coordinate_properties(properties):
     """
     Detect coordinate-related property indices from a property list
@@ -164,14 +179,128 @@ def read_csv_with_header(csv_filename):
     return header, data
 
 
-def write_csv_with_header(csv_filename, header, data):
+def parse_csv_lines(lines, num_columns):
+    """
+    Parse numeric CSV lines in bulk into a 2D float64 array.
+    
+    Lines are parsed with a single np.loadtxt call. If that fails, each line is parsed
+    separately so that malformed rows (non-numeric values or a wrong number of columns)
+    can be collected instead of aborting the whole block.
+    
+    Args:
+        lines (list): CSV lines without the header
+        num_columns (int): Expected number of columns
+        
+    Returns:
+        tuple: (values, malformed_rows) - Array of shape (len(lines), num_columns) with
+               malformed rows filled with zeros, and the indices of those rows
+    """
+    try:
+        values = np.loadtxt(lines, delimiter=',', dtype=np.float64, comments=None, ndmin=2)
+        if values.shape == (len(lines), num_columns):
+            return values, []
+    except ValueError:
+        pass
+    
+    values = np.zeros((len(lines), num_columns), dtype=np.float64)
+    malformed_rows = []
+    for i, row in enumerate(csv.reader(lines)):
+        try:
+            if len(row) != num_columns:
+                raise ValueError(f"expected {num_columns} columns, got {len(row)}")
+            values[i] = [float(v) for v in row]
+        except ValueError:
+            values[i] = 0.0
+            malformed_rows.append(i)
+    
+    return values, malformed_rows
+
+
+def iter_csv_blocks(file_obj, num_columns, block_size=65536):
+    """
+    Read the data rows of a numeric CSV file in blocks of parsed values.
+    
+    Blank lines are skipped.
+    
+    Args:
+        file_obj: Text file object positioned after the header row
+        num_columns (int): Expected number of columns
+        block_size (int, optional): Number of lines parsed per block
+        
+    Yields:
+        tuple: (values, malformed_rows) - Parsed block and indices of malformed rows within it
+    """
+    import itertools
+    
+    while True:
+        lines = list(itertools.islice(file_obj, block_size))
+        if not lines:
+            break
+        lines = [line for line in lines if line.strip()]
+        if lines:
+            yield parse_csv_lines(lines, num_columns)
+
+
+def get_csv_float_format(float_format=None, precision=None):
+    """
+    Resolve the printf-style format used for floating-point CSV values.
+    
+    Args:
+        float_format (str, optional): Explicit format such as '%.9g'
+        precision (int, optional): Number of significant digits, used if float_format is not given
+        
+    Returns:
+        str: Format string. '%r' (shortest exact representation) if neither option is given
+    """
+    if float_format is not None:
+        return float_format
+    if precision is not None:
+        return f"%.{int(precision)}g"
+    return "%r"
+
+
+def format_csv_block(values, formats):
+    """
+    Format a 2D numeric array as CSV text with a single string operation.
+    
+    Args:
+        values (numpy.ndarray): Array of shape (rows, columns)
+        formats (list): printf-style format for each column, e.g. ['%r', '%d']
+        
+    Returns:
+        str: CSV rows with CRLF line endings, matching csv.writer output
+    """
+    row_format = ",".join(formats) + "\r\n"
+    return (row_format * len(values)) % tuple(values.ravel().tolist())
+
+
+def write_csv_block(file_obj, values, formats, block_size=65536):
+    """
+    Write a 2D numeric array as CSV rows, formatting block_size rows at a time.
+    
+    Args:
+        file_obj: Text file object to write to
+        values (numpy.ndarray): Array of shape (rows, columns)
+        formats (list): printf-style format for each column
+        block_size (int, optional): Number of rows formatted per string operation
+    """
+    for start in range(0, len(values), block_size):
+        file_obj.write(format_csv_block(values[start:start + block_size], formats))
+
+
+def write_csv_with_header(csv_filename, header, data, float_format=None, precision=None):
     """
     Write data to a CSV file with header.
     
+    Numeric NumPy arrays are written with the block formatter, which is much faster
+    than formatting each value through csv.writer. Other data is written with csv.writer.
+    
     Args:
         csv_filename (str): Path to CSV file
         header (list): Header row
-        data (list): List of data rows
+        data (list or numpy.ndarray): List of data rows or 2D numeric array
+        float_format (str, optional): printf-style format for float columns of numeric arrays, e.g. '%.9g'
+        precision (int, optional): Significant digits for float columns (used if float_format is not given)
         
     Returns:
         str: Path to the written CSV file
@@ -180,7 +309,13 @@ def write_csv_with_header(csv_filename, header, data):
     with open(csv_filename, 'w', newline='') as csvfile:
         writer = csv.writer(csvfile)
         writer.writerow(header)
-        writer.writerows(data)
+        
+        if isinstance(data, np.ndarray) and data.dtype.kind in 'biuf':
+            values = data.reshape(len(data), -1)
+            column_format = "%d" if data.dtype.kind in 'biu' else get_csv_float_format(float_format, precision)
+            write_csv_block(csvfile, values, [column_format] * values.shape[1])
+        else:
+            writer.writerows(data)
     
     print(f"CSV file saved: {csv_filename}")
     return csv_filename
@@ -0,0 +1,17 @@
+"""
+Shared fixtures for the 3DGS Edit Tools tests.
+"""
+
+import pytest
+
+from helpers import write_gaussian_ply
+
+
+@pytest.fixture
+def gaussian_ply(tmp_path):
+    """Factory writing a random 3DGS PLY file into the test's temporary directory"""
+    def make(name='scene.ply', **kwargs):
+        path = str(tmp_path / name)
+        properties, data = write_gaussian_ply(path, **kwargs)
+        return path, properties, data
+    return make
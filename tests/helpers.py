@@ -0,0 +1,80 @@
+"""
+Helpers for writing and reading test PLY files.
+"""
+
+import numpy as np
+
+
+# Property layout of a 3DGS file without higher-order SH coefficients
+BASE_PROPERTIES = ['x', 'y', 'z', 'nx', 'ny', 'nz', 'f_dc_0', 'f_dc_1', 'f_dc_2']
+TAIL_PROPERTIES = ['opacity', 'scale_0', 'scale_1', 'scale_2', 'rot_0', 'rot_1', 'rot_2', 'rot_3']
+
+
+def write_gaussian_ply(path, count=1000, sh_degree=0, seed=0, properties=None):
+    """
+    Write a binary little-endian 3DGS PLY file with random float values
+
+    Args:
+        path (str): Output path
+        count (int, optional): Number of gaussians
+        sh_degree (int, optional): SH degree, which sets the number of f_rest_* properties
+        seed (int, optional): Random seed
+        properties (list, optional): Property names, overriding the standard 3DGS layout
+
+    Returns:
+        tuple: (properties, data) - Property names and the float32 array that was written
+    """
+    if properties is None:
+        rest_count = 3 * ((sh_degree + 1) ** 2 - 1)
+        properties = BASE_PROPERTIES + [f'f_rest_{i}' for i in range(rest_count)] + TAIL_PROPERTIES
+    data = np.random.default_rng(seed).normal(size=(count, len(properties))).astype('<f4')
+    header = (f"ply\nformat binary_little_endian 1.0\nelement vertex {count}\n"
+              + "".join(f"property float {name}\n" for name in properties) + "end_header\n")
+    with open(path, 'wb') as f:
+        f.write(header.encode('ascii'))
+        f.write(data.tobytes())
+    return properties, data
+
+
+def read_float_ply(path):
+    """
+    Read a binary little-endian PLY file whose properties are all float
+
+    Args:
+        path (str): PLY file path
+
+    Returns:
+        tuple: (properties, vertex_count, data) - Property names, the count declared in the
+               header and the float32 body reshaped to one row per vertex
+    """
+    with open(path, 'rb') as f:
+        content = f.read()
+    end = content.index(b'end_header\n') + len(b'end_header\n')
+    lines = content[:end].decode('ascii').splitlines()
+    properties = [line.split()[-1] for line in lines if line.startswith('property')]
+    vertex_count = int(next(line.split()[-1] for line in lines if line.startswith('element vertex')))
+    data = np.frombuffer(content[end:], dtype='<f4').reshape(-1, len(properties))
+    return properties, vertex_count, data
+
+
+def write_typed_ply(path, vertices, property_types, ply_format='binary_little_endian'):
+    """
+    Write a PLY file with arbitrary scalar property types
+
+    Args:
+        path (str): Output path
+        vertices (numpy.ndarray): Structured array with one field per property
+        property_types (dict): PLY type name per property, in file order
+        ply_format (str, optional): 'binary_little_endian', 'binary_big_endian' or 'ascii'
+    """
+    header = (f"ply\nformat {ply_format} 1.0\nelement vertex {len(vertices)}\n"
+              + "".join(f"property {ply_type} {name}\n" for name, ply_type in property_types.items())
+              + "end_header\n")
+    with open(path, 'wb') as f:
+        f.write(header.encode('ascii'))
+        if ply_format == 'ascii':
+            for row in vertices.tolist():
+                f.write((" ".join(repr(value) for value in row) + "\n").encode('ascii'))
+        else:
+            byte_order = '<' if ply_format == 'binary_little_endian' else '>'
+            vertices.astype(vertices.dtype.newbyteorder(byte_order)).tofile(f)
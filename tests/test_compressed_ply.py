@@ -0,0 +1,75 @@
+"""
+Tests for the chunked compressed PLY layout.
+"""
+
+import numpy as np
+
+from src.compressed_ply import (convert_3dgs_to_compressed, convert_compressed_to_3dgs, read_compressed_ply,
+                                write_compressed_ply, COMPRESSED_CHUNK_SIZE)
+from src.file_utils import parse_ply_header
+from helpers import read_float_ply
+
+
+def write_columns(path, properties, data, sort=False):
+    return write_compressed_ply(path, {name: data[:, i] for i, name in enumerate(properties)}, sort=sort)
+
+
+def test_round_trip_is_within_quantization(gaussian_ply, tmp_path):
+    _, properties, data = gaussian_ply(count=3 * COMPRESSED_CHUNK_SIZE + 17, sh_degree=1)
+    path = write_columns(str(tmp_path / 'scene.compressed.ply'), properties, data)
+
+    vertices, header = read_compressed_ply(path)
+    decoded = {name: vertices[name].astype(np.float64) for name in header['properties']}
+    original = {name: data[:, i].astype(np.float64) for i, name in enumerate(properties)}
+
+    def assert_within_steps(names, bits):
+        # Values are quantized within the bounds of their chunk, so one step is at most the full extent
+        for name in names:
+            extent = original[name].max() - original[name].min()
+            np.testing.assert_allclose(decoded[name], original[name], atol=extent / (2 ** bits - 1))
+
+    assert_within_steps(['x', 'z', 'scale_0', 'scale_2'], 11)
+    assert_within_steps(['y', 'scale_1'], 10)
+
+    # Colors are stored as 8-bit values of 0.5 + SH_C0 * f_dc
+    for i in range(3):
+        name = f'f_dc_{i}'
+        extent = original[name].max() - original[name].min()
+        np.testing.assert_allclose(decoded[name], original[name], atol=extent / 255)
+
+    sigmoid = lambda values: 1 / (1 + np.exp(-values))
+    np.testing.assert_allclose(sigmoid(decoded['opacity']), sigmoid(original['opacity']), atol=1 / 255)
+
+    # Quaternions are normalized, and q and -q are the same rotation
+    quaternions = np.column_stack([original[f'rot_{i}'] for i in range(4)])
+    quaternions /= np.linalg.norm(quaternions, axis=1, keepdims=True)
+    dots = np.abs(np.sum(quaternions * np.column_stack([decoded[f'rot_{i}'] for i in range(4)]), axis=1))
+    assert dots.min() > 0.999
+
+    # SH coefficients use 8 bits over [-4, 4]
+    for i in range(9):
+        name = f'f_rest_{i}'
+        in_range = np.abs(original[name]) < 3.9
+        np.testing.assert_allclose(decoded[name][in_range], original[name][in_range], atol=8 / 256)
+
+
+def test_file_conversion_round_trip(gaussian_ply, tmp_path):
+    path, properties, data = gaussian_ply(count=1000, sh_degree=2)
+
+    compressed = convert_3dgs_to_compressed(path, str(tmp_path / 'scene.compressed.ply'))
+    restored = convert_compressed_to_3dgs(compressed, str(tmp_path / 'restored.ply'))
+
+    with open(compressed, 'rb') as f:
+        header = parse_ply_header(f)
+    assert [element['name'] for element in header['elements']] == ['chunk', 'vertex', 'sh']
+    assert 'packed_position' in header['properties']
+
+    restored_properties, vertex_count, restored_data = read_float_ply(restored)
+    assert vertex_count == 1000
+    assert set(restored_properties) == set(properties) - {'nx', 'ny', 'nz'}
+
+    # Gaussians are reordered along a Morton curve, so compare the sorted positions
+    for axis in 'xyz':
+        extent = np.ptp(data[:, properties.index(axis)])
+        np.testing.assert_allclose(np.sort(restored_data[:, restored_properties.index(axis)]),
+                                   np.sort(data[:, properties.index(axis)]), atol=extent / 1023)
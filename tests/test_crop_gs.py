@@ -0,0 +1,101 @@
+"""
+Tests for cropping scenes to regions.
+"""
+
+import numpy as np
+import pytest
+
+from src.crop_gs import crop_3dgs, contains_points, get_region_mask
+from src.gaussian_cloud import GaussianCloud
+from src.transform_utils import create_rotation_matrix
+from helpers import read_float_ply
+
+
+def crop_positions(path, tmp_path, **kwargs):
+    output = crop_3dgs(path, str(tmp_path / 'cropped.ply'), **kwargs)
+    return read_float_ply(output)[2]
+
+
+def test_box_keeps_inside_rows_in_order(gaussian_ply, tmp_path):
+    path, _, data = gaussian_ply(count=2000)
+    region = {'type': 'box', 'min': [-0.5, -1, -2], 'max': [1, 0.5, 2]}
+
+    cropped = crop_positions(path, tmp_path, region=region, chunk_size=300)
+
+    inside = np.all((data[:, :3] >= region['min']) & (data[:, :3] <= region['max']), axis=1)
+    np.testing.assert_array_equal(cropped, data[inside])
+
+
+def test_invert_keeps_the_complement(gaussian_ply, tmp_path):
+    path, _, data = gaussian_ply(count=1000)
+    region = {'type': 'sphere', 'center': [0.2, 0, -0.1], 'radius': 1.0}
+
+    cropped = crop_positions(path, tmp_path, region=region, invert=True)
+
+    outside = np.linalg.norm(data[:, :3].astype(np.float64) - region['center'], axis=1) > 1.0
+    np.testing.assert_array_equal(cropped, data[outside])
+
+
+def test_regions_are_intersected(gaussian_ply, tmp_path):
+    path, _, data = gaussian_ply(count=1000)
+    regions = [{'type': 'half_space', 'point': [0, 0, 0], 'normal': [1, 0, 0]},
+               {'type': 'half_space', 'point': [0, 0.5, 0], 'normal': [0, -1, 0]}]
+
+    cropped = crop_positions(path, tmp_path, region=regions)
+
+    np.testing.assert_array_equal(cropped, data[(data[:, 0] >= 0) & (data[:, 1] <= 0.5)])
+
+
+def test_oriented_box_matches_rotated_axis_aligned_box():
+    points = np.random.default_rng(0).uniform(-3, 3, size=(5000, 3))
+    rotation = create_rotation_matrix(15, 30, 45)
+    center = np.array([0.5, -0.5, 0.2])
+    region = {'type': 'oriented_box', 'center': center, 'size': [2, 1, 3], 'rotation': [15, 30, 45]}
+
+    # In the box frame the oriented box is axis-aligned
+    local = (points - center) @ rotation
+    expected = np.all(np.abs(local) <= [1, 0.5, 1.5], axis=1)
+    np.testing.assert_array_equal(get_region_mask(points, region), expected)
+
+
+def test_polygon_uses_even_odd_rule():
+    # Pentagram: the centre is enclosed twice, so it is outside under the even-odd rule
+    angles = np.deg2rad(90 + 144 * np.arange(5))
+    star = np.column_stack([np.cos(angles), np.sin(angles)])
+    points = np.array([[0.0, 0.0], [0.0, 0.8], [2.0, 0.0]])
+
+    np.testing.assert_array_equal(contains_points(star, points), [False, True, False])
+
+
+def test_concave_polygon_matches_analytic_region():
+    # L shape: the square [0, 2] x [0, 2] without the quadrant [1, 2] x [1, 2]
+    polygon = np.array([[0, 0], [2, 0], [2, 1], [1, 1], [1, 2], [0, 2]], dtype=np.float64)
+    points = np.random.default_rng(0).uniform(-0.5, 2.5, size=(5000, 2))
+
+    in_square = np.all((points > 0) & (points < 2), axis=1)
+    in_notch = np.all(points > 1, axis=1)
+    np.testing.assert_array_equal(contains_points(polygon, points), in_square & ~in_notch)
+
+
+def test_extruded_polygon_limits_the_axis():
+    points = np.array([[0.5, 0.0, 0.5], [0.5, 2.0, 0.5], [0.5, 0.0, 1.5]])
+    region = {'type': 'polygon', 'points': [[0, 0], [1, 0], [1, 1], [0, 1]], 'axis': 'y', 'min': -1, 'max': 1}
+
+    np.testing.assert_array_equal(get_region_mask(points, region), [True, False, False])
+
+
+def test_cloud_input_returns_cloud(gaussian_ply):
+    path, properties, data = gaussian_ply(count=500)
+    region = {'type': 'sphere', 'center': [0, 0, 0], 'radius': 1.5}
+
+    cropped = crop_3dgs(GaussianCloud.load(path), region=region)
+
+    inside = np.linalg.norm(data[:, :3].astype(np.float64), axis=1) <= 1.5
+    assert isinstance(cropped, GaussianCloud)
+    np.testing.assert_array_equal(cropped.data.T, data[inside])
+
+
+def test_unknown_region_is_rejected(gaussian_ply, tmp_path):
+    path, _, _ = gaussian_ply(count=10)
+    with pytest.raises(ValueError):
+        crop_3dgs(path, str(tmp_path / 'cropped.ply'), region={'type': 'cylinder'})
@@ -0,0 +1,92 @@
+"""
+Tests for CSV to 3DGS conversion.
+"""
+
+import numpy as np
+import pytest
+
+from src.csv_to_gs import convert_csv_to_3dgs
+from helpers import read_float_ply
+
+
+CSV_HEADER = "x,y,z,opacity\n"
+
+
+@pytest.mark.parametrize('workers', [None, 2])
+def test_malformed_rows_are_written_as_zeros(tmp_path, workers):
+    csv_path = tmp_path / 'scene.csv'
+    csv_path.write_text(CSV_HEADER
+                        + "1,2,3,0.5\n"
+                        + "4,abc,6,0.5\n"      # non-numeric value
+                        + "7,8\n"              # missing columns
+                        + "\n"                 # blank lines are not vertices
+                        + "9,10,11,0.25\n")
+
+    output = convert_csv_to_3dgs(str(csv_path), output_ply_filename=str(tmp_path / 'out.ply'), workers=workers)
+    properties, vertex_count, data = read_float_ply(output)
+
+    # Every non-blank row keeps its place, so the body matches the header count
+    assert properties == ['x', 'y', 'z', 'opacity']
+    assert vertex_count == len(data) == 4
+    np.testing.assert_array_equal(data, [[1, 2, 3, 0.5], [0, 0, 0, 0], [0, 0, 0, 0], [9, 10, 11, 0.25]])
+
+
+def test_malformed_rows_do_not_affect_color_remapping(tmp_path):
+    csv_path = tmp_path / 'colors.csv'
+    csv_path.write_text("x,y,z,f_dc_0,f_dc_1,f_dc_2\n"
+                        "0,0,0,0,0,0\n"
+                        "0,0,0,bad,1,1\n"
+                        "0,0,0,255,255,255\n")
+
+    output = convert_csv_to_3dgs(str(csv_path), output_ply_filename=str(tmp_path / 'out.ply'))
+    _, vertex_count, data = read_float_ply(output)
+
+    # The 0-255 range is detected from the valid rows only, and the malformed row stays zero
+    assert vertex_count == 3
+    np.testing.assert_array_equal(data[1], 0)
+    assert np.all(data[0, 3:] < 0) and np.all(data[2, 3:] > 0)
+
+
+def test_parallel_color_remapping_matches_single_process(tmp_path):
+    colors = np.random.default_rng(0).integers(0, 256, size=(5000, 3))
+    csv_path = tmp_path / 'colors.csv'
+    csv_path.write_text("x,y,z,f_dc_0,f_dc_1,f_dc_2\n"
+                        + "".join(f"{i},0,0,{r},{g},{b}\n" for i, (r, g, b) in enumerate(colors)))
+
+    single = convert_csv_to_3dgs(str(csv_path), output_ply_filename=str(tmp_path / 'single.ply'))
+    parallel = convert_csv_to_3dgs(str(csv_path), output_ply_filename=str(tmp_path / 'parallel.ply'), workers=2)
+
+    with open(single, 'rb') as f, open(parallel, 'rb') as g:
+        assert f.read() == g.read()
+
+    # Colors in 0-255 are mapped linearly onto the SH coefficient range of the whole file
+    _, _, data = read_float_ply(single)
+    normalized = (colors - colors.min()) / (colors.max() - colors.min())
+    np.testing.assert_allclose(np.corrcoef(normalized.ravel(), data[:, 3:].ravel())[0, 1], 1.0, rtol=1e-6)
+
+
+def test_rows_are_parsed_into_one_buffer_across_blocks(tmp_path):
+    # More rows than one parsed block, with CRLF and whitespace-only lines
+    values = np.random.default_rng(0).normal(size=(70000, 4)).astype(np.float32)
+    lines = [",".join(repr(float(value)) for value in row) for row in values]
+    lines[100:100] = ["", "  "]
+    csv_path = tmp_path / 'large.csv'
+    csv_path.write_bytes((CSV_HEADER + "\r\n".join(lines) + "\r\n").encode('ascii'))
+
+    output = convert_csv_to_3dgs(str(csv_path), output_ply_filename=str(tmp_path / 'out.ply'))
+    _, vertex_count, data = read_float_ply(output)
+
+    assert vertex_count == 70000
+    np.testing.assert_array_equal(data, values)
+
+
+def test_rows_missed_by_the_row_count_are_kept(tmp_path):
+    # Bare carriage returns end rows for the CSV reader but not for the byte count
+    csv_path = tmp_path / 'scene.csv'
+    csv_path.write_bytes(b"x,y,z,opacity\n1,2,3,0.5\r4,5,6,0.5\r7,8,9,0.25\n")
+
+    output = convert_csv_to_3dgs(str(csv_path), output_ply_filename=str(tmp_path / 'out.ply'))
+    _, vertex_count, data = read_float_ply(output)
+
+    assert vertex_count == 3
+    np.testing.assert_array_equal(data, [[1, 2, 3, 0.5], [4, 5, 6, 0.5], [7, 8, 9, 0.25]])
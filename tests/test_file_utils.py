@@ -0,0 +1,50 @@
+"""
+Tests for the structured-dtype PLY reader.
+"""
+
+import numpy as np
+import pytest
+
+from src.file_utils import read_ply_vertices
+from helpers import write_typed_ply
+
+# PLY scalar type names (including the sized aliases) and their NumPy types
+SCALAR_TYPES = [
+    ('char', 'i1'), ('uchar', 'u1'), ('short', 'i2'), ('ushort', 'u2'),
+    ('int', 'i4'), ('uint', 'u4'), ('float', 'f4'), ('double', 'f8'),
+    ('int8', 'i1'), ('uint16', 'u2'), ('float32', 'f4'), ('float64', 'f8'),
+]
+
+
+def get_extreme_values(numpy_type):
+    """Values covering the range of a type, including values that differ in every byte"""
+    dtype = np.dtype(numpy_type)
+    if dtype.kind == 'f':
+        info = np.finfo(dtype)
+        return np.array([0.0, -1.5, info.tiny, info.max, -info.max, 1 / 3], dtype=dtype)
+    info = np.iinfo(dtype)
+    return np.array([0, 1, info.min, info.max, info.max // 3, info.min // 5], dtype=dtype)
+
+
+@pytest.mark.parametrize('ply_format', ['binary_little_endian', 'binary_big_endian', 'ascii'])
+@pytest.mark.parametrize('ply_type, numpy_type', SCALAR_TYPES)
+@pytest.mark.parametrize('memory_map', [False, True])
+def test_read_scalar_types_in_every_format(tmp_path, ply_format, ply_type, numpy_type, memory_map):
+    values = get_extreme_values(numpy_type)
+    vertices = np.zeros(len(values), dtype=[('x', '<f4'), ('value', numpy_type), ('flag', 'u1')])
+    vertices['x'] = np.arange(len(values)) + 0.25
+    vertices['value'] = values
+    vertices['flag'] = 255
+    path = str(tmp_path / 'typed.ply')
+    write_typed_ply(path, vertices, {'x': 'float', 'value': ply_type, 'flag': 'uchar'}, ply_format)
+
+    result, header = read_ply_vertices(path, memory_map=memory_map)
+
+    assert header['format'] == ply_format
+    assert header['properties'] == ['x', 'value', 'flag']
+    assert header['property_types']['value'] == ply_type
+    assert result.dtype['value'].kind == np.dtype(numpy_type).kind
+    assert result.dtype['value'].itemsize == np.dtype(numpy_type).itemsize
+    np.testing.assert_array_equal(result['x'], vertices['x'])
+    np.testing.assert_array_equal(result['value'], values)
+    np.testing.assert_array_equal(result['flag'], 255)
@@ -0,0 +1,92 @@
+"""
+Tests for the in-memory GaussianCloud.
+"""
+
+import os
+
+import numpy as np
+
+from src.gaussian_cloud import GaussianCloud, get_source_filename, DEFAULT_CLOUD_FILENAME
+from src.gs_to_csv import convert_3dgs_to_csv
+from src.gs_to_columns import convert_3dgs_to_columns, load_columns
+from helpers import write_typed_ply
+
+
+def test_load_and_save_round_trip(gaussian_ply, tmp_path):
+    path, properties, data = gaussian_ply(sh_degree=1, count=50)
+
+    cloud = GaussianCloud.load(path)
+    assert len(cloud) == 50
+    assert cloud.keys() == properties
+    assert cloud.filename == path
+    np.testing.assert_array_equal(cloud.data, data.T)
+
+    saved = cloud.save(str(tmp_path / 'saved.ply'))
+    with open(path, 'rb') as f, open(saved, 'rb') as g:
+        assert f.read() == g.read()
+
+
+def test_save_keeps_property_types(tmp_path):
+    property_types = {'x': 'float', 'y': 'float', 'z': 'float', 'label': 'uchar', 'count': 'int'}
+    vertices = np.zeros(4, dtype=[('x', '<f4'), ('y', '<f4'), ('z', '<f4'), ('label', 'u1'), ('count', '<i4')])
+    vertices['x'] = [0.5, 1.5, 2.5, 3.5]
+    vertices['label'] = [0, 1, 200, 255]
+    vertices['count'] = [-7, 0, 7, 1000000]
+    path = str(tmp_path / 'typed.ply')
+    write_typed_ply(path, vertices, property_types)
+
+    cloud = GaussianCloud.load(path)
+    assert cloud.property_types == property_types
+
+    saved = cloud.save(str(tmp_path / 'saved.ply'))
+    with open(path, 'rb') as f, open(saved, 'rb') as g:
+        assert f.read() == g.read()
+
+
+def test_properties_are_views(gaussian_ply):
+    path, properties, data = gaussian_ply(sh_degree=1, count=20)
+    cloud = GaussianCloud.load(path)
+
+    cloud['x'][0] = 42.0
+    assert cloud.data[properties.index('x'), 0] == 42.0
+    cloud.positions[1] = [1.0, 2.0, 3.0]
+    np.testing.assert_array_equal(cloud.data[:3, 1], [1.0, 2.0, 3.0])
+    cloud.rot[:, 0] = 1.0
+    np.testing.assert_array_equal(cloud['rot_0'], 1.0)
+
+    # Numbered groups are ordered numerically
+    assert cloud.get_prefixed_properties('f_rest_') == [f'f_rest_{i}' for i in range(9)]
+    np.testing.assert_array_equal(cloud.f_rest, data[:, properties.index('f_rest_0'):properties.index('f_rest_8') + 1])
+
+    # Properties that are not stored next to each other are copied
+    group = cloud.get_group(['x', 'opacity'])
+    group[:] = -1.0
+    assert not np.any(cloud['opacity'] == -1.0)
+
+
+def test_source_filename(gaussian_ply):
+    path, properties, data = gaussian_ply()
+
+    assert get_source_filename(path) == path
+    assert get_source_filename(GaussianCloud.load(path)) == path
+    assert get_source_filename(GaussianCloud(data.T, properties)) == DEFAULT_CLOUD_FILENAME
+
+
+def test_converters_accept_clouds(gaussian_ply, tmp_path):
+    path, _, _ = gaussian_ply(sh_degree=2, count=100)
+    cloud = GaussianCloud.load(path)
+
+    from_path, _ = convert_3dgs_to_csv(path, str(tmp_path / 'from_path.csv'))
+    from_cloud, _ = convert_3dgs_to_csv(cloud, str(tmp_path / 'from_cloud.csv'))
+    with open(from_path, 'rb') as f, open(from_cloud, 'rb') as g:
+        assert f.read() == g.read()
+
+    columns_from_path, _ = load_columns(convert_3dgs_to_columns(path, str(tmp_path / 'path_columns')))
+    columns_from_cloud, _ = load_columns(convert_3dgs_to_columns(cloud, str(tmp_path / 'cloud_columns')))
+    assert list(columns_from_path) == list(columns_from_cloud)
+    for name, values in columns_from_path.items():
+        np.testing.assert_array_equal(values, columns_from_cloud[name])
+
+    # Output names are derived from the file the cloud was loaded from
+    default_output, _ = convert_3dgs_to_csv(cloud)
+    assert default_output == os.path.splitext(path)[0] + '.csv'
@@ -0,0 +1,26 @@
+"""
+Tests for 3DGS file inspection.
+"""
+
+import pytest
+
+from helpers import BASE_PROPERTIES, TAIL_PROPERTIES
+from src.gs_info import get_3dgs_info
+
+
+@pytest.mark.parametrize('sh_degree', [0, 1, 3])
+def test_sh_degree_is_reported(gaussian_ply, sh_degree):
+    path, _, _ = gaussian_ply(count=10, sh_degree=sh_degree)
+
+    info = get_3dgs_info(path)
+
+    assert info['sh_degree'] == sh_degree
+    assert info['complete']
+
+
+def test_incomplete_sh_layout_has_no_degree(gaussian_ply):
+    # 10 coefficients do not match any degree (9 for degree 1, 24 for degree 2)
+    properties = BASE_PROPERTIES + [f'f_rest_{i}' for i in range(10)] + TAIL_PROPERTIES
+    path, _, _ = gaussian_ply(count=10, properties=properties)
+
+    assert get_3dgs_info(path)['sh_degree'] is None
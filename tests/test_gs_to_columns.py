@@ -0,0 +1,70 @@
+"""
+Tests for the columnar intermediate format and the comparison built on it.
+"""
+
+import os
+import tempfile
+
+import numpy as np
+
+from src.compare_gs import compare_3dgs_files
+from src.gs_to_columns import convert_3dgs_to_columns, convert_columns_to_3dgs, load_columns
+from helpers import write_typed_ply
+
+PROPERTY_TYPES = {'x': 'float', 'y': 'float', 'z': 'float', 'label': 'uchar', 'count': 'int', 'weight': 'double'}
+
+
+def make_vertices(count=100, seed=0):
+    rng = np.random.default_rng(seed)
+    vertices = np.empty(count, dtype=[('x', '<f4'), ('y', '<f4'), ('z', '<f4'), ('label', 'u1'),
+                                      ('count', '<i4'), ('weight', '<f8')])
+    for name in ('x', 'y', 'z', 'weight'):
+        vertices[name] = rng.normal(size=count)
+    vertices['label'] = rng.integers(0, 256, count)
+    vertices['count'] = rng.integers(-2 ** 31, 2 ** 31, count)
+    return vertices
+
+
+def test_columns_round_trip(tmp_path):
+    source = str(tmp_path / 'scene.ply')
+    vertices = make_vertices()
+    write_typed_ply(source, vertices, PROPERTY_TYPES)
+
+    columns_dir = convert_3dgs_to_columns(source, str(tmp_path / 'columns'))
+    columns, manifest = load_columns(columns_dir)
+
+    assert list(columns) == list(PROPERTY_TYPES)
+    assert [prop['type'] for prop in manifest['properties']] == list(PROPERTY_TYPES.values())
+    assert manifest['vertex_count'] == len(vertices)
+    for name, values in columns.items():
+        assert values.dtype == vertices.dtype[name]
+        np.testing.assert_array_equal(values, vertices[name])
+
+    restored = convert_columns_to_3dgs(columns_dir, str(tmp_path / 'restored.ply'))
+    with open(source, 'rb') as f, open(restored, 'rb') as g:
+        assert f.read() == g.read()
+
+
+def test_comparison_removes_its_temporary_columns(tmp_path, monkeypatch):
+    temp_root = tmp_path / 'tmp'
+    temp_root.mkdir()
+    monkeypatch.setattr(tempfile, 'tempdir', str(temp_root))
+
+    first = str(tmp_path / 'first.ply')
+    second = str(tmp_path / 'second.ply')
+    vertices = make_vertices()
+    write_typed_ply(first, vertices, PROPERTY_TYPES)
+
+    # Identical files leave nothing behind
+    result = compare_3dgs_files(first, first, visualize=False, cache=False)
+    assert 'error' not in result
+    assert os.listdir(temp_root) == []
+
+    # Only the report of differing files is kept
+    vertices['x'][0] += 1
+    write_typed_ply(second, vertices, PROPERTY_TYPES)
+    result = compare_3dgs_files(first, second, visualize=False, cache=False)
+    temp_dirs = os.listdir(temp_root)
+    assert len(temp_dirs) == 1
+    assert os.listdir(temp_root / temp_dirs[0]) == ['differences.csv']
+    assert result['diff_csv'] == os.path.join(str(temp_root / temp_dirs[0]), 'differences.csv')
@@ -0,0 +1,65 @@
+"""
+Tests for 3DGS to CSV export.
+"""
+
+import numpy as np
+import pytest
+
+from src.gs_to_csv import convert_3dgs_to_csv
+from helpers import write_typed_ply
+
+
+def read_bytes(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+@pytest.fixture
+def typed_scene(tmp_path):
+    """A small file with float and int properties and no colors"""
+    rng = np.random.default_rng(0)
+    vertices = np.zeros(100, dtype=[('x', '<f4'), ('y', '<f4'), ('z', '<f4'), ('opacity', '<f4'), ('count', '<i4')])
+    for name in ('x', 'y', 'z', 'opacity'):
+        vertices[name] = rng.normal(scale=100, size=100)
+    vertices['count'] = rng.integers(-1000, 1000, 100)
+    path = str(tmp_path / 'typed.ply')
+    write_typed_ply(path, vertices, {'x': 'float', 'y': 'float', 'z': 'float', 'opacity': 'float', 'count': 'int'})
+    return path, vertices
+
+
+@pytest.mark.parametrize('options', [{'chunk_size': 7}, {'chunk_size': 1}, {'max_memory': 1}])
+def test_chunked_export_matches_single_shot(gaussian_ply, tmp_path, options):
+    path, _, _ = gaussian_ply(count=100, sh_degree=1)
+
+    whole, _ = convert_3dgs_to_csv(path, str(tmp_path / 'whole.csv'))
+    chunked, _ = convert_3dgs_to_csv(path, str(tmp_path / 'chunked.csv'), **options)
+
+    assert read_bytes(whole) == read_bytes(chunked)
+
+
+def test_default_export_is_exact(typed_scene, tmp_path):
+    path, vertices = typed_scene
+
+    csv_path, _ = convert_3dgs_to_csv(path, str(tmp_path / 'scene.csv'))
+
+    values = np.loadtxt(csv_path, delimiter=',', skiprows=1)
+    for i, name in enumerate(vertices.dtype.names):
+        np.testing.assert_array_equal(values[:, i].astype(vertices.dtype[name]), vertices[name])
+
+
+@pytest.mark.parametrize('options, float_format', [
+    ({'precision': 4}, '%.4g'),
+    ({'precision': 12}, '%.12g'),
+    ({'float_format': '%.3e', 'precision': 4}, '%.3e'),
+])
+def test_float_format_options(typed_scene, tmp_path, options, float_format):
+    path, vertices = typed_scene
+
+    csv_path, _ = convert_3dgs_to_csv(path, str(tmp_path / 'scene.csv'), chunk_size=30, **options)
+
+    with open(csv_path) as f:
+        lines = f.read().splitlines()
+    assert lines[0] == 'x,y,z,opacity,count'
+    expected = [",".join([float_format % float(row[i]) for i in range(4)] + ['%d' % row[4]])
+                for row in vertices.tolist()]
+    assert lines[1:] == expected
@@ -0,0 +1,28 @@
+"""
+Tests for 3DGS to point cloud conversion.
+"""
+
+import numpy as np
+import pytest
+
+from src.file_utils import read_ply_vertices
+from src.gs_to_pointcloud import convert_3dgs_to_pointcloud
+
+
+def test_positions_are_read_from_detected_coordinate_properties(gaussian_ply, tmp_path):
+    properties = ['pos_0', 'pos_1', 'pos_2', 'f_dc_0', 'f_dc_1', 'f_dc_2', 'opacity']
+    path, _, data = gaussian_ply(count=100, properties=properties)
+
+    output = convert_3dgs_to_pointcloud(path, str(tmp_path / 'points.ply'))
+    vertices, header = read_ply_vertices(output)
+
+    assert header['properties'] == ['x', 'y', 'z', 'red', 'green', 'blue']
+    for i, axis in enumerate(('x', 'y', 'z')):
+        np.testing.assert_array_equal(vertices[axis], data[:, i])
+
+
+def test_memory_map_is_deprecated(gaussian_ply, tmp_path):
+    path, _, _ = gaussian_ply(count=10)
+
+    with pytest.warns(DeprecationWarning):
+        convert_3dgs_to_pointcloud(path, str(tmp_path / 'points.ply'), memory_map=True)
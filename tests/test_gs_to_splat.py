@@ -0,0 +1,57 @@
+"""
+Tests for the .splat format.
+"""
+
+import numpy as np
+
+from src.compressed_ply import SH_C0
+from src.gs_to_splat import convert_3dgs_to_splat, convert_splat_to_3dgs, read_splat, SPLAT_DTYPE
+from helpers import read_float_ply
+
+
+def test_round_trip_is_within_quantization(gaussian_ply, tmp_path):
+    path, properties, data = gaussian_ply(count=1000, sh_degree=1)
+    column = {name: data[:, i].astype(np.float64) for i, name in enumerate(properties)}
+
+    splat = convert_3dgs_to_splat(path, str(tmp_path / 'scene.splat'), sort=False)
+    restored = convert_splat_to_3dgs(splat, str(tmp_path / 'restored.ply'))
+    restored_properties, vertex_count, restored_data = read_float_ply(restored)
+    decoded = {name: restored_data[:, i].astype(np.float64) for i, name in enumerate(restored_properties)}
+
+    assert vertex_count == 1000
+    assert not any(name.startswith('f_rest_') for name in restored_properties)
+
+    # Positions and scales are stored as float32
+    for axis in 'xyz':
+        np.testing.assert_array_equal(decoded[axis], column[axis])
+    for i in range(3):
+        np.testing.assert_allclose(decoded[f'scale_{i}'], column[f'scale_{i}'], atol=1e-6)
+
+    # Colors are 8-bit values of 0.5 + SH_C0 * f_dc; values outside 0-255 are clipped
+    for i in range(3):
+        name = f'f_dc_{i}'
+        unclipped = np.abs(column[name]) < 1.7
+        np.testing.assert_allclose(decoded[name][unclipped], column[name][unclipped], atol=0.5 / 255 / SH_C0)
+
+    sigmoid = lambda values: 1 / (1 + np.exp(-values))
+    np.testing.assert_allclose(sigmoid(decoded['opacity']), sigmoid(column['opacity']), atol=0.5 / 255)
+
+    # Quaternion components are stored with 8 bits each
+    quaternions = np.column_stack([column[f'rot_{i}'] for i in range(4)])
+    quaternions /= np.linalg.norm(quaternions, axis=1, keepdims=True)
+    dots = np.abs(np.sum(quaternions * np.column_stack([decoded[f'rot_{i}'] for i in range(4)]), axis=1))
+    assert dots.min() > 0.999
+
+
+def test_records_are_sorted_by_importance(gaussian_ply, tmp_path):
+    path, properties, data = gaussian_ply(count=500)
+    column = {name: data[:, i].astype(np.float64) for i, name in enumerate(properties)}
+
+    splats = read_splat(convert_3dgs_to_splat(path, str(tmp_path / 'scene.splat')))
+
+    # Largest, most opaque gaussians first
+    volume = np.exp(column['scale_0'] + column['scale_1'] + column['scale_2'])
+    importance = volume / (1 + np.exp(-column['opacity']))
+    order = np.argsort(-importance, kind='stable')
+    assert splats.dtype == SPLAT_DTYPE and splats.dtype.itemsize == 32
+    np.testing.assert_array_equal(splats['x'], data[order, 0])
@@ -0,0 +1,116 @@
+"""
+Tests for merging 3DGS files.
+"""
+
+import sys
+
+import numpy as np
+
+from src.gaussian_cloud import GaussianCloud
+from src.merge_gs import merge_3dgs_files, merge_3dgs, main
+from src.transform_utils import create_rotation_matrix
+from helpers import read_float_ply
+
+
+def test_two_file_form_takes_output_positionally(gaussian_ply, tmp_path):
+    first, properties, first_data = gaussian_ply('first.ply', count=100, seed=1)
+    second, _, second_data = gaussian_ply('second.ply', count=50, seed=2)
+    output = str(tmp_path / 'merged.ply')
+
+    assert merge_3dgs_files(first, second, output) == output
+
+    merged_properties, vertex_count, data = read_float_ply(output)
+    assert merged_properties == properties
+    assert vertex_count == 150
+    np.testing.assert_array_equal(data, np.concatenate([first_data, second_data]))
+
+
+def test_transforms_are_computed_in_double_precision(gaussian_ply, tmp_path):
+    first, properties, _ = gaussian_ply('first.ply', count=100, seed=1)
+    second, _, second_data = gaussian_ply('second.ply', count=1000, seed=2)
+    transform = {'scale': [1.5, 0.5, 2.0], 'rotate': [10, 20, 30], 'translate': [0.1, -0.2, 0.3]}
+
+    # Float32 files take the fast path, in-memory clouds the column path
+    from_files = merge_3dgs(first, second, output_file=str(tmp_path / 'files.ply'), transform=transform)
+    from_clouds = merge_3dgs(GaussianCloud.load(first), GaussianCloud.load(second),
+                             output_file=str(tmp_path / 'clouds.ply'), transform=transform)
+    with open(from_files, 'rb') as f, open(from_clouds, 'rb') as g:
+        assert f.read() == g.read()
+
+    _, _, data = read_float_ply(from_files)
+    positions = second_data[:, :3].astype(np.float64) * transform['scale']
+    positions = positions @ create_rotation_matrix(*transform['rotate']).T + transform['translate']
+    np.testing.assert_array_equal(data[100:, :3], positions.astype(np.float32))
+
+
+def test_sh_bands_are_remapped_per_channel(gaussian_ply):
+    high, _, _ = gaussian_ply('high.ply', count=20, sh_degree=3, seed=1)
+    low, low_properties, low_data = gaussian_ply('low.ply', count=10, sh_degree=1, seed=2)
+
+    merged = merge_3dgs(GaussianCloud.load(high), low, schema='first', sh_padding='zero')
+    columns = merged.columns()
+
+    # Coefficient k of channel c is f_rest_{c*3+k} at degree 1 and f_rest_{c*15+k} at degree 3
+    for channel in range(3):
+        for k in range(15):
+            values = columns[f'f_rest_{channel * 15 + k}'][20:]
+            if k < 3:
+                np.testing.assert_array_equal(values, low_data[:, low_properties.index(f'f_rest_{channel * 3 + k}')])
+            else:
+                np.testing.assert_array_equal(values, 0)
+
+
+def test_schemas_choose_output_properties(gaussian_ply):
+    first, _, _ = gaussian_ply('first.ply', count=10, properties=['x', 'y', 'z', 'opacity', 'extra'], seed=1)
+    second, _, second_data = gaussian_ply('second.ply', count=5, properties=['x', 'y', 'z', 'opacity', 'other'],
+                                          seed=2)
+    clouds = [GaussianCloud.load(first), second]
+
+    assert merge_3dgs(*clouds, schema='first').keys() == ['x', 'y', 'z', 'opacity', 'extra']
+    assert merge_3dgs(*clouds, schema='intersection').keys() == ['x', 'y', 'z', 'opacity']
+
+    union = merge_3dgs(*clouds, schema='union')
+    assert union.keys() == ['x', 'y', 'z', 'opacity', 'extra', 'other']
+    np.testing.assert_array_equal(union['extra'][10:], 0)
+    np.testing.assert_array_equal(union['other'][10:], second_data[:, 4])
+
+
+def test_transform_list_applies_per_input(gaussian_ply, tmp_path):
+    paths = [gaussian_ply(f'scene_{i}.ply', count=10, seed=i)[0] for i in range(3)]
+    transforms = [{'translate': [1, 0, 0]}, None, {'translate': [0, 0, 2]}]
+
+    output = merge_3dgs(*paths, output_file=str(tmp_path / 'merged.ply'), transform=transforms)
+
+    _, vertex_count, data = read_float_ply(output)
+    originals = [read_float_ply(path)[2] for path in paths]
+    assert vertex_count == 30
+    np.testing.assert_allclose(data[:10, 0], originals[0][:, 0] + 1, rtol=1e-6)
+    np.testing.assert_array_equal(data[10:20], originals[1])
+    np.testing.assert_allclose(data[20:, 2], originals[2][:, 2] + 2, rtol=1e-6)
+
+
+def test_small_chunks_give_the_same_output(gaussian_ply, tmp_path):
+    first, _, _ = gaussian_ply('first.ply', count=100, sh_degree=1, seed=1)
+    second, _, _ = gaussian_ply('second.ply', count=70, sh_degree=2, seed=2)
+    transform = {'rotate': [0, 90, 0]}
+
+    whole = merge_3dgs(first, second, output_file=str(tmp_path / 'whole.ply'), transform=transform)
+    chunked = merge_3dgs(first, second, output_file=str(tmp_path / 'chunked.ply'), transform=transform,
+                         chunk_size=16)
+    with open(whole, 'rb') as f, open(chunked, 'rb') as g:
+        assert f.read() == g.read()
+
+
+def test_command_line_translation_takes_effect(gaussian_ply, tmp_path, monkeypatch):
+    first, _, first_data = gaussian_ply('first.ply', count=10, seed=1)
+    second, _, second_data = gaussian_ply('second.ply', count=10, seed=2)
+    output = str(tmp_path / 'merged.ply')
+
+    # The command line always passes a scale, which used to replace the translation
+    monkeypatch.setattr(sys, 'argv', ['merge-gs', first, second, '-o', output, '--translate-x', '2.5'])
+    main()
+
+    _, _, data = read_float_ply(output)
+    np.testing.assert_array_equal(data[:10], first_data)
+    np.testing.assert_allclose(data[10:, 0], second_data[:, 0] + 2.5, rtol=1e-6)
+    np.testing.assert_array_equal(data[10:, 1:], second_data[:, 1:])
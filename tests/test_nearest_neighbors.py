@@ -0,0 +1,65 @@
+"""
+Tests for the nearest neighbour search.
+"""
+
+import numpy as np
+import pytest
+
+from src import nearest_neighbors
+from src.nearest_neighbors import find_nearest_indices, grid_nearest_indices
+
+
+def brute_force(reference_points, query_points):
+    distances = np.linalg.norm(query_points[:, np.newaxis] - reference_points[np.newaxis], axis=2)
+    return np.argmin(distances, axis=1), np.min(distances, axis=1)
+
+
+def clustered_points(rng, count):
+    # Dense clusters far apart, as in scenes with detailed objects and empty space between them
+    centers = rng.uniform(-100, 100, size=(5, 3))
+    return centers[rng.integers(0, 5, count)] + rng.normal(scale=0.05, size=(count, 3))
+
+
+@pytest.mark.parametrize('layout', ['uniform', 'clustered', 'surface'])
+def test_grid_matches_brute_force(layout):
+    rng = np.random.default_rng(0)
+    if layout == 'uniform':
+        reference = rng.uniform(-1, 1, size=(3000, 3))
+    elif layout == 'clustered':
+        reference = clustered_points(rng, 3000)
+    else:
+        reference = np.column_stack([rng.uniform(-1, 1, size=(3000, 2)), np.zeros(3000)])
+    queries = np.concatenate([reference[:500] + rng.normal(scale=0.01, size=(500, 3)),
+                              rng.uniform(-2, 2, size=(500, 3)),
+                              rng.uniform(-1000, 1000, size=(20, 3))])    # far outliers
+
+    indices, distances = grid_nearest_indices(reference, queries)
+
+    expected_indices, expected_distances = brute_force(reference, queries)
+    np.testing.assert_allclose(distances, expected_distances, rtol=1e-12)
+    np.testing.assert_array_equal(indices, expected_indices)
+
+
+def test_grid_fallback_is_used_without_scipy(monkeypatch):
+    rng = np.random.default_rng(1)
+    reference = clustered_points(rng, 2000)
+    queries = rng.uniform(-150, 150, size=(300, 3))
+
+    monkeypatch.setattr(nearest_neighbors, 'cKDTree', None)
+    indices, distances = find_nearest_indices(reference, queries)
+
+    expected_indices, expected_distances = brute_force(reference, queries)
+    np.testing.assert_array_equal(indices, expected_indices)
+    np.testing.assert_allclose(distances, expected_distances, rtol=1e-12)
+
+
+def test_single_reference_point_and_empty_queries():
+    indices, distances = grid_nearest_indices(np.zeros((1, 3)), np.array([[3.0, 4.0, 0.0], [0.0, 0.0, 0.0]]))
+    np.testing.assert_array_equal(indices, [0, 0])
+    np.testing.assert_allclose(distances, [5.0, 0.0])
+
+    indices, distances = find_nearest_indices(np.zeros((1, 3)), np.zeros((0, 3)))
+    assert len(indices) == len(distances) == 0
+
+    with pytest.raises(ValueError):
+        find_nearest_indices(np.zeros((0, 3)), np.zeros((1, 3)))
@@ -0,0 +1,40 @@
+"""
+Tests for the streaming point cloud CSV converters.
+"""
+
+import numpy as np
+import pytest
+
+from src.pointcloud_to_csv import convert_pointcloud_to_csv, convert_csv_to_pointcloud
+from helpers import write_typed_ply
+
+
+def read_bytes(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+@pytest.mark.parametrize('color_type', ['uchar', 'float'])
+def test_chunked_conversions_match_single_shot(tmp_path, color_type):
+    color_dtype = 'u1' if color_type == 'uchar' else '<f4'
+    rng = np.random.default_rng(0)
+    points = np.zeros(100, dtype=[('x', '<f4'), ('y', '<f4'), ('z', '<f4'),
+                                  ('red', color_dtype), ('green', color_dtype), ('blue', color_dtype)])
+    for name in ('x', 'y', 'z'):
+        points[name] = rng.normal(size=100)
+    for name in ('red', 'green', 'blue'):
+        points[name] = rng.integers(0, 256, 100) if color_type == 'uchar' else rng.random(100)
+    pointcloud = str(tmp_path / 'points.ply')
+    property_types = {'x': 'float', 'y': 'float', 'z': 'float',
+                      'red': color_type, 'green': color_type, 'blue': color_type}
+    write_typed_ply(pointcloud, points, property_types)
+
+    # 7 does not divide the 100 points, so the last chunk is partial
+    whole_csv = convert_pointcloud_to_csv(pointcloud, str(tmp_path / 'whole.csv'))
+    chunked_csv = convert_pointcloud_to_csv(pointcloud, str(tmp_path / 'chunked.csv'), chunk_size=7)
+    assert read_bytes(whole_csv) == read_bytes(chunked_csv)
+
+    whole_ply = convert_csv_to_pointcloud(whole_csv, str(tmp_path / 'whole.ply'), color_type=color_type)
+    chunked_ply = convert_csv_to_pointcloud(whole_csv, str(tmp_path / 'chunked.ply'), color_type=color_type,
+                                            chunk_size=7)
+    assert read_bytes(whole_ply) == read_bytes(chunked_ply)
@@ -0,0 +1,88 @@
+"""
+Tests for writing point cloud edits back into 3DGS files.
+"""
+
+import hashlib
+import sys
+
+import numpy as np
+import pytest
+
+from src import file_utils
+from src.pointcloud_to_gs import convert_pointcloud_to_3dgs
+from helpers import write_typed_ply
+
+POINTCLOUD_TYPES = {'x': 'float', 'y': 'float', 'z': 'float', 'red': 'uchar', 'green': 'uchar', 'blue': 'uchar'}
+
+
+@pytest.fixture
+def edited_scene(gaussian_ply, tmp_path):
+    """A 3DGS file with a footer after its vertex block, and an edited point cloud of it"""
+    reference, _, data = gaussian_ply('reference.ply', count=200, sh_degree=1)
+    with open(reference, 'ab') as f:
+        f.write(b'footer data')
+
+    rng = np.random.default_rng(1)
+    points = np.zeros(200, dtype=[('x', '<f4'), ('y', '<f4'), ('z', '<f4'),
+                                  ('red', 'u1'), ('green', 'u1'), ('blue', 'u1')])
+    for i, name in enumerate(('x', 'y', 'z')):
+        points[name] = data[:, i] + rng.normal(scale=0.1, size=200)
+    for name in ('red', 'green', 'blue'):
+        points[name] = rng.integers(0, 256, 200)
+    pointcloud = str(tmp_path / 'edited.ply')
+    write_typed_ply(pointcloud, points, POINTCLOUD_TYPES)
+    return reference, pointcloud
+
+
+def read_bytes(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def test_patched_copy_matches_rewrite(edited_scene, tmp_path):
+    reference, pointcloud = edited_scene
+
+    patched = convert_pointcloud_to_3dgs(pointcloud, reference, str(tmp_path / 'patched.ply'), in_place=True)
+    rewritten = convert_pointcloud_to_3dgs(pointcloud, reference, str(tmp_path / 'rewritten.ply'), in_place=False)
+
+    assert read_bytes(patched) == read_bytes(rewritten)
+    assert read_bytes(patched) != read_bytes(reference)
+
+
+def test_patching_leaves_the_reference_unchanged(edited_scene, tmp_path):
+    reference, pointcloud = edited_scene
+    digest = hashlib.sha256(read_bytes(reference)).hexdigest()
+
+    convert_pointcloud_to_3dgs(pointcloud, reference, str(tmp_path / 'patched.ply'), in_place=True)
+
+    assert hashlib.sha256(read_bytes(reference)).hexdigest() == digest
+
+
+@pytest.mark.parametrize('unavailable', ['module', 'ioctl'])
+def test_copy_fallback_without_reflinks(edited_scene, tmp_path, monkeypatch, unavailable):
+    reference, pointcloud = edited_scene
+    expected = convert_pointcloud_to_3dgs(pointcloud, reference, str(tmp_path / 'rewritten.ply'), in_place=False)
+
+    if unavailable == 'module':
+        # Platforms without fcntl
+        monkeypatch.setitem(sys.modules, 'fcntl', None)
+    else:
+        # Filesystems without reflinks
+        import fcntl
+
+        def ioctl(*args):
+            raise OSError(95, "Operation not supported")
+        monkeypatch.setattr(fcntl, 'ioctl', ioctl)
+
+    copies = []
+    copyfile = file_utils.shutil.copyfile
+
+    def record_copy(src, dst):
+        copies.append((src, dst))
+        return copyfile(src, dst)
+    monkeypatch.setattr(file_utils.shutil, 'copyfile', record_copy)
+
+    patched = convert_pointcloud_to_3dgs(pointcloud, reference, str(tmp_path / 'patched.ply'), in_place=True)
+
+    assert copies == [(reference, patched)]
+    assert read_bytes(patched) == read_bytes(expected)
@@ -0,0 +1,117 @@
+"""
+Tests for the on-disk scene cache.
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from src.compressed_ply import convert_3dgs_to_compressed
+from src.gs_to_columns import COLUMNS_MANIFEST
+from src.gs_to_csv import convert_3dgs_to_csv
+from src.scene_cache import (CACHE_DIR_ENV, read_cached_vertices, load_cached_columns, get_cached_columns_dir,
+                             get_directory_size, evict_cache)
+from helpers import write_gaussian_ply, write_typed_ply
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Enable the cache in a temporary directory"""
+    path = tmp_path / 'cache'
+    monkeypatch.setenv(CACHE_DIR_ENV, str(path))
+    return path
+
+
+def test_compressed_file_is_described_by_decoded_properties(gaussian_ply, tmp_path, cache_dir):
+    path, properties, _ = gaussian_ply(count=500, sh_degree=1)
+    compressed = convert_3dgs_to_compressed(path, str(tmp_path / 'scene.compressed.ply'))
+
+    vertices, header = read_cached_vertices(compressed)
+
+    assert 'packed_position' not in header['properties']
+    assert set(header['properties']) == set(properties) - {'nx', 'ny', 'nz'}
+    assert header['vertex_count'] == len(vertices) == 500
+    assert list(vertices.dtype.names) == header['properties']
+
+
+def test_compressed_file_converts_to_csv_through_cache(gaussian_ply, tmp_path, cache_dir):
+    path, _, _ = gaussian_ply(count=500, sh_degree=1)
+    compressed = convert_3dgs_to_compressed(path, str(tmp_path / 'scene.compressed.ply'))
+
+    cached_csv, _ = convert_3dgs_to_csv(compressed, str(tmp_path / 'cached.csv'), cache=True)
+    direct_csv, _ = convert_3dgs_to_csv(compressed, str(tmp_path / 'direct.csv'), cache=False)
+
+    assert any(cache_dir.iterdir())
+    with open(cached_csv) as f, open(direct_csv) as g:
+        assert f.read() == g.read()
+
+
+def test_little_endian_files_are_read_directly(gaussian_ply, cache_dir):
+    path, properties, data = gaussian_ply(count=100)
+
+    vertices, header = read_cached_vertices(path)
+
+    assert isinstance(vertices, np.memmap)
+    assert not cache_dir.exists()
+    assert header['properties'] == properties
+    np.testing.assert_array_equal(vertices['x'], data[:, 0])
+
+
+def test_big_endian_files_are_read_through_the_cache(tmp_path, cache_dir):
+    vertices = np.zeros(50, dtype=[('x', '<f4'), ('y', '<f4'), ('z', '<f4'), ('label', 'u1')])
+    vertices['x'] = np.arange(50)
+    vertices['label'] = 7
+    path = str(tmp_path / 'big_endian.ply')
+    write_typed_ply(path, vertices, {'x': 'float', 'y': 'float', 'z': 'float', 'label': 'uchar'},
+                    'binary_big_endian')
+
+    for _ in range(2):
+        cached, header = read_cached_vertices(path)
+        assert len(os.listdir(cache_dir)) == 1
+        assert header['property_types']['label'] == 'uchar'
+        assert cached.dtype['label'] == np.uint8
+        np.testing.assert_array_equal(cached['x'], vertices['x'])
+        np.testing.assert_array_equal(cached['label'], 7)
+
+
+def test_cached_columns_match_the_file(gaussian_ply, cache_dir):
+    path, properties, data = gaussian_ply(count=200, sh_degree=1)
+
+    columns, manifest = load_cached_columns(path)
+    assert [prop['name'] for prop in manifest['properties']] == properties
+    for i, name in enumerate(properties):
+        np.testing.assert_array_equal(columns[name], data[:, i])
+
+    # A second load is served from the same entry
+    assert get_cached_columns_dir(path) == get_cached_columns_dir(path)
+    assert len(list(cache_dir.iterdir())) == 1
+
+
+def test_edited_file_is_not_served_from_a_stale_entry(gaussian_ply, cache_dir):
+    path, _, _ = gaussian_ply(count=200, seed=1)
+    first_entry = get_cached_columns_dir(path)
+    mtime = os.stat(path).st_mtime_ns
+
+    # Same size and header, different values and a new modification time
+    properties, data = write_gaussian_ply(path, count=200, seed=2)
+    os.utime(path, ns=(mtime + 10 ** 9, mtime + 10 ** 9))
+
+    columns, _ = load_cached_columns(path)
+    assert get_cached_columns_dir(path) != first_entry
+    np.testing.assert_array_equal(columns['x'], data[:, properties.index('x')])
+
+
+def test_least_recently_used_entries_are_evicted(gaussian_ply, cache_dir):
+    paths = [gaussian_ply(f'scene_{i}.ply', count=1000, seed=i)[0] for i in range(3)]
+    entries = [get_cached_columns_dir(path) for path in paths]
+    entry_size = get_directory_size(entries[0])
+
+    # Entry 1 was used least recently, then entry 2, and entry 0 most recently
+    now = os.stat(os.path.join(entries[0], COLUMNS_MANIFEST)).st_mtime
+    for entry, age in ((entries[1], 200), (entries[2], 100)):
+        os.utime(os.path.join(entry, COLUMNS_MANIFEST), (now - age, now - age))
+    removed = evict_cache(max_size=int(2.5 * entry_size))
+
+    assert removed == 1
+    assert [os.path.exists(entry) for entry in entries] == [True, False, True]
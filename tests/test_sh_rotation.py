@@ -0,0 +1,56 @@
+"""
+Tests for rotating spherical harmonics coefficients.
+"""
+
+import numpy as np
+import pytest
+
+from src.sh_rotation import (evaluate_sh_basis, get_sh_fit_directions, get_sh_rotation_matrices,
+                             get_sh_rotation_matrix, rotate_sh_coefficients)
+from src.transform_utils import create_rotation_matrix
+
+
+ROTATION = create_rotation_matrix(30, -45, 120)
+
+
+@pytest.mark.parametrize('degree', [1, 2, 3])
+def test_rotated_color_matches_original_color_from_rotated_direction(degree):
+    rng = np.random.default_rng(0)
+    coefficients = rng.normal(size=(10, (degree + 1) ** 2 - 1))
+    directions = rng.normal(size=(200, 3))
+    directions /= np.linalg.norm(directions, axis=1, keepdims=True)
+
+    rotated = rotate_sh_coefficients(coefficients, get_sh_rotation_matrix(ROTATION, degree))
+
+    # The rotated scene seen from R d looks like the original scene seen from d
+    original_colors = evaluate_sh_basis(directions, degree) @ coefficients.T
+    rotated_colors = evaluate_sh_basis(directions @ ROTATION.T, degree) @ rotated.T
+    np.testing.assert_allclose(rotated_colors, original_colors, atol=1e-10)
+
+
+def test_band_matrices_are_orthogonal():
+    for band, matrix in enumerate(get_sh_rotation_matrices(ROTATION), start=1):
+        assert matrix.shape == (2 * band + 1, 2 * band + 1)
+        np.testing.assert_allclose(matrix @ matrix.T, np.eye(2 * band + 1), atol=1e-12)
+
+
+def test_rotations_compose():
+    first = create_rotation_matrix(10, 20, 30)
+    second = create_rotation_matrix(-40, 0, 75)
+
+    composed = get_sh_rotation_matrix(second @ first)
+    np.testing.assert_allclose(get_sh_rotation_matrix(second) @ get_sh_rotation_matrix(first), composed, atol=1e-12)
+
+
+def test_identity_rotation_keeps_coefficients():
+    np.testing.assert_allclose(get_sh_rotation_matrix(np.eye(3)), np.eye(15), atol=1e-12)
+
+
+def test_fit_directions_are_unit_vectors():
+    directions = get_sh_fit_directions()
+    np.testing.assert_allclose(np.linalg.norm(directions, axis=1), 1.0)
+
+
+def test_invalid_degree_is_rejected():
+    with pytest.raises(ValueError):
+        get_sh_rotation_matrices(ROTATION, degree=4)
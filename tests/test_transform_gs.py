@@ -0,0 +1,93 @@
+"""
+Tests for similarity transformations of whole scenes.
+"""
+
+import numpy as np
+import pytest
+
+from src.gaussian_cloud import GaussianCloud
+from src.sh_rotation import evaluate_sh_basis
+from src.transform_gs import transform_3dgs, get_rotation_matrix
+from src.transform_utils import (create_rotation_matrix, create_similarity_matrix,
+                                 scale_rotation_to_covariance)
+from helpers import read_float_ply
+
+
+ROTATION = [20, -35, 70]
+TRANSLATION = [1.0, -2.0, 0.5]
+SCALE = 1.7
+
+
+def transform_file(path, tmp_path, **kwargs):
+    output = transform_3dgs(path, str(tmp_path / 'transformed.ply'), **kwargs)
+    return read_float_ply(output)
+
+
+def test_positions_follow_the_similarity(gaussian_ply, tmp_path):
+    path, properties, data = gaussian_ply(count=500)
+    _, _, transformed = transform_file(path, tmp_path, rotation=ROTATION, translation=TRANSLATION, scale=SCALE)
+
+    rotation = create_rotation_matrix(*ROTATION)
+    expected = SCALE * data[:, :3].astype(np.float64) @ rotation.T + TRANSLATION
+    np.testing.assert_allclose(transformed[:, :3], expected, rtol=1e-6, atol=1e-5)
+
+
+def test_covariances_are_rotated_and_scaled(gaussian_ply, tmp_path):
+    path, properties, data = gaussian_ply(count=500)
+    _, _, transformed = transform_file(path, tmp_path, rotation=ROTATION, translation=TRANSLATION, scale=SCALE)
+
+    scale_columns = [properties.index(f'scale_{i}') for i in range(3)]
+    rot_columns = [properties.index(f'rot_{i}') for i in range(4)]
+    before = scale_rotation_to_covariance(np.exp(data[:, scale_columns]), data[:, rot_columns])
+    after = scale_rotation_to_covariance(np.exp(transformed[:, scale_columns]), transformed[:, rot_columns])
+
+    # A gaussian's covariance transforms as s^2 R C R^T
+    rotation = create_rotation_matrix(*ROTATION)
+    expected = SCALE ** 2 * rotation @ before @ rotation.T
+    np.testing.assert_allclose(after, expected, rtol=1e-4, atol=1e-4 * np.abs(expected).max())
+
+
+def test_view_dependent_color_turns_with_the_scene(gaussian_ply, tmp_path):
+    path, properties, data = gaussian_ply(count=50, sh_degree=3)
+    _, _, transformed = transform_file(path, tmp_path, rotation=ROTATION)
+
+    rest = [properties.index(f'f_rest_{i}') for i in range(45)]
+    directions = np.random.default_rng(1).normal(size=(20, 3))
+    directions /= np.linalg.norm(directions, axis=1, keepdims=True)
+    rotation = create_rotation_matrix(*ROTATION)
+
+    for channel in range(3):
+        columns = rest[channel * 15:(channel + 1) * 15]
+        original = evaluate_sh_basis(directions) @ data[:, columns].T
+        rotated = evaluate_sh_basis(directions @ rotation.T) @ transformed[:, columns].T
+        np.testing.assert_allclose(rotated, original, atol=1e-4)
+
+
+def test_matrix_form_matches_parameters(gaussian_ply, tmp_path):
+    path, _, _ = gaussian_ply(count=100, sh_degree=1)
+    matrix = create_similarity_matrix(create_rotation_matrix(*ROTATION), TRANSLATION, SCALE)
+
+    from_matrix = transform_3dgs(path, str(tmp_path / 'matrix.ply'), matrix=matrix)
+    from_parameters = transform_3dgs(path, str(tmp_path / 'parameters.ply'), rotation=ROTATION,
+                                     translation=TRANSLATION, scale=SCALE)
+    np.testing.assert_allclose(read_float_ply(from_matrix)[2], read_float_ply(from_parameters)[2], atol=1e-5)
+
+
+def test_cloud_input_matches_file_input(gaussian_ply, tmp_path):
+    path, _, _ = gaussian_ply(count=100, sh_degree=1)
+
+    cloud = transform_3dgs(GaussianCloud.load(path), rotation=ROTATION, translation=TRANSLATION, scale=SCALE)
+    _, _, from_file = transform_file(path, tmp_path, rotation=ROTATION, translation=TRANSLATION, scale=SCALE)
+    np.testing.assert_array_equal(cloud.data.T, from_file)
+
+
+def test_rotation_forms_agree():
+    matrix = create_rotation_matrix(*ROTATION)
+    w = np.sqrt(1 + np.trace(matrix)) / 2
+    quaternion = [w, (matrix[2, 1] - matrix[1, 2]) / (4 * w), (matrix[0, 2] - matrix[2, 0]) / (4 * w),
+                  (matrix[1, 0] - matrix[0, 1]) / (4 * w)]
+
+    np.testing.assert_allclose(get_rotation_matrix(ROTATION), matrix)
+    np.testing.assert_allclose(get_rotation_matrix(quaternion), matrix, atol=1e-12)
+    with pytest.raises(ValueError):
+        get_rotation_matrix([1, 2])
@@ -0,0 +1,130 @@
+"""
+Tests for the array quaternion and rotation helpers against their scalar versions.
+"""
+
+import numpy as np
+import pytest
+
+from src.transform_utils import (quaternion_to_rotation_matrix, rotation_matrix_to_quaternion,
+                                 normalize_quaternions, quaternions_to_rotation_matrices,
+                                 rotation_matrices_to_quaternions, quaternion_slerp,
+                                 scale_rotation_to_covariance)
+
+
+def random_quaternions(count, seed=0):
+    """Random quaternions in (w, x, y, z) order, not normalized"""
+    return np.random.default_rng(seed).normal(size=(count, 4))
+
+
+def axis_angle_quaternions(axes, angles):
+    """Quaternions in (w, x, y, z) order rotating by angles around axes"""
+    axes = normalize_quaternions(np.asarray(axes, dtype=float)[..., :3])
+    angles = np.asarray(angles, dtype=float)[..., np.newaxis]
+    return np.concatenate([np.cos(angles / 2), np.sin(angles / 2) * axes], axis=-1)
+
+
+def test_normalize_quaternions():
+    quaternions = random_quaternions(20).reshape(4, 5, 4)
+    quaternions[0, 0] = 0.0
+
+    normalized = normalize_quaternions(quaternions)
+
+    np.testing.assert_array_equal(normalized[0, 0], 0.0)
+    rows = quaternions.reshape(-1, 4)[1:]
+    expected = rows / np.linalg.norm(rows, axis=-1, keepdims=True)
+    np.testing.assert_allclose(normalized.reshape(-1, 4)[1:], expected, rtol=1e-12)
+
+
+def test_quaternions_to_rotation_matrices_match_scalar():
+    quaternions = random_quaternions(100)
+
+    matrices = quaternions_to_rotation_matrices(quaternions.reshape(10, 10, 4))
+
+    assert matrices.shape == (10, 10, 3, 3)
+    for (w, x, y, z), matrix in zip(quaternions, matrices.reshape(-1, 3, 3)):
+        np.testing.assert_allclose(matrix, quaternion_to_rotation_matrix(x, y, z, w), atol=1e-12)
+
+
+def branch_test_matrices():
+    """Rotations selecting each of the four formulas, including half turns and their neighbourhood"""
+    rng = np.random.default_rng(1)
+    axes = np.concatenate([np.eye(3), rng.normal(size=(20, 3))])
+    half_turns = axis_angle_quaternions(axes, np.full(len(axes), np.pi))
+    near_half_turns = axis_angle_quaternions(axes, np.full(len(axes), np.pi - 1e-7))
+    quaternions = np.concatenate([random_quaternions(200, seed=2), half_turns, near_half_turns])
+    return quaternions_to_rotation_matrices(quaternions)
+
+
+def test_rotation_matrices_to_quaternions_match_scalar():
+    matrices = branch_test_matrices()
+
+    quaternions = rotation_matrices_to_quaternions(matrices)
+
+    # Every branch is exercised
+    diagonal = np.stack([np.trace(matrices, axis1=-2, axis2=-1)] + [matrices[:, i, i] for i in range(3)], axis=-1)
+    assert set(np.argmax(diagonal, axis=-1)) == {0, 1, 2, 3}
+
+    np.testing.assert_allclose(np.linalg.norm(quaternions, axis=-1), 1.0, rtol=1e-12)
+    assert np.all(quaternions[:, 0] >= 0)
+    for quaternion, matrix in zip(quaternions, matrices):
+        qx, qy, qz, qw = rotation_matrix_to_quaternion(matrix)
+        # q and -q are the same rotation
+        assert abs(np.dot(quaternion, [qw, qx, qy, qz])) == pytest.approx(1.0, abs=1e-9)
+    np.testing.assert_allclose(quaternions_to_rotation_matrices(quaternions), matrices, atol=1e-12)
+
+
+def test_rotation_matrices_to_quaternions_choose_positive_w():
+    quaternions = normalize_quaternions(random_quaternions(50, seed=3))
+
+    converted = rotation_matrices_to_quaternions(quaternions_to_rotation_matrices(quaternions))
+
+    np.testing.assert_allclose(converted, np.where(quaternions[:, :1] < 0, -quaternions, quaternions), atol=1e-12)
+
+
+def test_rotation_matrices_to_quaternions_rejects_other_shapes():
+    with pytest.raises(ValueError):
+        rotation_matrices_to_quaternions(np.eye(4))
+
+
+def test_slerp_end_points():
+    q1 = normalize_quaternions(random_quaternions(30, seed=4))
+    q2 = normalize_quaternions(random_quaternions(30, seed=5))
+
+    np.testing.assert_allclose(quaternion_slerp(q1, q2, 0.0), q1, atol=1e-12)
+    # The end point is q2 or -q2, whichever is on the shorter arc
+    end = quaternion_slerp(q1, q2, 1.0)
+    np.testing.assert_allclose(np.abs(np.sum(end * q2, axis=-1)), 1.0, atol=1e-12)
+    assert np.all(np.sum(end * q1, axis=-1) >= 0)
+
+
+def test_slerp_follows_the_arc():
+    axes = np.random.default_rng(6).normal(size=(10, 3))
+    angles = np.linspace(0.1, 3.0, 10)
+    start = axis_angle_quaternions(axes, np.zeros(10))
+    end = axis_angle_quaternions(axes, angles)
+    t = np.linspace(0.0, 1.0, 10)
+
+    np.testing.assert_allclose(quaternion_slerp(start, end, t), axis_angle_quaternions(axes, angles * t), atol=1e-12)
+    # The opposite sign of the end point is the same rotation and gives the same arc
+    np.testing.assert_allclose(quaternion_slerp(start, -end, t), axis_angle_quaternions(axes, angles * t), atol=1e-12)
+
+
+def test_slerp_nearly_parallel_quaternions():
+    q1 = normalize_quaternions(random_quaternions(10, seed=7))
+    q2 = normalize_quaternions(q1 + 1e-9 * random_quaternions(10, seed=8))
+
+    for t in (0.0, 0.25, 0.5, 1.0):
+        result = quaternion_slerp(q1, q2, t)
+        assert np.all(np.isfinite(result))
+        np.testing.assert_allclose(result, normalize_quaternions((1 - t) * q1 + t * q2), atol=1e-12)
+
+
+def test_scale_rotation_to_covariance_matches_scalar():
+    quaternions = random_quaternions(50, seed=9)
+    scales = np.exp(np.random.default_rng(10).normal(size=(50, 3)))
+
+    covariances = scale_rotation_to_covariance(scales, quaternions)
+
+    for (w, x, y, z), scale, covariance in zip(quaternions, scales, covariances):
+        rotation = quaternion_to_rotation_matrix(x, y, z, w)
+        np.testing.assert_allclose(covariance, rotation @ np.diag(scale ** 2) @ rotation.T, rtol=1e-10, atol=1e-12)